@@ -3,12 +3,21 @@ Authentication module for FutureElite
 Handles user login, registration, and session management
 """
 
+import threading
+import time
+from collections import OrderedDict
 from flask import session
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
-from typing import Optional
+from typing import Optional, Dict, Tuple
 from .models import User
 
+# How long a loaded session may be reused before the user is re-read.
+# Changes made in this process invalidate it immediately; this bounds how
+# long other workers can serve a stale (e.g. deleted) user.
+USER_SESSION_TTL_SECONDS = 30
+USER_SESSION_MAX_ENTRIES = 1024
+
 
 class UserSession(UserMixin):
     """User session class for Flask-Login"""
@@ -27,3 +36,49 @@ def create_user_session(user: User) -> UserSession:
     """Create a UserSession from a User model"""
     return UserSession(user)
 
+
+class UserSessionCache:
+    """Short-lived, size-bounded cache of UserSession objects keyed by user id.
+
+    Entries are kept in the order they were stored, which is also the order
+    they expire in, so each put drops expired entries from the front and
+    then the oldest ones beyond max_entries.
+    """
+    def __init__(self, ttl: float = USER_SESSION_TTL_SECONDS, max_entries: int = USER_SESSION_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[float, UserSession]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[UserSession]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[user_id]
+                return None
+            return entry[1]
+
+    def put(self, user_id: str, user_session: UserSession) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (now + self.ttl, user_session)
+            while self._entries:
+                expires, _ = next(iter(self._entries.values()))
+                if expires > now and len(self._entries) <= self.max_entries:
+                    break
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_session_cache = UserSessionCache()
+
@@ -14,7 +14,7 @@ from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-from .storage import StorageManager
+from .storage import get_storage_manager
 from .auth import UserSession
 
 # Security: Pre-generated dummy password hash for constant-time checking
@@ -25,7 +25,7 @@ DUMMY_PASSWORD_HASH = generate_password_hash("dummy-password-for-timing-protecti
 auth_bp = Blueprint('auth', __name__)
 
 # Initialize storage
-storage = StorageManager()
+storage = get_storage_manager()
 
 # Security: Rate limiting for auth endpoints
 try:
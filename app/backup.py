@@ -0,0 +1,268 @@
+"""
+Full-backup ZIP archives for FutureElite
+
+A backup holds everything stored for one user:
+
+    manifest.json                 format, version, export time, members and record counts
+    settings.json                 the user's AppSettings
+    collections/<name>.jsonl      one JSON record per line, per collection
+    photos/<filename>             the player photo (original upload), if any
+
+Export is a generator of archive bytes: zipfile writes each member into a
+small buffer that is handed to the response as it fills, records come from
+the storage generators, and the photo is copied in chunks, so the archive
+is never held in memory. Import reads members straight from the upload with
+ZipFile.open instead of extracting them: every member is streamed once to
+validate it against its model and the manifest (photos are opened and
+verified as images), and only if the whole archive is valid is it applied,
+with a single merge_import of the settings and every collection. The photo
+is copied next to its final location before anything is written and only
+moved into place once the merge has succeeded.
+"""
+
+import io
+import json
+import logging
+import os
+import secrets
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .models import AppSettings
+from .storage import COLLECTION_MODELS, UpsertResult
+from .photos import resolve_photo_path, create_photo_variants
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BACKUP_FORMAT = 'futureelite-backup'
+BACKUP_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+SETTINGS_MEMBER = 'settings.json'
+
+PHOTO_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+
+# Bytes buffered before a chunk is sent to the client
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class BackupError(Exception):
+    """The archive is not a valid backup; the message is shown to the user"""
+
+
+class _ArchiveStream:
+    """Write-only file for zipfile that gives back what has been written so far"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def backup_filename(now: Optional[datetime] = None) -> str:
+    return f"FutureElite_Backup_{(now or datetime.now()).strftime('%Y%m%d_%H%M%S')}.zip"
+
+
+def iter_backup_archive(storage, user_id: str) -> Iterator[bytes]:
+    """Yield a backup archive of user_id's data as consecutive chunks of bytes"""
+    stream = _ArchiveStream()
+    settings = storage.load_settings(user_id)
+    manifest = {
+        'format': BACKUP_FORMAT,
+        'version': BACKUP_VERSION,
+        'exported_at': datetime.now().isoformat(),
+        'settings': SETTINGS_MEMBER,
+        'collections': {},
+        'photos': [],
+    }
+
+    # Members have unknown sizes up front, so force ZIP64 headers rather than guess
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name in COLLECTION_MODELS:
+            member = f"collections/{name}.jsonl"
+            records = 0
+            with archive.open(member, 'w', force_zip64=True) as out:
+                for record in storage.iter_collection(name, user_id):
+                    record = {k: v for k, v in record.items() if k != 'user_id'}
+                    out.write(json.dumps(record, default=str).encode('utf-8') + b'\n')
+                    records += 1
+                    if stream.pending() >= STREAM_CHUNK_BYTES:
+                        yield stream.drain()
+            manifest['collections'][name] = {'member': member, 'records': records}
+            yield stream.drain()
+
+        photo_path = resolve_photo_path(settings.player_photo_path)
+        if photo_path:
+            member = f"photos/{os.path.basename(photo_path)}"
+            with open(photo_path, 'rb') as src, archive.open(member, 'w', force_zip64=True) as out:
+                for chunk in iter(lambda: src.read(STREAM_CHUNK_BYTES), b''):
+                    out.write(chunk)
+                    yield stream.drain()
+            manifest['photos'].append(member)
+
+        archive.writestr(SETTINGS_MEMBER, json.dumps(settings.model_dump(mode='json'), indent=2))
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    # Closing the archive writes the central directory
+    yield stream.drain()
+
+
+def is_backup_archive(archive: zipfile.ZipFile) -> bool:
+    """True for archives in this format (older backups have matches.json etc. at the top level)"""
+    return MANIFEST_NAME in archive.namelist()
+
+
+def _read_json_member(archive: zipfile.ZipFile, member: str) -> Any:
+    try:
+        with archive.open(member) as f:
+            return json.load(f)
+    except KeyError:
+        raise BackupError(f"Backup is missing {member}")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise BackupError(f"{member} is not valid JSON: {e}")
+
+
+def _read_manifest(archive: zipfile.ZipFile) -> Dict[str, Any]:
+    manifest = _read_json_member(archive, MANIFEST_NAME)
+    if not isinstance(manifest, dict) or manifest.get('format') != BACKUP_FORMAT:
+        raise BackupError("Not a FutureElite backup archive")
+    if manifest.get('version') != BACKUP_VERSION:
+        raise BackupError(f"Unsupported backup version {manifest.get('version')}")
+    names = set(archive.namelist())
+    for name, entry in (manifest.get('collections') or {}).items():
+        if name not in COLLECTION_MODELS:
+            raise BackupError(f"Unknown collection '{name}' in backup")
+        if not isinstance(entry, dict) or entry.get('member') not in names:
+            raise BackupError(f"Backup is missing the {name} records")
+    for member in manifest.get('photos') or []:
+        if member not in names:
+            raise BackupError(f"Backup is missing {member}")
+        if not member.startswith('photos/') or member.rsplit('.', 1)[-1].lower() not in PHOTO_EXTENSIONS:
+            raise BackupError(f"Unsupported photo {member}")
+    return manifest
+
+
+def _iter_records(archive: zipfile.ZipFile, member: str, model) -> Iterator[Tuple[Dict[str, Any], Any]]:
+    """Stream a JSON Lines member, yielding each record with its validated model"""
+    with archive.open(member) as raw:
+        for line_no, line in enumerate(io.TextIOWrapper(raw, encoding='utf-8'), 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                # user_id is assigned on import; the dummy only satisfies models that require it
+                validated = model(**{'user_id': '', **record}) if 'user_id' in model.model_fields else model(**record)
+            except Exception as e:
+                raise BackupError(f"{member} line {line_no}: {e}")
+            yield record, validated
+
+
+def _verify_photo(archive: zipfile.ZipFile, member: str) -> None:
+    if not PIL_AVAILABLE:
+        return
+    try:
+        with archive.open(member) as src, Image.open(src) as img:
+            img.verify()
+    except Exception:
+        raise BackupError(f"{member} is not a valid image")
+
+
+def _validate(archive: zipfile.ZipFile, manifest: Dict[str, Any]) -> None:
+    """Stream every member once, checking it against its model and the manifest counts"""
+    for name, entry in manifest['collections'].items():
+        records = sum(1 for _ in _iter_records(archive, entry['member'], COLLECTION_MODELS[name]))
+        if records != entry.get('records'):
+            raise BackupError(f"{entry['member']} has {records} records, manifest says {entry.get('records')}")
+    for member in manifest.get('photos') or []:
+        _verify_photo(archive, member)
+    settings = _read_json_member(archive, manifest.get('settings') or SETTINGS_MEMBER)
+    try:
+        AppSettings(**settings)
+    except Exception as e:
+        raise BackupError(f"Invalid settings in backup: {e}")
+
+
+def _stage_photo(archive: zipfile.ZipFile, member: str, photos_dir: str) -> str:
+    """Copy a photo member to a temp file in photos_dir and return its path"""
+    os.makedirs(photos_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=photos_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out, archive.open(member) as src:
+            for chunk in iter(lambda: src.read(STREAM_CHUNK_BYTES), b''):
+                out.write(chunk)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _install_photo(tmp_path: str, photos_dir: str, filename: str) -> None:
+    """Move a staged photo to its final name in photos_dir and make its variants"""
+    os.replace(tmp_path, os.path.join(photos_dir, filename))
+    try:
+        create_photo_variants(os.path.join(photos_dir, filename))
+    except Exception as e:
+        # Variants are also made on first use
+        logger.warning("Could not create photo variants for %s: %s", filename, e)
+
+
+def restore_backup_archive(archive: zipfile.ZipFile, storage, user_id: str, photos_dir: str) -> Dict[str, UpsertResult]:
+    """Validate a backup archive and merge it into user_id's data.
+
+    Records whose ids the user already has, and duplicates of the user's
+    matches, replace them, like the other imports. The restored photo
+    replaces the user's photo; without one the current photo is kept.
+    Returns what was inserted, updated and skipped per collection.
+
+    An invalid archive raises BackupError before anything is written.
+    Settings and every collection are then merged by a single merge_import
+    call, which validates everything again before its first write; only a
+    storage error part-way through it can leave the restore incomplete.
+    """
+    manifest = _read_manifest(archive)
+    _validate(archive, manifest)
+
+    data = {name: [record for record, _ in _iter_records(archive, entry['member'], COLLECTION_MODELS[name])]
+            for name, entry in manifest['collections'].items()}
+    settings = _read_json_member(archive, manifest.get('settings') or SETTINGS_MEMBER)
+    photos = manifest.get('photos') or []
+    staged_photo = None
+    if photos:
+        staged_photo = _stage_photo(archive, photos[0], photos_dir)
+        filename = f"player_photo_{secrets.token_urlsafe(16)}.{photos[0].rsplit('.', 1)[-1].lower()}"
+        settings['player_photo_path'] = os.path.join('data', 'photos', filename)
+    else:
+        settings['player_photo_path'] = storage.load_settings(user_id).player_photo_path
+    data['settings'] = settings
+
+    try:
+        try:
+            results = storage.merge_import(data, user_id)
+        except (ValueError, TypeError) as e:
+            raise BackupError(f"Failed to import backup: {e}")
+    except BaseException:
+        if staged_photo:
+            os.unlink(staged_photo)
+        raise
+    if staged_photo:
+        _install_photo(staged_photo, photos_dir, filename)
+    return results
@@ -0,0 +1,130 @@
+"""
+Subscription entitlements for FutureElite
+
+Premium gating asks the same question on almost every request: does this
+user have an active subscription? EntitlementService answers it from a
+per-user in-memory cache. An entry is reused until the subscriptions store
+changes on disk (so webhook writes handled by another worker are picked
+up) or its TTL runs out, and is dropped directly when this process saves a
+subscription.
+"""
+
+import threading
+import time
+from typing import Optional, Dict, NamedTuple
+
+from flask import current_app
+
+from .models import Subscription, SubscriptionStatus
+from .storage import StorageManager, get_storage_manager
+
+# Upper bound on how long an entitlement is reused without re-reading it
+ENTITLEMENT_TTL_SECONDS = 300
+
+
+class Entitlement(NamedTuple):
+    """What a user's subscription currently allows"""
+    is_active: bool
+    plan: Optional[str] = None
+    period_end: Optional[str] = None
+    status: SubscriptionStatus = SubscriptionStatus.NONE
+    has_subscription: bool = False
+    cancel_at_period_end: bool = False
+    stripe_customer_id: Optional[str] = None
+    stripe_subscription_id: Optional[str] = None
+
+    @classmethod
+    def from_subscription(cls, subscription: Optional[Subscription]) -> 'Entitlement':
+        if subscription is None:
+            return cls(is_active=False)
+        # Get status value (works for both enum and string)
+        status_value = subscription.status.value if hasattr(subscription.status, 'value') else str(subscription.status)
+        return cls(
+            is_active=status_value.lower() == SubscriptionStatus.ACTIVE.value,
+            plan=subscription.plan_name,
+            period_end=subscription.current_period_end,
+            status=subscription.status,
+            has_subscription=True,
+            cancel_at_period_end=subscription.cancel_at_period_end,
+            stripe_customer_id=subscription.stripe_customer_id,
+            stripe_subscription_id=subscription.stripe_subscription_id,
+        )
+
+
+class EntitlementService:
+    """Cached per-user view of subscription status"""
+
+    def __init__(self, storage: StorageManager, ttl: float = ENTITLEMENT_TTL_SECONDS):
+        self.storage = storage
+        self.ttl = ttl
+        # user_id -> (expires_at, subscriptions signature, Entitlement, orphan checked)
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _signature(self) -> Optional[tuple]:
+        return self.storage._source_signature('subscriptions_file')
+
+    def get(self, user_id: str, claim_orphan: bool = False) -> Entitlement:
+        """Return the user's entitlement, loading it on a cache miss.
+
+        With claim_orphan, a user with no subscription record is given the
+        only active subscription if there is exactly one, which handles
+        records saved under an old user_id format.
+        """
+        signature = self._signature()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None and signature is not None and entry[1] == signature and time.monotonic() < entry[0]:
+            if not claim_orphan or entry[2].has_subscription or entry[3]:
+                return entry[2]
+
+        subscription = self.storage.get_subscription_by_user_id(user_id)
+        if subscription is None and claim_orphan:
+            subscription = self._claim_orphan(user_id)
+            signature = self._signature()
+
+        entitlement = Entitlement.from_subscription(subscription)
+        if signature is not None:
+            with self._lock:
+                self._entries[user_id] = (time.monotonic() + self.ttl, signature, entitlement, claim_orphan)
+        return entitlement
+
+    def _claim_orphan(self, user_id: str) -> Optional[Subscription]:
+        subscriptions = self.storage.load_subscriptions()
+        active_subs = [s for s in subscriptions if str(s.get('status', '')).lower() == 'active']
+        # If there's exactly one active subscription, it's likely for the current user
+        if len(active_subs) != 1:
+            return None
+        sub_data = active_subs[0]
+        try:
+            subscription = Subscription(**sub_data)
+            subscription.user_id = user_id
+            self.storage.save_subscription(subscription)
+            current_app.logger.info(f"Updated subscription user_id from {sub_data.get('user_id')} to {user_id}")
+            return subscription
+        except Exception as e:
+            current_app.logger.error(f"Error updating subscription: {e}")
+            return None
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Forget one user's entitlement, or everyone's if user_id is None"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+_service: Optional[EntitlementService] = None
+_service_lock = threading.Lock()
+
+
+def get_entitlements() -> EntitlementService:
+    """Return the process-wide EntitlementService over the shared storage engine"""
+    global _service
+    storage = get_storage_manager()
+    if _service is None or _service.storage is not storage:
+        with _service_lock:
+            if _service is None or _service.storage is not storage:
+                _service = EntitlementService(storage)
+    return _service
@@ -0,0 +1,100 @@
+"""
+Streaming Excel export for FutureElite
+
+The backup workbook is written with openpyxl's write-only mode: each row is
+serialized to the sheet's temporary XML file as it is appended, instead of
+every cell staying in memory as a styled Cell object until save. Rows come
+straight from the storage generators (StorageManager.iter_export_data), so
+only the collection being written is loaded, and the header cells share one
+named style registered once per workbook. Peak memory is roughly constant
+in the number of rows.
+"""
+
+from itertools import chain
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, NamedStyle, PatternFill
+    EXCEL_SUPPORT = True
+except ImportError:
+    EXCEL_SUPPORT = False
+
+from .excel_import import BACKUP_SHEETS
+
+EXPORT_FILENAME = 'FutureElite_Export.xlsx'
+EXPORT_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+HEADER_STYLE = 'export_header'
+
+
+def _header_style() -> 'NamedStyle':
+    style = NamedStyle(name=HEADER_STYLE)
+    style.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    style.font = Font(bold=True, color="FFFFFF")
+    return style
+
+
+def _as_dict(item: Any) -> Any:
+    if hasattr(item, 'model_dump'):
+        return item.model_dump()
+    return item
+
+
+def _first(records: Iterable) -> Optional[Iterable]:
+    """records with its first item put back, or None if it is empty"""
+    iterator = iter(records)
+    for first in iterator:
+        return chain([first], iterator)
+    return None
+
+
+def _add_sheet(workbook: 'Workbook', title: str, headers: List[str]):
+    """Create a sheet whose first row is headers in the shared header style"""
+    sheet = workbook.create_sheet(title=title)
+    row = []
+    for header in headers:
+        cell = WriteOnlyCell(sheet, value=header)
+        cell.style = HEADER_STYLE
+        row.append(cell)
+    sheet.append(row)
+    return sheet
+
+
+def _write_settings(workbook: 'Workbook', settings: Any) -> None:
+    settings = _as_dict(settings)
+    if not settings:
+        return
+    sheet = _add_sheet(workbook, 'Settings', ['Setting', 'Value'])
+    for key, value in settings.items():
+        if value is not None:
+            # Handle list values
+            if isinstance(value, list):
+                value = ', '.join(str(v) for v in value)
+            sheet.append([str(key), str(value)])
+
+
+def write_export_workbook(data: Dict[str, Any], target: BinaryIO) -> None:
+    """Write an export workbook into target.
+
+    data is shaped like StorageManager.export_data/iter_export_data; each
+    collection may be a list or a generator and is read once. Empty
+    collections get no sheet.
+    """
+    workbook = Workbook(write_only=True)
+    workbook.add_named_style(_header_style())
+
+    for key, (title, headers) in BACKUP_SHEETS.items():
+        records = _first(data.get(key) or ())
+        if records is not None:
+            sheet = _add_sheet(workbook, title, headers)
+            for item in records:
+                item = _as_dict(item)
+                if isinstance(item, dict):
+                    # Convert None to empty string
+                    sheet.append(['' if item.get(header) is None else item.get(header) for header in headers])
+        # Settings sheet follows Matches
+        if key == 'matches':
+            _write_settings(workbook, data.get('settings'))
+
+    workbook.save(target)
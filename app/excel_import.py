@@ -0,0 +1,420 @@
+"""
+Streaming Excel import for FutureElite
+
+Uploaded workbooks are opened once, in openpyxl's read-only mode, which
+parses worksheet XML lazily instead of building every cell object up front.
+Rows are streamed from each sheet as a generator, through the same header
+detection and formula-injection sanitizing as before, and parsed matches
+are validated in batches, so memory stays flat and parse time grows
+linearly with the size of the upload.
+
+Read-only workbooks keep the file open until closed; callers close them.
+"""
+
+import ast
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import openpyxl
+    EXCEL_SUPPORT = True
+except ImportError:
+    openpyxl = None
+    EXCEL_SUPPORT = False
+
+from pydantic import TypeAdapter, ValidationError
+
+from .models import Match, MatchCategory, MatchResult
+
+logger = logging.getLogger(__name__)
+
+# Parsed match rows validated per pydantic call
+MATCH_BATCH_ROWS = 500
+
+# Import key -> (sheet name, header names) for full backup workbooks
+BACKUP_SHEETS = {
+    'matches': ('Matches', ['id', 'date', 'opponent', 'venue', 'result', 'goals', 'assists', 'minutes_played', 'category', 'season', 'notes', 'clean_sheets']),
+    'physical_measurements': ('Physical Measurements', ['id', 'date', 'height_cm', 'weight_kg', 'notes', 'include_in_report']),
+    'physical_metrics': ('Physical Metrics', ['id', 'date', 'sprint_speed_ms', 'sprint_speed_kmh', 'sprint_10m_sec', 'sprint_20m_sec', 'sprint_30m_sec', 'vertical_jump_cm', 'standing_long_jump_cm', 'countermovement_jump_cm', 'agility_time_sec', 'beep_test_level', 'vo2_max', 'include_in_report']),
+    'achievements': ('Achievements', ['id', 'date', 'title', 'category', 'season', 'goals', 'assists', 'minutes_played', 'clean_sheets', 'notes']),
+    'club_history': ('Club History', ['id', 'club_name', 'season', 'age_group', 'position', 'achievements']),
+    'training_camps': ('Training Camps', ['id', 'camp_name', 'organizer', 'location', 'start_date', 'end_date', 'age_group', 'focus_area']),
+    'references': ('References', ['id', 'name', 'position', 'organization', 'email', 'phone', 'relationship', 'notes']),
+}
+
+DATE_FORMATS = [
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d",
+    "%d %b %Y", "%d %B %Y",
+    "%b %d, %Y", "%B %d, %Y",
+    "%d/%m/%y", "%d-%m-%y"
+]
+
+_match_list = TypeAdapter(List[Match])
+
+
+class ExcelImportError(Exception):
+    """The workbook cannot be imported; the message is shown to the user"""
+
+
+class MatchImport(NamedTuple):
+    """Outcome of parsing a match sheet"""
+    matches: List[Match]
+    errors: List[str]
+    rows_checked: int
+
+
+def open_workbook(path: str):
+    """Open a workbook once for streaming; formulas are read as their cached values"""
+    return openpyxl.load_workbook(path, read_only=True, data_only=True)
+
+
+def is_full_backup(workbook) -> bool:
+    return len(workbook.sheetnames) > 1 or 'Settings' in workbook.sheetnames or 'Physical Measurements' in workbook.sheetnames
+
+
+def sanitize_cell_value(cell_value):
+    """Sanitize cell value to prevent formula injection"""
+    if cell_value is None:
+        return None
+    # Convert to string and strip
+    value = str(cell_value).strip()
+    # Security: Reject formulas (cells starting with =, +, -, @)
+    if value and value[0] in ['=', '+', '-', '@']:
+        # Log potential formula injection attempt
+        logger.warning(f"Potential formula injection detected: {value[:50]}")
+        return None  # Reject formulas
+    return value
+
+
+def iter_rows(sheet, start_row: int = 1) -> Iterator[Tuple[int, tuple]]:
+    """Yield (row number, values) for every row of a sheet, reading it once from start to end"""
+    if hasattr(sheet, 'reset_dimensions'):
+        # Files from other applications can declare a smaller used range than they have
+        sheet.reset_dimensions()
+    for row_idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
+        if row_idx >= start_row:
+            yield row_idx, row
+
+
+def map_match_columns(headers: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """Map match fields to column indexes by flexible header matching; also returns the quoted headers seen"""
+    col_map = {}
+    found_headers = []
+    for idx, header in enumerate(headers):
+        if not header:
+            continue
+
+        # Normalize header: lowercase, strip whitespace, normalize whitespace
+        header_clean = str(header).lower().strip()
+        header_clean = ' '.join(header_clean.split())  # Normalize multiple spaces to single space
+        found_headers.append(f"'{header}'")
+
+        # Opponent column - try multiple variations
+        if 'opponent' in header_clean and 'opponent' not in col_map:
+            col_map['opponent'] = idx
+        elif header_clean in ['opp', 'vs', 'versus', 'against'] and 'opponent' not in col_map:
+            col_map['opponent'] = idx
+
+        # Location column
+        if 'location' in header_clean and 'location' not in col_map:
+            col_map['location'] = idx
+        elif header_clean in ['venue', 'place', 'stadium', 'ground'] and 'location' not in col_map:
+            col_map['location'] = idx
+
+        # Date column - try multiple variations
+        if 'date' in header_clean and 'date' not in col_map:
+            col_map['date'] = idx
+        elif header_clean in ['match date', 'game date', 'played', 'when'] and 'date' not in col_map:
+            col_map['date'] = idx
+
+        # Category column
+        if ('category' in header_clean or 'type' in header_clean) and 'category' not in col_map:
+            col_map['category'] = idx
+        elif header_clean in ['match type', 'competition'] and 'category' not in col_map:
+            col_map['category'] = idx
+
+        # Score column
+        if 'score' in header_clean and 'score' not in col_map:
+            col_map['score'] = idx
+        elif header_clean in ['result', 'final score', 'ft'] and 'score' not in col_map:
+            col_map['score'] = idx
+
+        # Goals column (check for "brodie goals" or just "goals" or "g")
+        if 'goal' in header_clean and 'goals' not in col_map:
+            if 'brodie' in header_clean or header_clean in ['g', 'goals', 'goal', 'brodie goals', 'brodie goal']:
+                col_map['goals'] = idx
+
+        # Assists column
+        if 'assist' in header_clean and 'assists' not in col_map:
+            if 'brodie' in header_clean or header_clean in ['a', 'assists', 'assist', 'brodie assists', 'brodie assist']:
+                col_map['assists'] = idx
+
+        # Minutes column
+        if ('minute' in header_clean or 'min' in header_clean) and 'minutes' not in col_map:
+            if 'brodie' in header_clean or header_clean in ['min', 'minutes', 'mins', 'playing minutes', 'time', 'played']:
+                col_map['minutes'] = idx
+
+        # Notes column
+        if 'note' in header_clean and 'notes' not in col_map:
+            col_map['notes'] = idx
+        elif header_clean in ['comment', 'comments', 'remarks'] and 'notes' not in col_map:
+            col_map['notes'] = idx
+    return col_map, found_headers
+
+
+def _find_match_header(sheet) -> Tuple[tuple, Iterator[Tuple[int, tuple]]]:
+    """Return the header row (the first row mentioning "opponent") and an iterator over the rows after it.
+
+    Without one the first row is the header, which may still name the
+    column "Vs" or "Against", and the sheet is streamed again from row 2.
+    """
+    rows = iter_rows(sheet)
+    first = None
+    for row_idx, row in rows:
+        if first is None:
+            first = row
+        if row and any(cell and 'opponent' in str(cell).lower().strip() for cell in row if cell):
+            return row, rows
+    return first or (), iter_rows(sheet, start_row=2)
+
+
+def _cell(row: tuple, col_map: Dict[str, int], field: str) -> Any:
+    idx = col_map.get(field)
+    if idx is not None and idx < len(row):
+        return row[idx]
+    return None
+
+
+def _parse_date(date_cell, row_idx: int, opponent: str) -> str:
+    """Match date as "dd Mon yyyy"; raises ValueError with the row's error message"""
+    if date_cell is None:
+        raise ValueError(f"Row {row_idx}: Missing date (opponent: {opponent})")
+    elif isinstance(date_cell, datetime):
+        return date_cell.strftime("%d %b %Y")
+    elif isinstance(date_cell, (int, float)):
+        # Excel date serial number
+        try:
+            from openpyxl.utils import datetime_from_excel
+            return datetime_from_excel(date_cell).strftime("%d %b %Y")
+        except:
+            # Try as days since 1900
+            try:
+                base_date = datetime(1899, 12, 30)
+                return (base_date + timedelta(days=int(date_cell))).strftime("%d %b %Y")
+            except Exception as e:
+                raise ValueError(f"Row {row_idx}: Invalid date number '{date_cell}' (opponent: {opponent}): {str(e)}")
+    elif isinstance(date_cell, str):
+        date_cell_clean = date_cell.strip()
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(date_cell_clean, fmt).strftime("%d %b %Y")
+            except ValueError:
+                continue
+        raise ValueError(f"Row {row_idx}: Invalid date format '{date_cell}' (opponent: {opponent})")
+    raise ValueError(f"Row {row_idx}: Invalid date type '{type(date_cell)}' (opponent: {opponent})")
+
+
+def _to_int(value) -> int:
+    try:
+        return int(float(value)) if value else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+def _match_fields(row_idx: int, row: tuple, col_map: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    """Match keyword arguments for one data row, or None for rows to skip.
+
+    Raises ValueError with a message for the user if the row is invalid.
+    """
+    # Skip completely empty rows
+    if not row or not any(cell is not None and str(cell).strip() for cell in row if cell is not None):
+        return None
+
+    opponent_raw = _cell(row, col_map, 'opponent')
+    opponent = sanitize_cell_value(opponent_raw) if opponent_raw is not None else ''
+
+    # Skip if opponent is empty or is the header text or instruction rows
+    if not opponent or opponent.lower() in ['opponent', 'opp', 'vs', 'versus', 'against', '']:
+        return None
+
+    # Skip instruction rows (from template)
+    if opponent.upper().startswith('INSTRUCTIONS') or opponent.upper().startswith('REQUIRED'):
+        return None
+
+    # Extract other fields, sanitized to prevent formula injection
+    location_raw = _cell(row, col_map, 'location')
+    location = (sanitize_cell_value(location_raw) or 'Unknown') if location_raw is not None else 'Unknown'
+    category_raw = _cell(row, col_map, 'category')
+    category = (sanitize_cell_value(category_raw) or 'Pre-Season Friendly') if category_raw is not None else 'Pre-Season Friendly'
+    score_raw = _cell(row, col_map, 'score')
+    score = sanitize_cell_value(score_raw) if score_raw is not None else None
+    notes_raw = _cell(row, col_map, 'notes')
+    notes = (sanitize_cell_value(notes_raw) or '') if notes_raw is not None else ''
+
+    date_str = _parse_date(sanitize_cell_value(_cell(row, col_map, 'date')), row_idx, opponent)
+
+    # Format score
+    if score and score.strip() and score.lower() not in ['none', 'n/a', '']:
+        # Handle different score formats
+        score = score.replace(' ', '')
+        if '-' in score:
+            parts = score.split('-')
+            if len(parts) == 2:
+                score = f"{parts[0].strip()} - {parts[1].strip()}"
+        formatted_score = score
+    else:
+        formatted_score = None
+
+    # Determine result from score
+    result = None
+    if formatted_score:
+        try:
+            parts = formatted_score.split(' - ')
+            if len(parts) == 2:
+                our_score = int(parts[0].strip())
+                their_score = int(parts[1].strip())
+                if our_score > their_score:
+                    result = MatchResult.WIN
+                elif our_score < their_score:
+                    result = MatchResult.LOSS
+                else:
+                    result = MatchResult.DRAW
+        except (ValueError, IndexError):
+            pass
+
+    # Parse category
+    category_lower = category.lower()
+    if 'league' in category_lower:
+        match_category = MatchCategory.LEAGUE
+    elif 'friendly' in category_lower and 'pre-season' not in category_lower:
+        match_category = MatchCategory.FRIENDLY
+    else:
+        match_category = MatchCategory.PRE_SEASON_FRIENDLY
+
+    return {
+        'category': match_category,
+        'date': date_str,
+        'opponent': opponent,
+        'location': location,
+        'result': result,
+        'score': formatted_score,
+        'brodie_goals': _to_int(_cell(row, col_map, 'goals')),
+        'brodie_assists': _to_int(_cell(row, col_map, 'assists')),
+        'minutes_played': _to_int(_cell(row, col_map, 'minutes')),
+        'notes': notes,
+        'is_fixture': False
+    }
+
+
+def _validate_batch(batch: List[Tuple[int, Dict[str, Any]]], matches: List[Match], errors: List[str]):
+    """Validate parsed rows with one pydantic call, falling back to row by row to report failures"""
+    try:
+        matches.extend(_match_list.validate_python([fields for _, fields in batch]))
+        return
+    except ValidationError:
+        pass
+    for row_idx, fields in batch:
+        try:
+            matches.append(Match(**fields))
+        except Exception as e:
+            errors.append(f"Row {row_idx} (opponent: {fields.get('opponent', 'unknown')}): {str(e)}")
+
+
+def parse_match_sheet(sheet, batch_size: int = MATCH_BATCH_ROWS) -> MatchImport:
+    """Stream a match-only sheet into validated matches.
+
+    Raises ExcelImportError if the Opponent or Date column cannot be found.
+    """
+    header_values, rows = _find_match_header(sheet)
+
+    # Read headers - handle None values, sanitize to prevent formula injection
+    headers = [sanitize_cell_value(value) or '' for value in header_values]
+    col_map, found_headers = map_match_columns(headers)
+
+    # Required columns - provide detailed error message
+    if 'opponent' not in col_map or 'date' not in col_map:
+        missing = []
+        if 'opponent' not in col_map:
+            missing.append('Opponent')
+        if 'date' not in col_map:
+            missing.append('Date')
+        error_msg = f'Excel file must contain "{", ".join(missing)}" column(s). '
+        error_msg += f'Found headers: {", ".join(found_headers[:10])}'  # Show first 10 headers
+        raise ExcelImportError(error_msg)
+
+    matches = []
+    errors = []
+    rows_checked = 0
+    batch = []
+    match_counter = 0  # Counter to ensure unique IDs
+    base_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for row_idx, row in rows:
+        rows_checked += 1
+        try:
+            fields = _match_fields(row_idx, row, col_map)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+        except Exception as e:
+            errors.append(f"Row {row_idx}: {str(e)}")
+            continue
+        if fields is None:
+            continue
+        match_counter += 1
+        fields['id'] = f"{base_id}_{match_counter:04d}"
+        batch.append((row_idx, fields))
+        if len(batch) >= batch_size:
+            _validate_batch(batch, matches, errors)
+            batch = []
+    if batch:
+        _validate_batch(batch, matches, errors)
+    return MatchImport(matches, errors, rows_checked)
+
+
+def read_backup_sheet(workbook, sheet_name: str, headers: List[str]) -> List[Dict[str, Any]]:
+    """Rows below a backup sheet's header row (the first row starting with a known header) as dicts"""
+    if sheet_name not in workbook.sheetnames:
+        return []
+    data = []
+    header_map = None
+    for _, row in iter_rows(workbook[sheet_name]):
+        if header_map is None:
+            if row and row[0] and str(row[0]).strip() in headers:
+                header_map = {col_idx: str(header).strip() for col_idx, header in enumerate(row) if header}
+            continue
+        if not any(row):  # Skip empty rows
+            continue
+        item = {header_map[col_idx]: value for col_idx, value in enumerate(row)
+                if col_idx in header_map and value is not None}
+        if item:
+            data.append(item)
+    return data
+
+
+def read_settings_sheet(workbook) -> Dict[str, Any]:
+    """Key-value rows of the Settings sheet, with list values restored"""
+    if 'Settings' not in workbook.sheetnames:
+        return {}
+    settings_data = {}
+    for _, row in iter_rows(workbook['Settings'], start_row=2):
+        if len(row) > 1 and row[0] and row[1] is not None:
+            key = str(row[0]).strip()
+            value = row[1]
+            # Convert string representations of lists back to lists
+            if isinstance(value, str) and value.startswith('[') and value.endswith(']'):
+                try:
+                    value = ast.literal_eval(value)
+                except Exception:
+                    pass
+            settings_data[key] = value
+    return settings_data
+
+
+def read_backup(workbook) -> Dict[str, Any]:
+    """Everything in a full backup workbook, in the shape storage.import_data expects"""
+    data = {key: read_backup_sheet(workbook, sheet_name, headers)
+            for key, (sheet_name, headers) in BACKUP_SHEETS.items()}
+    data['settings'] = read_settings_sheet(workbook)
+    return data
@@ -0,0 +1,463 @@
+"""
+Journaled storage engine for FutureElite
+
+Keeps the same JSON base files as StorageManager, but single-record mutations
+(save_match, delete_achievement, save_subscription, ...) are appended as small
+JSON lines to a per-collection journal (e.g. data/matches.journal) instead of
+rewriting the whole pretty-printed file. Readers replay the journal on top of
+the base file, and a compactor periodically folds the journal back into a new
+base file. The replayed collection is kept in the shared collection cache,
+validated against the stat of both the base file and the journal, so reads
+only replay again after a write.
+
+Every journal operation is keyed (upsert/delete by record key, a "batch" of
+those written by one bulk call, or a full "reset" snapshot), so replaying a journal over a base file that already
+contains it is harmless. That makes a crash at any point during compaction
+recoverable, and a torn final line from a crash mid-append is skipped.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple, Iterable, Callable
+from werkzeug.security import generate_password_hash
+
+from .models import (
+    Match, AppSettings, PhysicalMeasurement, Achievement, ClubHistory,
+    TrainingCamp, PhysicalMetrics, User, Subscription, Reference
+)
+from .storage import (
+    StorageManager, CollectionCache, file_lock, _collection_cache, _copy_collection, _file_signature,
+    _notify_user_changed, _merge_records
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Collection name -> (file attribute on StorageManager, key fields).
+# A key of None marks a dict-shaped file keyed by user_id (settings).
+JOURNALED_COLLECTIONS = {
+    'matches': ('matches_file', ('user_id', 'id')),
+    'physical_measurements': ('physical_measurements_file', ('user_id', 'id')),
+    'achievements': ('achievements_file', ('user_id', 'id')),
+    'club_history': ('club_history_file', ('user_id', 'id')),
+    'training_camps': ('training_camps_file', ('user_id', 'id')),
+    'physical_metrics': ('physical_metrics_file', ('user_id', 'id')),
+    'references': ('references_file', ('id',)),
+    'users': ('users_file', ('id',)),
+    'subscriptions': ('subscriptions_file', ('user_id',)),
+    'settings': ('settings_file', None),
+}
+
+# Compact a collection once its journal grows past this many bytes
+DEFAULT_COMPACT_THRESHOLD = 256 * 1024
+
+
+def _record_key(record: Dict[str, Any], key_fields: Tuple[str, ...]) -> tuple:
+    return tuple(record.get(field) for field in key_fields)
+
+
+class JournaledStorageManager(StorageManager):
+    """StorageManager that appends mutations to per-collection journals"""
+
+    def __init__(self, data_dir: str = "data", fsync: bool = True,
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        self.fsync = fsync
+        self.compact_threshold = compact_threshold
+        self._compactor_thread = None
+        super().__init__(data_dir)
+
+    # ========== Files and locking ==========
+    def _base_file(self, name: str) -> Path:
+        return getattr(self, JOURNALED_COLLECTIONS[name][0])
+
+    def _journal_file(self, name: str) -> Path:
+        return self._base_file(name).with_suffix('.journal')
+
+    @contextmanager
+    def _locked_journal(self, name: str, exclusive: bool):
+        """Open the collection's journal holding the collection's storage lock.
+
+        The journal shares the base file's lock, so appends, replays and
+        compaction of one collection are serialised across workers.
+        """
+        with file_lock(self._base_file(name), exclusive=exclusive):
+            with open(self._journal_file(name), 'a+b') as journal:
+                yield journal
+
+    def _source_signature(self, file_attr: str) -> Optional[tuple]:
+        """Indexed collections change when either the base or the journal does"""
+        for name, (base_attr, _) in JOURNALED_COLLECTIONS.items():
+            if base_attr == file_attr:
+                base_signature = super()._source_signature(file_attr)
+                if base_signature is None:
+                    return None
+                return (base_signature, _file_signature(self._journal_file(name)))
+        return super()._source_signature(file_attr)
+
+    def _initialize_files(self):
+        """Create empty base files for any collection that doesn't have one"""
+        for name, (_, key_fields) in JOURNALED_COLLECTIONS.items():
+            if not self._base_file(name).exists():
+                self._write_base(name, {} if key_fields is None else [])
+
+    def _write_base(self, name: str, data) -> None:
+        """Atomically replace a collection's base file"""
+        self._write_json(self._base_file(name), data, name.replace('_', ' '))
+
+    # ========== Journal ==========
+    def _append(self, name: str, op: Dict[str, Any]) -> None:
+        """Append one operation to a collection's journal"""
+        line = json.dumps(op, ensure_ascii=False).encode('utf-8') + b'\n'
+        try:
+            with self._locked_journal(name, exclusive=True) as journal:
+                journal.seek(0, os.SEEK_END)
+                if journal.tell() > 0:
+                    # Terminate a torn line left behind by a crash mid-append
+                    journal.seek(-1, os.SEEK_END)
+                    if journal.read(1) != b'\n':
+                        line = b'\n' + line
+                journal.write(line)
+                journal.flush()
+                if self.fsync:
+                    os.fsync(journal.fileno())
+        except (IOError, OSError) as e:
+            raise RuntimeError(f"Failed to save {name.replace('_', ' ')}: {str(e)}")
+
+    def _read_base(self, name: str):
+        key_fields = JOURNALED_COLLECTIONS[name][1]
+        return self._read_json(self._base_file(name), {} if key_fields is None else [])
+
+    def _replay_locked(self, name: str, journal):
+        """Apply the journal to the base file; caller holds the journal lock"""
+        key_fields = JOURNALED_COLLECTIONS[name][1]
+        data = self._read_base(name)
+
+        journal.seek(0)
+        ops = []
+        for raw in journal.read().splitlines():
+            try:
+                op = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue  # Torn write from a crash
+            # A batch is one line, so it is replayed whole or (if torn) not at all
+            ops.extend((op.get('ops') or []) if op.get('op') == 'batch' else [op])
+        if not ops:
+            return data
+
+        if key_fields is None:
+            for op in ops:
+                if op.get('op') == 'reset':
+                    data = dict(op.get('records') or {})
+                elif op.get('op') == 'upsert':
+                    data[op['key']] = op['record']
+                elif op.get('op') == 'delete':
+                    data.pop(op['key'], None)
+            return data
+
+        records = list(data)
+        positions = {}
+        for i, record in enumerate(records):
+            positions.setdefault(_record_key(record, key_fields), []).append(i)
+        for op in ops:
+            kind = op.get('op')
+            if kind == 'reset':
+                records = list(op.get('records') or [])
+                positions = {}
+                for i, record in enumerate(records):
+                    positions.setdefault(_record_key(record, key_fields), []).append(i)
+            elif kind == 'upsert':
+                record = op['record']
+                key = _record_key(record, key_fields)
+                if positions.get(key):
+                    records[positions[key][0]] = record
+                else:
+                    positions[key] = [len(records)]
+                    records.append(record)
+            elif kind == 'delete':
+                for i in positions.pop(tuple(op['key']), []):
+                    records[i] = None
+        return [r for r in records if r is not None]
+
+    def _replay_cached(self, name: str, journal):
+        """Replayed collection from the cache, replaying only if the base or journal changed.
+
+        The caller holds the journal lock, so neither file changes between
+        taking the signature and replaying. The result is shared with the
+        cache and must not be modified.
+        """
+        journal_file = self._journal_file(name)
+        try:
+            base_stat = os.stat(self._base_file(name))
+        except OSError:
+            base_stat = None
+        journal_stat = os.fstat(journal.fileno())
+        signature = (CollectionCache._signature(base_stat) if base_stat else None,
+                     CollectionCache._signature(journal_stat))
+        data = _collection_cache.get(journal_file, signature)
+        if data is None:
+            data = self._replay_locked(name, journal)
+            size = (base_stat.st_size if base_stat else 0) + journal_stat.st_size
+            _collection_cache.put(journal_file, None, data, signature=signature, size=size)
+        return data
+
+    def _replay(self, name: str):
+        with self._locked_journal(name, exclusive=False) as journal:
+            return _copy_collection(self._replay_cached(name, journal))
+
+    def _load_list(self, name: str, user_id: Optional[str] = None) -> list:
+        records = self._replay(name)
+        if user_id:
+            records = [r for r in records if r.get('user_id') == user_id]
+        return records
+
+    def _upsert(self, name: str, record: Dict[str, Any]) -> None:
+        self._append(name, {'op': 'upsert', 'record': record})
+
+    def _delete(self, name: str, key: tuple) -> bool:
+        key_fields = JOURNALED_COLLECTIONS[name][1]
+        if not any(_record_key(r, key_fields) == key for r in self._replay(name)):
+            return False
+        self._append(name, {'op': 'delete', 'key': list(key)})
+        return True
+
+    def _reset(self, name: str, records) -> None:
+        self._append(name, {'op': 'reset', 'records': records})
+
+    def _bulk_apply(self, collection: str, user_id: str, upserts: list, delete_ids: Iterable[str] = (),
+                    delete_all: bool = False,
+                    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None) -> list:
+        """Append a bulk write as a single batch line instead of a full reset snapshot"""
+        key_fields = JOURNALED_COLLECTIONS[collection][1]
+        with self._locked_journal(collection, exclusive=True) as journal:
+            existing = [r for r in self._replay_cached(collection, journal) if r.get('user_id') == user_id]
+            _, changes = _merge_records(existing, user_id, upserts, delete_ids, delete_all, fingerprint)
+            ops = [{'op': 'delete', 'key': list(_record_key(old, key_fields))} for old, new in changes if new is None]
+            ops += [{'op': 'upsert', 'record': new} for _, new in changes if new is not None]
+            if ops:
+                self._append(collection, {'op': 'batch', 'ops': ops})
+        return changes
+
+    # ========== Compaction ==========
+    def compact(self, name: str) -> bool:
+        """Fold a collection's journal into a new base file"""
+        with self._locked_journal(name, exclusive=True) as journal:
+            journal.seek(0, os.SEEK_END)
+            if journal.tell() == 0:
+                return False
+            data = self._replay_locked(name, journal)
+            self._write_base(name, data)
+            # A crash before the truncate just replays the journal again,
+            # which is idempotent against the new base.
+            journal.truncate(0)
+            journal.flush()
+            if self.fsync:
+                os.fsync(journal.fileno())
+        return True
+
+    def compact_all(self, threshold: int = 0) -> list:
+        """Compact every collection whose journal is larger than threshold bytes"""
+        compacted = []
+        for name in JOURNALED_COLLECTIONS:
+            journal_file = self._journal_file(name)
+            try:
+                size = journal_file.stat().st_size
+            except FileNotFoundError:
+                continue
+            if size > threshold and self.compact(name):
+                compacted.append(name)
+        return compacted
+
+    def start_compactor(self, interval: int = 60) -> threading.Thread:
+        """Start a background thread that compacts journals past the size threshold"""
+        if self._compactor_thread and self._compactor_thread.is_alive():
+            return self._compactor_thread
+
+        def _worker():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.compact_all(self.compact_threshold)
+                except Exception:
+                    logger.exception("Journal compaction failed")
+
+        self._compactor_thread = threading.Thread(target=_worker, daemon=True)
+        self._compactor_thread.start()
+        return self._compactor_thread
+
+    # ========== Matches ==========
+    def _save_matches(self, matches: list) -> None:
+        self._reset('matches', matches)
+
+    def load_matches(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('matches', user_id)
+
+    def save_match(self, match: Match, user_id: str) -> str:
+        match_dict = match.model_dump()
+        match_dict['user_id'] = user_id
+        self._upsert('matches', match_dict)
+        return match.id
+
+    def delete_match(self, match_id: str, user_id: str) -> bool:
+        return self._delete('matches', (user_id, match_id))
+
+    # ========== Physical measurements ==========
+    def _save_physical_measurements(self, measurements: list) -> None:
+        self._reset('physical_measurements', measurements)
+
+    def load_physical_measurements(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('physical_measurements', user_id)
+
+    def save_physical_measurement(self, measurement: PhysicalMeasurement, user_id: str) -> str:
+        measurement_dict = measurement.model_dump()
+        measurement_dict['user_id'] = user_id
+        self._upsert('physical_measurements', measurement_dict)
+        return measurement.id
+
+    def delete_physical_measurement(self, measurement_id: str, user_id: str) -> bool:
+        return self._delete('physical_measurements', (user_id, measurement_id))
+
+    # ========== Achievements ==========
+    def _save_achievements(self, achievements: list) -> None:
+        self._reset('achievements', achievements)
+
+    def load_achievements(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('achievements', user_id)
+
+    def save_achievement(self, achievement: Achievement, user_id: str) -> str:
+        achievement_dict = achievement.model_dump()
+        achievement_dict['user_id'] = user_id
+        self._upsert('achievements', achievement_dict)
+        return achievement.id
+
+    def delete_achievement(self, achievement_id: str, user_id: str) -> bool:
+        return self._delete('achievements', (user_id, achievement_id))
+
+    # ========== Club history ==========
+    def _save_club_history(self, club_history: list) -> None:
+        self._reset('club_history', club_history)
+
+    def load_club_history(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('club_history', user_id)
+
+    def save_club_history_entry(self, club_history: ClubHistory, user_id: str) -> str:
+        entry_dict = club_history.model_dump()
+        entry_dict['user_id'] = user_id
+        self._upsert('club_history', entry_dict)
+        return club_history.id
+
+    def delete_club_history_entry(self, entry_id: str, user_id: str) -> bool:
+        return self._delete('club_history', (user_id, entry_id))
+
+    # ========== Training camps ==========
+    def _save_training_camps(self, training_camps: list) -> None:
+        self._reset('training_camps', training_camps)
+
+    def load_training_camps(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('training_camps', user_id)
+
+    def save_training_camp(self, training_camp: TrainingCamp, user_id: str) -> str:
+        camp_dict = training_camp.model_dump()
+        camp_dict['user_id'] = user_id
+        self._upsert('training_camps', camp_dict)
+        return training_camp.id
+
+    def delete_training_camp(self, camp_id: str, user_id: str) -> bool:
+        return self._delete('training_camps', (user_id, camp_id))
+
+    # ========== Physical metrics ==========
+    def _save_physical_metrics(self, metrics: list) -> None:
+        self._reset('physical_metrics', metrics)
+
+    def load_physical_metrics(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('physical_metrics', user_id)
+
+    def save_physical_metric(self, metric: PhysicalMetrics, user_id: str) -> str:
+        metric_dict = metric.model_dump()
+        metric_dict['user_id'] = user_id
+        self._upsert('physical_metrics', metric_dict)
+        return metric.id
+
+    def delete_physical_metric(self, metric_id: str, user_id: str) -> bool:
+        return self._delete('physical_metrics', (user_id, metric_id))
+
+    # ========== References ==========
+    def _save_references(self, references: list) -> None:
+        try:
+            self._reset('references', references)
+        except RuntimeError as e:
+            logger.error("Error saving references: %s", e)
+
+    def load_references(self, user_id: Optional[str] = None) -> list:
+        return self._load_list('references', user_id)
+
+    def save_reference(self, reference: Reference) -> Reference:
+        self._upsert('references', reference.model_dump())
+        return reference
+
+    def delete_reference(self, reference_id: str, user_id: Optional[str] = None) -> bool:
+        if user_id and not any(r.get('id') == reference_id for r in self.load_references(user_id)):
+            return False
+        return self._delete('references', (reference_id,))
+
+    # ========== Settings ==========
+    def _save_user_settings(self, user_settings: Dict[str, Any]) -> None:
+        self._reset('settings', user_settings)
+
+    def _load_user_settings(self) -> Dict[str, Any]:
+        return self._replay('settings')
+
+    def _save_settings(self, settings: AppSettings, user_id: str) -> None:
+        self._append('settings', {'op': 'upsert', 'key': user_id, 'record': settings.model_dump()})
+
+    # ========== Users ==========
+    def _save_users(self, users: list) -> None:
+        self._reset('users', users)
+
+    def load_users(self) -> list:
+        return self._replay('users')
+
+    def create_user(self, username: str, password: str, email: Optional[str] = None) -> Optional[User]:
+        # Hold the users lock from the check to the append so two workers can't add the same username
+        with self._locked_journal('users', exclusive=True):
+            if any(u.get('username') == username for u in self.load_users()):
+                return None  # Username already exists
+
+            user = User(
+                username=username,
+                password_hash=generate_password_hash(password),
+                email=email
+            )
+            self._upsert('users', user.model_dump())
+        _notify_user_changed(user.id)
+        return user
+
+    def update_user_password(self, user_id: str, new_password: str) -> bool:
+        with self._locked_journal('users', exclusive=True):
+            for user_data in self.load_users():
+                if user_data.get('id') == user_id:
+                    user_data['password_hash'] = generate_password_hash(new_password)
+                    self._upsert('users', user_data)
+                    break
+            else:
+                return False
+        _notify_user_changed(user_id)
+        return True
+
+    # ========== Subscriptions ==========
+    def _save_subscriptions(self, subscriptions: list) -> None:
+        self._reset('subscriptions', subscriptions)
+
+    def load_subscriptions(self) -> list:
+        return self._replay('subscriptions')
+
+    def save_subscription(self, subscription: Subscription) -> Subscription:
+        self._upsert('subscriptions', subscription.model_dump())
+        return subscription
+
+    def delete_subscription(self, user_id: str) -> bool:
+        return self._delete('subscriptions', (user_id,))
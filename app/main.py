@@ -28,10 +28,10 @@ except ImportError:
 from .routes import bp
 from .auth_routes import auth_bp
 from .subscription_routes import subscription_bp
-from .storage import StorageManager
+from .storage import StorageManager, get_storage_manager, add_user_change_listener
 from .models import Match, MatchCategory, MatchResult, AppSettings
 from .utils import parse_input_date
-from .auth import UserSession
+from .auth import UserSession, user_session_cache
 
 # Security imports
 try:
@@ -123,12 +123,18 @@ def create_app():
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.session_protection = 'basic'  # Use basic session protection
     
+    add_user_change_listener(user_session_cache.invalidate)
+    
     @login_manager.user_loader
     def load_user(user_id):
-        storage = StorageManager()
-        user = storage.get_user_by_id(user_id)
+        user_session = user_session_cache.get(user_id)
+        if user_session is not None:
+            return user_session
+        user = get_storage_manager().get_user_by_id(user_id)
         if user:
-            return UserSession(user)
+            user_session = UserSession(user)
+            user_session_cache.put(user_id, user_session)
+            return user_session
         return None
     
     # Security: Initialize CSRF protection
@@ -793,9 +799,15 @@ def create_app():
             return e
     
     # Initialize storage and sample data
-    storage = StorageManager()
+    storage = get_storage_manager()
     _initialize_sample_data(storage)
     
+    # Fold storage journals back into their base files in the background
+    from .journal_storage import JournaledStorageManager
+    if isinstance(storage, JournaledStorageManager):
+        storage.start_compactor()
+        app.logger.info("Storage journal compactor thread started")
+    
     # Start background task to check overdue subscriptions
     _start_subscription_checker(app)
     
@@ -806,6 +818,7 @@ def _check_overdue_subscriptions(app):
     """Background task to check and cancel overdue subscriptions"""
     with app.app_context():
         from .routes import storage
+        from .entitlements import get_entitlements
         from .models import Subscription, SubscriptionStatus
         from datetime import datetime
         
@@ -858,6 +871,7 @@ def _check_overdue_subscriptions(app):
                                 subscription.cancel_at_period_end = True
                                 subscription.updated_at = datetime.now().strftime("%d %b %Y")
                                 storage.save_subscription(subscription)
+                                get_entitlements().invalidate(subscription.user_id)
                                 cancelled_count += 1
                                 
                                 app.logger.info(f"Auto-cancelled overdue subscription for user {subscription.user_id}")
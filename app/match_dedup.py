@@ -0,0 +1,53 @@
+"""
+Duplicate detection for match imports
+
+A match is identified by its date, opponent, category and score, normalized
+so that the same spreadsheet row imported twice (or typed slightly
+differently: "Al Hilal" / "al  hilal", "2-1" / "2 - 1", "2025-10-23" /
+"23 Oct 2025") gives the same fingerprint. Imports keep a set of the user's
+fingerprints and look each incoming row up in it, instead of comparing it
+against every stored match.
+"""
+
+import hashlib
+import re
+from datetime import datetime
+from typing import Any, Dict
+
+# Date formats seen in stored records and imports, stored format first
+_DATE_FORMATS = ("%d %b %Y", "%Y-%m-%d", "%d/%m/%Y", "%d %B %Y")
+
+_SCORE = re.compile(r'^\s*(\d+)\s*[-:]\s*(\d+)\s*$')
+
+
+def _text(value: Any) -> str:
+    value = getattr(value, 'value', value)
+    return ' '.join(str(value).split()).casefold() if value is not None else ''
+
+
+def _date(value: Any) -> str:
+    text = ' '.join(str(value or '').split())
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return text.casefold()
+
+
+def _score(value: Any) -> str:
+    match = _SCORE.match(str(value or ''))
+    if match:
+        return f"{int(match.group(1))}-{int(match.group(2))}"
+    return _text(value).replace(' ', '')
+
+
+def match_fingerprint(record: Dict[str, Any]) -> bytes:
+    """Digest of a match record's normalized (date, opponent, category, score)"""
+    key = '\x1f'.join((
+        _date(record.get('date')),
+        _text(record.get('opponent')),
+        _text(record.get('category')),
+        _score(record.get('score')),
+    ))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
@@ -0,0 +1,217 @@
+"""
+Materialized match statistics for FutureElite
+
+UserMatchStats keeps running totals of a user's matches (results, goals,
+assists and minutes) per category, overall and per match day, so season and
+category stats can be answered without rebuilding every Match. It is updated
+record by record as matches are saved and deleted, and can always be rebuilt
+from the raw match records.
+
+Match days are kept sorted by date ordinal with suffix sums over them, so
+any "since date X" window is one bisect and one lookup, and every period
+the dashboard shows can be computed together by period_summaries().
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, List
+
+# Aggregate slots
+MATCHES, WINS, DRAWS, LOSSES, GOALS, ASSISTS, MINUTES = range(7)
+
+_RESULT_SLOTS = {'Win': WINS, 'Draw': DRAWS, 'Loss': LOSSES}
+
+# Every period the stats endpoints accept, in display order
+STATS_PERIODS = ['all_time', 'season', '12_months', '6_months', '3_months', 'last_month']
+
+# Rolling periods accepted by get_season_stats, in days before now
+ROLLING_PERIOD_DAYS = {
+    '12_months': 365,
+    '6_months': 180,
+    '3_months': 90,
+    'last_month': 30,
+}
+
+
+def _value(v):
+    """Enum members and their string values aggregate under the same key"""
+    return getattr(v, 'value', v)
+
+
+def _as_int(v) -> int:
+    try:
+        return int(v or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def period_cutoff(period: Optional[str], season_year: Optional[str] = None,
+                  now: Optional[datetime] = None) -> Optional[datetime]:
+    """Earliest match date included in period, or None for no date filter.
+
+    Mirrors utils.filter_matches_by_period: 'season' starts on 1 July of the
+    season's first year, the rolling periods count back from now, and an
+    unknown period or unparseable season means no filter.
+    """
+    if not period or period == 'all_time':
+        return None
+    if period == 'season':
+        if not season_year:
+            return None
+        try:
+            return datetime(int(season_year.split('/')[0]), 7, 1)
+        except (ValueError, IndexError):
+            return None
+    if period in ROLLING_PERIOD_DAYS:
+        return (now or datetime.now()) - timedelta(days=ROLLING_PERIOD_DAYS[period])
+    return None
+
+
+class UserMatchStats:
+    """Incrementally maintained aggregates over one user's match records"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()):
+        # category -> aggregate, for completed matches and fixtures
+        self.completed: Dict[str, List[int]] = {}
+        self.fixtures: Dict[str, List[int]] = {}
+        # date ordinal -> category -> aggregate, completed matches with a valid date
+        self.days: Dict[int, Dict[str, List[int]]] = {}
+        self._sorted_days: List[int] = []
+        # category (None for all) -> aggregates summed over _sorted_days[i:]
+        self._suffix: Optional[Dict[Optional[str], List[List[int]]]] = None
+        for record in records:
+            self.add(record)
+
+    @staticmethod
+    def _date_ordinal(record: Dict[str, Any]) -> Optional[int]:
+        try:
+            return datetime.strptime(record.get('date'), "%d %b %Y").toordinal()
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _apply(aggregates: Dict[str, List[int]], category, record: Dict[str, Any], sign: int) -> None:
+        aggregate = aggregates.get(category)
+        if aggregate is None:
+            aggregate = aggregates[category] = [0] * 7
+        aggregate[MATCHES] += sign
+        result_slot = _RESULT_SLOTS.get(_value(record.get('result')))
+        if result_slot is not None:
+            aggregate[result_slot] += sign
+        aggregate[GOALS] += sign * _as_int(record.get('brodie_goals'))
+        aggregate[ASSISTS] += sign * _as_int(record.get('brodie_assists'))
+        aggregate[MINUTES] += sign * _as_int(record.get('minutes_played'))
+        if aggregate[MATCHES] == 0:
+            del aggregates[category]
+
+    def _update(self, record: Optional[Dict[str, Any]], sign: int) -> None:
+        if not record:
+            return
+        self._suffix = None
+        category = _value(record.get('category'))
+        if record.get('is_fixture'):
+            self._apply(self.fixtures, category, record, sign)
+            return
+        self._apply(self.completed, category, record, sign)
+
+        ordinal = self._date_ordinal(record)
+        if ordinal is None:
+            return
+        day = self.days.get(ordinal)
+        if day is None:
+            day = self.days[ordinal] = {}
+            insort(self._sorted_days, ordinal)
+        self._apply(day, category, record, sign)
+        if not day:
+            del self.days[ordinal]
+            self._sorted_days.pop(bisect_left(self._sorted_days, ordinal))
+
+    def add(self, record: Optional[Dict[str, Any]]) -> None:
+        self._update(record, 1)
+
+    def remove(self, record: Optional[Dict[str, Any]]) -> None:
+        self._update(record, -1)
+
+    def replace(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        self.remove(old)
+        self.add(new)
+
+    def _build_suffix(self) -> Dict[Optional[str], List[List[int]]]:
+        """Suffix sums over the sorted match days, overall and per category"""
+        categories = {category for day in self.days.values() for category in day}
+        count = len(self._sorted_days)
+        suffix = {key: [[0] * 7 for _ in range(count + 1)] for key in [None, *categories]}
+        for i in range(count - 1, -1, -1):
+            day = self.days[self._sorted_days[i]]
+            overall = suffix[None][i]
+            overall[:] = suffix[None][i + 1]
+            for key in categories:
+                row = suffix[key][i]
+                row[:] = suffix[key][i + 1]
+                aggregate = day.get(key)
+                if aggregate is not None:
+                    for slot in range(7):
+                        row[slot] += aggregate[slot]
+                        overall[slot] += aggregate[slot]
+        return suffix
+
+    def _sum(self, cutoff: Optional[datetime], category: Optional[str] = None,
+             include_fixtures: bool = False) -> List[int]:
+        if cutoff is not None:
+            if self._suffix is None:
+                self._suffix = self._build_suffix()
+            # A match counts if midnight on its date is at or after the cutoff
+            first = cutoff.toordinal()
+            if cutoff.time() != datetime.min.time():
+                first += 1
+            rows = self._suffix.get(category)
+            if rows is None:
+                return [0] * 7
+            return list(rows[bisect_left(self._sorted_days, first)])
+
+        total = [0] * 7
+        sources = [self.completed]
+        if include_fixtures:
+            sources.append(self.fixtures)
+        for aggregates in sources:
+            for key, aggregate in aggregates.items():
+                if category is None or key == category:
+                    for slot in range(7):
+                        total[slot] += aggregate[slot]
+        return total
+
+    def season_stats(self, cutoff: Optional[datetime] = None) -> Dict[str, Any]:
+        total = self._sum(cutoff)
+        return {
+            "total_matches": total[MATCHES],
+            "wins": total[WINS],
+            "draws": total[DRAWS],
+            "losses": total[LOSSES],
+            "goals": total[GOALS],
+            "assists": total[ASSISTS],
+            "minutes": total[MINUTES]
+        }
+
+    def category_stats(self, category: str, cutoff: Optional[datetime] = None,
+                       include_fixtures: bool = False) -> Dict[str, Any]:
+        total = self._sum(cutoff, _value(category), include_fixtures)
+        return {
+            "matches": total[MATCHES],
+            "goals": total[GOALS],
+            "assists": total[ASSISTS],
+            "minutes": total[MINUTES]
+        }
+
+    def summary(self, cutoff: Optional[datetime] = None) -> Dict[str, Any]:
+        """Season, pre-season and league stats for completed matches since cutoff"""
+        return {
+            'season': self.season_stats(cutoff),
+            'pre_season': self.category_stats("Pre-Season Friendly", cutoff),
+            'league': self.category_stats("League", cutoff)
+        }
+
+    def period_summaries(self, season_year: Optional[str] = None,
+                         now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """summary() for every period in STATS_PERIODS at once"""
+        now = now or datetime.now()
+        return {period: self.summary(period_cutoff(period, season_year, now)) for period in STATS_PERIODS}
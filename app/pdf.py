@@ -1,38 +1,55 @@
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch, mm
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, KeepTogether, Image
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, BinaryIO, Tuple, Union, Callable
 import os
 
 from .models import Match, AppSettings, PhysicalMeasurement, Achievement, ClubHistory, TrainingCamp, PhysicalMetrics, Reference
 from .utils import sort_matches_by_date, filter_matches_by_period
+from .pdf_styles import get_report_styles, report_color
+from .pdf_tables import chunked_table, lean_cell
+from .photos import get_photo_variant
+from .pdf_fragments import fragment_key, get_fragment_cache
+from .pdf_profiles import get_pdf_profile
+
+# Bump whenever report layout or content changes so cached reports are re-rendered
+PDF_GENERATOR_VERSION = 2
 
 
 class PDFGenerator:
-    def __init__(self, settings: AppSettings):
+    def __init__(self, settings: AppSettings, profile: Optional[str] = None):
         self.settings = settings
+        self.profile = get_pdf_profile(profile)
         self.page_width, self.page_height = landscape(A4)
         self.margin = 36  # 36 points = 0.5 inch
         self.content_width = self.page_width - (2 * self.margin)
         
         # Define colors
-        self.primary_color = colors.HexColor(settings.primary_color)  # Qadsiah red
-        self.header_color = colors.HexColor(settings.header_color)    # Header grey
-        self.light_grey = colors.HexColor("#F3F4F6")
-        self.dark_grey = colors.HexColor("#6B7280")
+        self.primary_color = report_color(settings.primary_color)  # Qadsiah red
+        self.header_color = report_color(settings.header_color)    # Header grey
+        self.light_grey = report_color("#F3F4F6")
+        self.dark_grey = report_color("#6B7280")
         
-        # Create styles
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        # Shared per-theme stylesheet, built once per process
+        self.styles = get_report_styles(settings.primary_color, settings.header_color,
+                                        self._create_custom_styles)
         
         # Period tracking
         self.period = 'all_time'
     
+    def _cached_section(self, build: Callable[..., List], *inputs) -> List:
+        """Flowables from build(*inputs), reused across renders while settings and inputs are unchanged.
+
+        Only for sections that do not depend on matches or the period.
+        """
+        key = fragment_key(f"{type(self).__qualname__}:{self.profile.name}", build.__name__, self.settings, inputs)
+        return get_fragment_cache().get_or_build(key, lambda: build(*inputs))
+    
     def _get_period_label(self) -> str:
         """Get human-readable label for the current period"""
         period_labels = {
@@ -45,35 +62,37 @@ class PDFGenerator:
         }
         return period_labels.get(self.period, 'All Time')
 
-    def _create_custom_styles(self):
-        """Create custom paragraph styles"""
+    @staticmethod
+    def _create_custom_styles(styles: StyleSheet1, primary_color: colors.Color, header_color: colors.Color):
+        """Add custom paragraph styles to a stylesheet for get_report_styles"""
+        dark_grey = report_color("#6B7280")
         # Title style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            parent=self.styles['Title'],
+            parent=styles['Title'],
             fontSize=16,
             spaceAfter=20,
             alignment=TA_CENTER,
-            textColor=self.primary_color,
+            textColor=primary_color,
             fontName='Helvetica-Bold'
         ))
         
         # Section header style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=12,
             spaceAfter=12,
             spaceBefore=16,
             alignment=TA_LEFT,
-            textColor=self.header_color,
+            textColor=header_color,
             fontName='Helvetica-Bold'
         ))
         
         # Table header style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableHeader',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9.5,
             alignment=TA_CENTER,
             textColor=colors.white,
@@ -81,9 +100,9 @@ class PDFGenerator:
         ))
         
         # Table cell style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableCell',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9.5,
             alignment=TA_LEFT,
             fontName='Helvetica',
@@ -93,9 +112,9 @@ class PDFGenerator:
         ))
         
         # Table cell center style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableCellCenter',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9.5,
             alignment=TA_CENTER,
             fontName='Helvetica',
@@ -105,45 +124,45 @@ class PDFGenerator:
         ))
         
         # Metric value style (large, bold numbers)
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MetricValue',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=18,
             alignment=TA_CENTER,
             fontName='Helvetica-Bold',
-            textColor=self.primary_color,
+            textColor=primary_color,
             leading=22,
             spaceAfter=4
         ))
         
         # Metric label style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MetricLabel',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=8.5,
             alignment=TA_CENTER,
             fontName='Helvetica',
-            textColor=self.dark_grey,
+            textColor=dark_grey,
             leading=10,
             spaceAfter=0
         ))
         
         # Footer style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='Footer',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=8,
             alignment=TA_RIGHT,
-            textColor=self.dark_grey,
+            textColor=dark_grey,
             fontName='Helvetica'
         ))
 
-    def generate_pdf(self, matches: List[Match], output_path: str, physical_measurements: List[PhysicalMeasurement] = None, physical_metrics: List[PhysicalMetrics] = None, period: str = 'all_time') -> str:
+    def generate_pdf(self, matches: List[Match], output_path: Union[str, BinaryIO], physical_measurements: List[PhysicalMeasurement] = None, physical_metrics: List[PhysicalMetrics] = None, period: str = 'all_time') -> Union[str, BinaryIO]:
         """Generate the complete PDF report
         
         Args:
             matches: List of all matches
-            output_path: Path to save the PDF
+            output_path: Path to save the PDF, or a binary file-like object to write it to
             physical_measurements: List of physical measurements
             physical_metrics: List of physical metrics
             period: Time period filter ('all_time', 'season', '12_months', '6_months', '3_months', 'last_month')
@@ -160,7 +179,8 @@ class PDFGenerator:
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            pageCompression=self.profile.page_compression
         )
         
         story = []
@@ -389,21 +409,16 @@ class PDFGenerator:
         
         col_widths = [0.4*inch, 1*inch, 0.8*inch, 1.2*inch, 1.2*inch, 0.9*inch, 1*inch, 0.7*inch, 0.5*inch, 0.5*inch, 0.6*inch, 1.2*inch]
         
-        wrapped_data = []
-        for row_idx, row in enumerate(data):
-            wrapped_row = []
-            for col_idx, cell in enumerate(row):
-                if row_idx == 0:
-                    wrapped_row.append(Paragraph(str(cell), self.styles['TableHeader']))
-                else:
-                    if col_idx in [3, 4, 11]:
-                        wrapped_row.append(Paragraph(str(cell), self.styles['TableCell']))
-                    else:
-                        wrapped_row.append(Paragraph(str(cell), self.styles['TableCellCenter']))
-            wrapped_data.append(wrapped_row)
+        header = [Paragraph(str(cell), self.styles['TableHeader']) for cell in data[0]]
+        # Only cells that need wrapping become Paragraphs
+        cell_styles = [self.styles['TableCell'] if col_idx in [3, 4, 11] else self.styles['TableCellCenter']
+                       for col_idx in range(len(header))]
+        rows = [
+            [lean_cell(cell, cell_styles[col_idx], col_widths[col_idx]) for col_idx, cell in enumerate(row)]
+            for row in data[1:]
+        ]
         
-        # Use repeatRows=1 to repeat header on each page
-        table = Table(wrapped_data, colWidths=col_widths, repeatRows=1)
+        # Fixed-size LongTable chunks, each repeating the header on every page
         table_style = TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), self.primary_color),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
@@ -414,6 +429,7 @@ class PDFGenerator:
             ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 1), (-1, -1), 9.5),
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.light_grey]),
+            ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
             ('ALIGN', (3, 1), (3, -1), 'LEFT'),
             ('ALIGN', (4, 1), (4, -1), 'LEFT'),
             ('ALIGN', (11, 1), (11, -1), 'LEFT'),
@@ -424,8 +440,7 @@ class PDFGenerator:
             ('TOPPADDING', (0, 0), (-1, -1), 6),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
         ])
-        table.setStyle(table_style)
-        elements.append(table)
+        elements.extend(chunked_table(header, rows, col_widths, table_style))
         return elements
     
     def _create_league_matches_table(self, matches: List[Match]) -> List:
@@ -863,7 +878,21 @@ class PDFGenerator:
         return elements
 
 
-def generate_season_pdf(matches: List[Match], settings: AppSettings, output_dir: str = "output", physical_measurements: List[PhysicalMeasurement] = None, physical_metrics: List[PhysicalMetrics] = None, period: str = 'all_time') -> str:
+def _report_destination(settings: AppSettings, output_dir: str, target: Optional[BinaryIO],
+                        suffix: str = '') -> Tuple[str, Union[str, BinaryIO]]:
+    """Return the report's filename and where to render it: target if given, else a file in output_dir"""
+    from .utils import generate_pdf_filename
+    filename = generate_pdf_filename(settings)
+    if suffix:
+        filename = filename.replace('.pdf', suffix)
+    if target is not None:
+        return filename, target
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+    return filename, os.path.join(output_dir, filename)
+
+
+def generate_season_pdf(matches: List[Match], settings: AppSettings, output_dir: str = "output", physical_measurements: List[PhysicalMeasurement] = None, physical_metrics: List[PhysicalMetrics] = None, period: str = 'all_time', target: Optional[BinaryIO] = None, profile: Optional[str] = None) -> str:
     """Generate a season PDF report
     
     Args:
@@ -873,18 +902,18 @@ def generate_season_pdf(matches: List[Match], settings: AppSettings, output_dir:
         physical_measurements: List of physical measurements
         physical_metrics: List of physical metrics
         period: Time period filter ('all_time', 'season', '12_months', '6_months', '3_months', 'last_month')
+        target: Binary file-like object (e.g. BytesIO) to render into instead of a file in output_dir
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
+
+    Returns:
+        Path of the written PDF, or just its filename when rendering into target
     """
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Generate filename
-    from .utils import generate_pdf_filename
-    filename = generate_pdf_filename(settings)
-    output_path = os.path.join(output_dir, filename)
+    filename, destination = _report_destination(settings, output_dir, target)
     
     # Generate PDF
-    generator = PDFGenerator(settings)
-    return generator.generate_pdf(matches, output_path, physical_measurements or [], physical_metrics or [], period=period)
+    generator = PDFGenerator(settings, profile)
+    output_path = generator.generate_pdf(matches, destination, physical_measurements or [], physical_metrics or [], period=period)
+    return filename if target is not None else output_path
 
 
 def generate_scout_pdf(
@@ -897,7 +926,9 @@ def generate_scout_pdf(
     physical_metrics: List[PhysicalMetrics] = None,
     references: List[Reference] = None,
     output_dir: str = "output",
-    period: str = 'all_time'
+    period: str = 'all_time',
+    target: Optional[BinaryIO] = None,
+    profile: Optional[str] = None
 ) -> str:
     """Generate a professional scout-friendly PDF report
     
@@ -911,19 +942,18 @@ def generate_scout_pdf(
         physical_metrics: List of physical metrics
         output_dir: Output directory
         period: Time period filter ('all_time', 'season', '12_months', '6_months', '3_months', 'last_month')
+        target: Binary file-like object (e.g. BytesIO) to render into instead of a file in output_dir
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
+
+    Returns:
+        Path of the written PDF, or just its filename when rendering into target
     """
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Generate filename
-    from .utils import generate_pdf_filename
-    base_filename = generate_pdf_filename(settings)
-    filename = base_filename.replace('.pdf', '_Scout_Report.pdf')
-    output_path = os.path.join(output_dir, filename)
+    filename, destination = _report_destination(settings, output_dir, target, '_Scout_Report.pdf')
     
     # Generate PDF
-    generator = ScoutPDFGenerator(settings)
-    return generator.generate_pdf(matches, output_path, achievements, club_history, physical_measurements or [], training_camps or [], physical_metrics or [], references or [], period=period)
+    generator = ScoutPDFGenerator(settings, profile)
+    output_path = generator.generate_pdf(matches, destination, achievements, club_history, physical_measurements or [], training_camps or [], physical_metrics or [], references or [], period=period)
+    return filename if target is not None else output_path
 
 
 class ScoutPDFGenerator(PDFGenerator):
@@ -932,7 +962,7 @@ class ScoutPDFGenerator(PDFGenerator):
     def generate_pdf(
         self, 
         matches: List[Match], 
-        output_path: str, 
+        output_path: Union[str, BinaryIO], 
         achievements: List[Achievement],
         club_history: List[ClubHistory],
         physical_measurements: List[PhysicalMeasurement] = None,
@@ -940,12 +970,12 @@ class ScoutPDFGenerator(PDFGenerator):
         physical_metrics: List[PhysicalMetrics] = None,
         references: List[Reference] = None,
         period: str = 'all_time'
-    ) -> str:
+    ) -> Union[str, BinaryIO]:
         """Generate the complete scout-friendly PDF report
         
         Args:
             matches: List of all matches
-            output_path: Path to save the PDF
+            output_path: Path to save the PDF, or a binary file-like object to write it to
             achievements: List of achievements
             club_history: List of club history entries
             physical_measurements: List of physical measurements
@@ -965,25 +995,26 @@ class ScoutPDFGenerator(PDFGenerator):
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            pageCompression=self.profile.page_compression
         )
         
         story = []
         
         # PAGE 1: Cover page
-        title_page_elements = self._create_title_page()
+        title_page_elements = self._cached_section(self._create_title_page)
         story.extend(title_page_elements)
         
         # PAGE 2: Player profile details, photo, media, and references
         page2_elements = []
         
         # Add comprehensive player profile (always include this - it always returns content)
-        profile_elements = self._create_scout_player_profile(physical_measurements or [], physical_metrics)
+        profile_elements = self._cached_section(self._create_scout_player_profile, physical_measurements or [], physical_metrics)
         page2_elements.extend(profile_elements)
         page2_elements.append(Spacer(1, 12))
         
         # Add player photo and media (references moved to page 3)
-        media_elements = self._create_player_media_section()
+        media_elements = self._cached_section(self._create_player_media_section)
         if media_elements:
             page2_elements.extend(media_elements)
         
@@ -997,11 +1028,11 @@ class ScoutPDFGenerator(PDFGenerator):
         references_elements = []
         
         if club_history:
-            club_history_elements = self._create_club_history_section(club_history)
+            club_history_elements = self._cached_section(self._create_club_history_section, club_history)
         if training_camps:
-            training_camps_elements = self._create_training_camps_section(training_camps)
+            training_camps_elements = self._cached_section(self._create_training_camps_section, training_camps)
         if references:
-            references_elements = self._create_references_section(references)
+            references_elements = self._cached_section(self._create_references_section, references)
         
         # Combine all sections and keep them together on same page
         if club_history_elements or training_camps_elements or references_elements:
@@ -1023,22 +1054,22 @@ class ScoutPDFGenerator(PDFGenerator):
         
         # Add playing profile section
         if self.settings.playing_profile and len(self.settings.playing_profile) > 0:
-            page4_elements.extend(self._create_playing_profile_section())
+            page4_elements.extend(self._cached_section(self._create_playing_profile_section))
             page4_elements.append(Spacer(1, 12))
         
         # Add achievements
         if achievements:
-            page4_elements.extend(self._create_achievements_section(achievements))
+            page4_elements.extend(self._cached_section(self._create_achievements_section, achievements))
             page4_elements.append(Spacer(1, 12))
         
         # Add physical development
         if physical_measurements:
-            page4_elements.extend(self._create_physical_development_section(physical_measurements))
+            page4_elements.extend(self._cached_section(self._create_physical_development_section, physical_measurements))
             page4_elements.append(Spacer(1, 12))
         
         # Add physical performance metrics
         if physical_metrics:
-            page4_elements.extend(self._create_physical_metrics_section(physical_metrics))
+            page4_elements.extend(self._cached_section(self._create_physical_metrics_section, physical_metrics))
         
         # Keep all page 4 content together
         if page4_elements:
@@ -1270,7 +1301,8 @@ class ScoutPDFGenerator(PDFGenerator):
         elements = []
         
         # Check if there's any media to display
-        has_photo = self.settings.player_photo_path and os.path.exists(self.settings.player_photo_path)
+        photo_path = get_photo_variant(self.settings.player_photo_path, self.profile.photo_variant)
+        has_photo = photo_path is not None
         has_highlight_reels = self.settings.highlight_reel_urls and len(self.settings.highlight_reel_urls) > 0
         has_contact_email = self.settings.contact_email and self.settings.contact_email.strip()
         
@@ -1284,16 +1316,7 @@ class ScoutPDFGenerator(PDFGenerator):
         # Add player photo if available (centered)
         if has_photo:
             try:
-                # Handle both absolute and relative paths
-                photo_path = self.settings.player_photo_path
-                if not os.path.isabs(photo_path):
-                    # Try relative to current working directory first
-                    if not os.path.exists(photo_path):
-                        # Try relative to app directory
-                        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                        photo_path = os.path.join(app_dir, photo_path)
-                
-                # Load and resize image (max 2.5 inches width, maintain aspect ratio)
+                # Pre-sized print JPEG, embedded without decoding (max 2.5 inches width, maintain aspect ratio)
                 img = Image(photo_path, width=2.5*inch, height=3*inch, kind='proportional')
                 # Center the image
                 img_table = Table([[img]], colWidths=[7.5*inch])
@@ -2086,7 +2109,9 @@ def generate_player_resume_pdf(
     physical_metrics: List[PhysicalMetrics] = None,
     references: List[Reference] = None,
     output_dir: str = "output",
-    period: str = 'season'
+    period: str = 'season',
+    target: Optional[BinaryIO] = None,
+    profile: Optional[str] = None
 ) -> str:
     """Generate a comprehensive Player Resume PDF report
     
@@ -2101,19 +2126,18 @@ def generate_player_resume_pdf(
         references: List of references
         output_dir: Output directory
         period: Time period filter ('all_time', 'season', '12_months', '6_months', '3_months', 'last_month')
+        target: Binary file-like object (e.g. BytesIO) to render into instead of a file in output_dir
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
+
+    Returns:
+        Path of the written PDF, or just its filename when rendering into target
     """
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Generate filename
-    from .utils import generate_pdf_filename
-    base_filename = generate_pdf_filename(settings)
-    filename = base_filename.replace('.pdf', '_Player_Resume.pdf')
-    output_path = os.path.join(output_dir, filename)
+    filename, destination = _report_destination(settings, output_dir, target, '_Player_Resume.pdf')
     
     # Generate PDF
-    generator = PlayerResumePDFGenerator(settings)
-    return generator.generate_pdf(matches, output_path, achievements, club_history, physical_measurements or [], training_camps or [], physical_metrics or [], references or [], period=period)
+    generator = PlayerResumePDFGenerator(settings, profile)
+    output_path = generator.generate_pdf(matches, destination, achievements, club_history, physical_measurements or [], training_camps or [], physical_metrics or [], references or [], period=period)
+    return filename if target is not None else output_path
 
 
 class PlayerResumePDFGenerator(PDFGenerator):
@@ -2122,7 +2146,7 @@ class PlayerResumePDFGenerator(PDFGenerator):
     def generate_pdf(
         self, 
         matches: List[Match], 
-        output_path: str, 
+        output_path: Union[str, BinaryIO], 
         achievements: List[Achievement],
         club_history: List[ClubHistory],
         physical_measurements: List[PhysicalMeasurement] = None,
@@ -2130,12 +2154,12 @@ class PlayerResumePDFGenerator(PDFGenerator):
         physical_metrics: List[PhysicalMetrics] = None,
         references: List[Reference] = None,
         period: str = 'season'
-    ) -> str:
+    ) -> Union[str, BinaryIO]:
         """Generate the complete Player Resume PDF report
         
         Args:
             matches: List of all matches
-            output_path: Path to save the PDF
+            output_path: Path to save the PDF, or a binary file-like object to write it to
             achievements: List of achievements
             club_history: List of club history entries
             physical_measurements: List of physical measurements
@@ -2156,13 +2180,14 @@ class PlayerResumePDFGenerator(PDFGenerator):
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            pageCompression=self.profile.page_compression
         )
         
         story = []
         
         # PAGE 1: Cover and Identity
-        cover_elements = self._create_resume_cover_page(physical_measurements or [], physical_metrics)
+        cover_elements = self._cached_section(self._create_resume_cover_page, physical_measurements or [], physical_metrics)
         story.extend(cover_elements)
         story.append(PageBreak())
         
@@ -2179,29 +2204,29 @@ class PlayerResumePDFGenerator(PDFGenerator):
             story.append(PageBreak())
         
         # PAGE 4: Achievements
-        achievements_elements = self._create_resume_achievements_section(achievements)
+        achievements_elements = self._cached_section(self._create_resume_achievements_section, achievements)
         if achievements_elements:
             story.extend(achievements_elements)
             story.append(PageBreak())
         
         # PAGE 5: Physical Development and Growth Analysis
-        physical_elements = self._create_resume_physical_development_section(physical_measurements or [], physical_metrics)
+        physical_elements = self._cached_section(self._create_resume_physical_development_section, physical_measurements or [], physical_metrics)
         if physical_elements:
             story.extend(physical_elements)
             story.append(PageBreak())
         
         # PAGE 6: Club History (always include, even if empty)
-        club_history_elements = self._create_resume_club_history_section(club_history or [])
+        club_history_elements = self._cached_section(self._create_resume_club_history_section, club_history or [])
         story.extend(club_history_elements)
         story.append(PageBreak())
         
         # PAGE 7: Training and Development Exposure (always include, even if empty)
-        training_elements = self._create_resume_training_camps_section(training_camps or [])
+        training_elements = self._cached_section(self._create_resume_training_camps_section, training_camps or [])
         story.extend(training_elements)
         story.append(PageBreak())
         
         # PAGE 8: References
-        references_elements = self._create_resume_references_section(references or [])
+        references_elements = self._cached_section(self._create_resume_references_section, references or [])
         if references_elements:
             story.extend(references_elements)
         
@@ -2235,14 +2260,9 @@ class PlayerResumePDFGenerator(PDFGenerator):
         elements.append(Spacer(1, 20))
         
         # Player Photo (if available)
-        if self.settings.player_photo_path and os.path.exists(self.settings.player_photo_path):
+        photo_path = get_photo_variant(self.settings.player_photo_path, self.profile.photo_variant)
+        if photo_path:
             try:
-                photo_path = self.settings.player_photo_path
-                if not os.path.isabs(photo_path):
-                    if not os.path.exists(photo_path):
-                        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                        photo_path = os.path.join(app_dir, photo_path)
-                
                 img = Image(photo_path, width=2.5*inch, height=3*inch, kind='proportional')
                 img_table = Table([[img]], colWidths=[7.5*inch])
                 img_style = TableStyle([
@@ -0,0 +1,160 @@
+"""
+Rendered PDF report cache for FutureElite
+
+Regenerating a report with unchanged data produces the same document, so
+PDFCache stores rendered bytes under a SHA-256 of the normalized inputs
+(report kind, generator version, every model argument, the period, the
+render date and the player photo's file signature). A hit is served
+straight from disk without touching ReportLab. The cache is bounded by
+total size and evicts least recently used reports first.
+
+Entries are plain files, <key>.pdf plus <key>.json holding the download
+name, so every gunicorn worker and PDF job process shares one cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+from .pdf import PDF_GENERATOR_VERSION
+from .pdf_fragments import normalize_inputs
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _photo_signature(settings) -> Optional[list]:
+    # The photo is read from disk at render time, so a replaced file must change the key
+    photo_path = getattr(settings, 'player_photo_path', None)
+    if not photo_path:
+        return None
+    try:
+        st = os.stat(photo_path)
+    except OSError:
+        return None
+    return [photo_path, st.st_mtime_ns, st.st_size]
+
+
+def report_cache_key(kind: str, kwargs: Dict[str, Any], today: Optional[date] = None) -> str:
+    """Stable hash of everything that determines a rendered report"""
+    payload = {
+        'kind': kind,
+        'version': PDF_GENERATOR_VERSION,
+        # Reports print the generation date and rolling periods count back from today
+        'date': (today or date.today()).isoformat(),
+        'photo': _photo_signature(kwargs.get('settings')),
+        'inputs': normalize_inputs(kwargs),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class PDFCache:
+    """Size-bounded LRU of rendered reports on disk"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # Jobs ship the cache to pool processes, which rebuild their own lock
+    def __getstate__(self):
+        return {'cache_dir': self.cache_dir, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state['cache_dir'], state['max_bytes'])
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.pdf", self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[Path, str]]:
+        """Return (pdf path, download name) for a cached report, or None"""
+        if not self.enabled:
+            return None
+        pdf_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                filename = json.load(f)['filename']
+            # Touch the entry so eviction treats it as recently used
+            os.utime(pdf_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return pdf_path, filename
+
+    def _write_atomic(self, target: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def put(self, key: str, source_path: str, filename: Optional[str] = None) -> None:
+        """Copy a rendered report file into the cache"""
+        with open(source_path, 'rb') as f:
+            self.put_bytes(key, f.read(), filename or os.path.basename(source_path))
+
+    def put_bytes(self, key: str, data: bytes, filename: str) -> None:
+        """Store a rendered report and evict down to max_bytes"""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        pdf_path, meta_path = self._paths(key)
+        self._write_atomic(pdf_path, data)
+        self._write_atomic(meta_path, json.dumps({'filename': filename}).encode('utf-8'))
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used reports until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for pdf_path in self.cache_dir.glob('*.pdf'):
+                try:
+                    st = pdf_path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, pdf_path))
+                total += st.st_size
+            entries.sort()
+            removed = 0
+            for _, size, pdf_path in entries:
+                if total <= self.max_bytes:
+                    break
+                for path in (pdf_path, pdf_path.with_suffix('.json')):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                removed += 1
+            return removed
+
+
+_cache: Optional[PDFCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_pdf_cache(output_dir: str) -> PDFCache:
+    """Return the process-wide report cache, sized from PDF_CACHE_MAX_MB"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_mb = os.environ.get('PDF_CACHE_MAX_MB')
+                max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb is not None else DEFAULT_MAX_BYTES
+                _cache = PDFCache(os.path.join(output_dir, 'pdf_cache'), max_bytes)
+    return _cache
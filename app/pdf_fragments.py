@@ -0,0 +1,122 @@
+"""
+Section fragment cache for FutureElite PDF reports
+
+Most pages of the scout and resume reports (cover, profile, media, club
+history, achievements, training camps, references, physical development)
+only depend on the player's settings and profile records, not on matches.
+FragmentCache keeps the flowables built for each of those sections, keyed
+by a SHA-256 of the section's inputs, so re-rendering after a match is
+added rebuilds just the match-driven pages.
+
+ReportLab leaves layout state on the flowables it places (a paragraph it
+had to move to the next page is marked as postponed, and only multiBuild
+resets that), so the cached flowables are never handed to a build
+themselves: every render gets a deep copy, which keeps the parsed
+paragraphs and table data without any earlier layout. Entries are kept per
+thread, since each gunicorn worker or PDF job process renders one report at
+a time.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, List, Optional, Sequence, Any
+
+DEFAULT_MAX_SECTIONS = 128
+
+
+def normalize_inputs(value):
+    """Convert report or section inputs (models, lists, dicts) to plain JSON-compatible data"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): normalize_inputs(v) for k, v in value.items()}
+    return value
+
+
+def _file_signature(path: Optional[str]) -> Optional[list]:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [path, st.st_mtime_ns, st.st_size]
+
+
+def fragment_key(generator: str, section: str, settings: Any, inputs: Sequence[Any],
+                 today: Optional[date] = None) -> str:
+    """Hash of everything a static section is built from.
+
+    Sections print the generation date and ages, so the key changes daily,
+    and the player photo is read from disk, so its file signature is
+    included too.
+    """
+    payload = {
+        'generator': generator,
+        'section': section,
+        'date': (today or date.today()).isoformat(),
+        'settings': normalize_inputs(settings),
+        'photo': _file_signature(getattr(settings, 'player_photo_path', None)),
+        'inputs': normalize_inputs(list(inputs)),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class FragmentCache:
+    """Per-thread LRU of built section flowables"""
+
+    def __init__(self, max_sections: int = DEFAULT_MAX_SECTIONS):
+        self.max_sections = max_sections
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _entries(self) -> 'OrderedDict[str, tuple]':
+        entries = getattr(self._local, 'entries', None)
+        if entries is None:
+            entries = self._local.entries = OrderedDict()
+        return entries
+
+    def get_or_build(self, key: str, build: Callable[[], List]) -> List:
+        """Return the section stored under key, building and storing it on a miss.
+
+        The caller gets a deep copy each time, so laying it out, extending or
+        wrapping it does not change the cached section.
+        """
+        entries = self._entries()
+        flowables = entries.get(key)
+        if flowables is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(list(flowables))
+        self.misses += 1
+        flowables = tuple(build())
+        entries[key] = flowables
+        while len(entries) > self.max_sections:
+            entries.popitem(last=False)
+        return copy.deepcopy(list(flowables))
+
+    def clear(self):
+        self._entries().clear()
+
+
+_fragment_cache: Optional[FragmentCache] = None
+_fragment_cache_lock = threading.Lock()
+
+
+def get_fragment_cache() -> FragmentCache:
+    """Process-wide fragment cache; PDF_FRAGMENT_CACHE_SECTIONS=0 disables it"""
+    global _fragment_cache
+    if _fragment_cache is None:
+        with _fragment_cache_lock:
+            if _fragment_cache is None:
+                _fragment_cache = FragmentCache(int(os.environ.get('PDF_FRAGMENT_CACHE_SECTIONS', DEFAULT_MAX_SECTIONS)))
+    return _fragment_cache
@@ -0,0 +1,363 @@
+"""
+Background PDF rendering for FutureElite
+
+ReportLab renders for a long season can take seconds, which is too long to
+hold a sync gunicorn worker (timeout = 30). The PDF routes submit a job to
+PDFJobQueue instead and return a job id; a local process pool renders the
+report and the client polls /pdf-jobs/<job_id> and downloads the file when
+it is ready.
+
+Each job lives in its own directory under its user's directory,
+output/pdf_jobs/<user key>/<job_id>/, holding job.json (status and timings)
+and the finished PDF. Status is kept on disk rather than in memory because
+the poll may be served by a different gunicorn worker than the one that
+accepted the job. A submit only reads the submitting user's jobs, and
+checks the per-user limit and creates the job while holding a lock on the
+user's directory, so workers can't race past the limit. Finished jobs are
+swept at most every CLEANUP_INTERVAL_SECONDS per worker.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from .storage import file_lock
+
+logger = logging.getLogger(__name__)
+
+# Render processes per gunicorn worker; 0 renders inline in the request
+DEFAULT_WORKERS = 2
+# Jobs queued or rendering per gunicorn worker before new jobs are refused
+DEFAULT_MAX_PENDING = 16
+# Unfinished jobs one user may have at a time
+DEFAULT_MAX_JOBS_PER_USER = 2
+# Queued/running jobs older than this are treated as lost (e.g. worker restart)
+JOB_TIMEOUT_SECONDS = 600
+# Finished jobs and their PDFs are deleted after this long
+JOB_RETENTION_SECONDS = 3600
+# Minimum time between sweeps for expired jobs in one gunicorn worker
+CLEANUP_INTERVAL_SECONDS = 300
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+# Job kind -> name of the generate_* function in app.pdf
+JOB_RENDERERS = {
+    'season': 'generate_season_pdf',
+    'scout': 'generate_scout_pdf',
+    'resume': 'generate_player_resume_pdf',
+}
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+_job_stats = {
+    'submitted': 0,
+    'completed': 0,
+    'failed': 0,
+    'rejected_queue_full': 0,
+    'rejected_user_limit': 0,
+    'queue_seconds_total': 0.0,
+    'render_seconds_total': 0.0,
+    'render_seconds_max': 0.0,
+}
+_job_stats_lock = threading.Lock()
+
+
+class JobRejected(Exception):
+    """Raised when a job cannot be queued; status_code is the HTTP status to return"""
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_job_stats() -> Dict[str, Any]:
+    """Snapshot of this process's job counters and durations"""
+    with _job_stats_lock:
+        stats = dict(_job_stats)
+    finished = stats['completed'] + stats['failed']
+    stats['render_seconds_avg'] = stats['render_seconds_total'] / stats['completed'] if stats['completed'] else 0.0
+    stats['queue_seconds_avg'] = stats['queue_seconds_total'] / finished if finished else 0.0
+    return stats
+
+
+def _record_job(status: str, job: Dict[str, Any]) -> None:
+    with _job_stats_lock:
+        _job_stats['completed' if status == JOB_DONE else 'failed'] += 1
+        _job_stats['queue_seconds_total'] += job.get('queue_seconds') or 0.0
+        render_seconds = job.get('render_seconds') or 0.0
+        if status == JOB_DONE:
+            _job_stats['render_seconds_total'] += render_seconds
+            _job_stats['render_seconds_max'] = max(_job_stats['render_seconds_max'], render_seconds)
+
+
+def _write_job(job_dir: Path, job: Dict[str, Any]) -> None:
+    """Atomically replace job.json so pollers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(job_dir), prefix='job.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, job_dir / 'job.json')
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_job(job_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(job_dir / 'job.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def render_job(job_dir: str, kind: str, kwargs: Dict[str, Any],
+               cache=None, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """Render one job in a pool process and record the outcome in job.json.
+
+    With a cache and cache_key the finished PDF is also stored in the report
+    cache so the next identical request skips the render.
+    """
+    from . import pdf
+
+    job_path = Path(job_dir)
+    job = _read_job(job_path) or {}
+    job['status'] = JOB_RUNNING
+    job['started_at'] = time.time()
+    job['queue_seconds'] = job['started_at'] - job.get('created_at', job['started_at'])
+    _write_job(job_path, job)
+
+    start = time.perf_counter()
+    try:
+        buffer = io.BytesIO()
+        filename = getattr(pdf, JOB_RENDERERS[kind])(target=buffer, **kwargs)
+        data = buffer.getvalue()
+        with open(job_path / filename, 'wb') as f:
+            f.write(data)
+        job['status'] = JOB_DONE
+        job['filename'] = filename
+        if cache is not None and cache_key:
+            try:
+                cache.put_bytes(cache_key, data, filename)
+            except OSError as e:
+                logger.warning("Could not cache PDF job %s: %s", job.get('id'), e)
+    except Exception as e:
+        logger.exception("PDF job %s failed", job.get('id'))
+        job['status'] = JOB_FAILED
+        job['error'] = str(e)
+    job['render_seconds'] = time.perf_counter() - start
+    job['finished_at'] = time.time()
+    _write_job(job_path, job)
+    return job
+
+
+class PDFJobQueue:
+    """Bounded queue of PDF renders backed by a local process pool"""
+
+    def __init__(self, jobs_dir: str, workers: int = DEFAULT_WORKERS,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 max_jobs_per_user: int = DEFAULT_MAX_JOBS_PER_USER):
+        self.jobs_dir = Path(jobs_dir)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_jobs_per_user = max_jobs_per_user
+        self._executor = None
+        self._executor_pid = None
+        self._pending = 0
+        self._last_cleanup: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Pools don't survive a fork, so each gunicorn worker starts its own
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _user_dir(self, user_id: str) -> Path:
+        # User ids are hashed so they can't name paths outside jobs_dir
+        return self.jobs_dir / hashlib.sha256(str(user_id).encode('utf-8')).hexdigest()[:32]
+
+    def _user_lock(self, user_id: str):
+        return file_lock(self._user_dir(user_id) / 'jobs')
+
+    def _job_dir(self, job_id: str, user_id: str) -> Path:
+        if not _JOB_ID.match(job_id or ''):
+            raise ValueError(f"Invalid job id: {job_id!r}")
+        return self._user_dir(user_id) / job_id
+
+    def _iter_jobs(self, user_id: Optional[str] = None):
+        """Yield (job dir, job) for one user's jobs, or every user's"""
+        try:
+            user_dirs = [self._user_dir(user_id)] if user_id is not None else list(self.jobs_dir.iterdir())
+        except FileNotFoundError:
+            return
+        for user_dir in user_dirs:
+            try:
+                job_dirs = [d for d in user_dir.iterdir() if d.is_dir()]
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for job_dir in job_dirs:
+                job = _read_job(job_dir)
+                if job is not None:
+                    yield job_dir, self._check_expired(job)
+
+    def _check_expired(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        if job.get('status') in (JOB_QUEUED, JOB_RUNNING) and \
+                time.time() - job.get('created_at', 0) > JOB_TIMEOUT_SECONDS:
+            job = dict(job, status=JOB_FAILED, error='Job timed out')
+        return job
+
+    def cleanup(self) -> int:
+        """Delete jobs that finished more than JOB_RETENTION_SECONDS ago"""
+        removed = 0
+        now = time.time()
+        for job_dir, job in self._iter_jobs():
+            finished_at = job.get('finished_at') or job.get('created_at', 0) + JOB_TIMEOUT_SECONDS
+            if job['status'] in (JOB_DONE, JOB_FAILED) and now - finished_at > JOB_RETENTION_SECONDS:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _cleanup_if_due(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._last_cleanup is not None and now - self._last_cleanup < CLEANUP_INTERVAL_SECONDS:
+                return
+            self._last_cleanup = now
+        try:
+            self.cleanup()
+        except OSError as e:
+            logger.warning("PDF job cleanup failed: %s", e)
+
+    def active_jobs_for_user(self, user_id: str) -> int:
+        return sum(1 for _, job in self._iter_jobs(user_id)
+                   if job.get('user_id') == user_id and job['status'] in (JOB_QUEUED, JOB_RUNNING))
+
+    def submit(self, user_id: str, kind: str, kwargs: Dict[str, Any],
+               cache=None, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a render and return its job record; raises JobRejected if over a limit"""
+        if kind not in JOB_RENDERERS:
+            raise ValueError(f"Unknown PDF job kind: {kind}")
+        self._cleanup_if_due()
+
+        job_id = uuid.uuid4().hex
+        job_dir = self._job_dir(job_id, user_id)
+        job = {'id': job_id, 'user_id': user_id, 'kind': kind, 'status': JOB_QUEUED, 'created_at': time.time()}
+        # The queued job.json is written before the lock is released, so the
+        # next submit for this user (in any worker) counts it
+        with self._user_lock(user_id):
+            if self.active_jobs_for_user(user_id) >= self.max_jobs_per_user:
+                with _job_stats_lock:
+                    _job_stats['rejected_user_limit'] += 1
+                raise JobRejected('You already have reports being generated. Please wait for them to finish.', 429)
+
+            with self._lock:
+                if self._pending >= self.max_pending:
+                    with _job_stats_lock:
+                        _job_stats['rejected_queue_full'] += 1
+                    raise JobRejected('The report generator is busy. Please try again in a moment.', 503)
+                self._pending += 1
+
+            try:
+                job_dir.mkdir(parents=True)
+                _write_job(job_dir, job)
+            except BaseException:
+                self._abandon(job_dir)
+                raise
+        try:
+            future = self._get_executor().submit(render_job, str(job_dir), kind, kwargs, cache, cache_key)
+        except BaseException:
+            self._abandon(job_dir)
+            raise
+        with _job_stats_lock:
+            _job_stats['submitted'] += 1
+        future.add_done_callback(lambda f: self._job_finished(job_dir, f))
+        return job
+
+    def _abandon(self, job_dir: Path) -> None:
+        """Undo a submit that failed after reserving a pending slot"""
+        with self._lock:
+            self._pending -= 1
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    def _job_finished(self, job_dir: Path, future) -> None:
+        with self._lock:
+            self._pending -= 1
+        try:
+            job = future.result()
+        except Exception as e:
+            # The render process died (e.g. killed for memory) before recording a result
+            logger.error("PDF job in %s crashed: %s", job_dir, e)
+            job = _read_job(job_dir) or {}
+            job.update(status=JOB_FAILED, error='Report generation crashed', finished_at=time.time())
+            try:
+                _write_job(job_dir, job)
+            except OSError:
+                pass
+        _record_job(job.get('status'), job)
+
+    def get_job(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job if it exists and belongs to user_id"""
+        try:
+            job = _read_job(self._job_dir(job_id, user_id))
+        except ValueError:
+            return None
+        if job is None or job.get('user_id') != user_id:
+            return None
+        return self._check_expired(job)
+
+    def get_result_path(self, job: Dict[str, Any]) -> Optional[Path]:
+        if job.get('status') != JOB_DONE or not job.get('filename'):
+            return None
+        path = self._job_dir(job['id'], job['user_id']) / os.path.basename(job['filename'])
+        return path if path.exists() else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Job counts by status across all workers, plus this worker's metrics"""
+        counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        for _, job in self._iter_jobs():
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'jobs': counts, 'pending_in_this_worker': self._pending, 'metrics': get_job_stats()}
+
+
+_queue: Optional[PDFJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_pdf_job_queue(output_dir: str) -> PDFJobQueue:
+    """Return the process-wide job queue, configured from the environment"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = PDFJobQueue(
+                    os.path.join(output_dir, 'pdf_jobs'),
+                    workers=int(os.environ.get('PDF_JOB_WORKERS', DEFAULT_WORKERS)),
+                    max_pending=int(os.environ.get('PDF_JOB_MAX_PENDING', DEFAULT_MAX_PENDING)),
+                    max_jobs_per_user=int(os.environ.get('PDF_JOBS_PER_USER', DEFAULT_MAX_JOBS_PER_USER)),
+                )
+    return _queue
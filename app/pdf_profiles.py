@@ -0,0 +1,41 @@
+"""
+Output profiles for FutureElite PDF reports
+
+The default profile is sized for printing. The optimized profile is for
+reports that are emailed or opened on phones: it always compresses page
+streams and embeds the player photo from the 150 dpi 'screen' variant
+instead of the 300 dpi 'print' one, which is most of a report's size.
+
+Reports only use the standard PDF fonts (Helvetica), which are referenced
+by name rather than embedded, so there is no font data to subset. ReportLab
+already stores an image drawn several times in one document once (image
+XObjects are keyed by a digest of their file name or pixel data), so a
+repeated photo costs nothing extra in either profile.
+"""
+
+from typing import NamedTuple, Optional
+
+DEFAULT_PDF_PROFILE = 'default'
+
+
+class PDFProfile(NamedTuple):
+    """How a report is written out"""
+    name: str
+    # None keeps ReportLab's rl_config.pageCompression
+    page_compression: Optional[int]
+    # Variant from photos.PHOTO_VARIANTS embedded for the player photo
+    photo_variant: str
+
+
+PDF_PROFILES = {
+    'default': PDFProfile('default', None, 'print'),
+    'optimized': PDFProfile('optimized', 1, 'screen'),
+}
+
+
+def get_pdf_profile(name: Optional[str] = None) -> PDFProfile:
+    """Look up a profile by name; None means the default profile"""
+    try:
+        return PDF_PROFILES[name or DEFAULT_PDF_PROFILE]
+    except KeyError:
+        raise ValueError(f"Unknown PDF profile '{name}', expected one of: {', '.join(PDF_PROFILES)}")
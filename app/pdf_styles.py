@@ -0,0 +1,67 @@
+"""
+Shared ReportLab styles for FutureElite PDF reports
+
+Building a stylesheet (getSampleStyleSheet plus every custom ParagraphStyle)
+is most of the cost of constructing a report generator, and the result only
+depends on the generator's style builder and its two theme colours. The
+registry builds each stylesheet once per process and hands the same
+read-only instance to every generator that asks for it.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
+
+
+class SharedStyleSheet(StyleSheet1):
+    """StyleSheet1 that rejects new styles once it is shared between generators"""
+
+    def __init__(self):
+        super().__init__()
+        self._frozen = False
+
+    def add(self, style, alias=None):
+        if self._frozen:
+            raise TypeError("Shared report stylesheets are read-only; derive a ParagraphStyle from them instead")
+        super().add(style, alias)
+
+    def freeze(self) -> 'SharedStyleSheet':
+        self._frozen = True
+        return self
+
+
+@lru_cache(maxsize=64)
+def report_color(value: str) -> colors.Color:
+    """Parse a hex colour once per process"""
+    return colors.HexColor(value)
+
+
+_registry: Dict[Tuple[str, str, str, str], SharedStyleSheet] = {}
+_registry_lock = threading.Lock()
+
+
+def get_report_styles(primary_color: str, header_color: str,
+                      build: Callable[[StyleSheet1, colors.Color, colors.Color], None]) -> SharedStyleSheet:
+    """Return the stylesheet built by build for a theme, building it on first use.
+
+    build(styles, primary_color, header_color) adds a report family's custom
+    styles to a fresh copy of the ReportLab sample stylesheet. Sheets are
+    keyed by the builder, so generators that override it get their own.
+    """
+    key = (build.__module__, build.__qualname__, primary_color.upper(), header_color.upper())
+    styles = _registry.get(key)
+    if styles is not None:
+        return styles
+    with _registry_lock:
+        styles = _registry.get(key)
+        if styles is None:
+            styles = SharedStyleSheet()
+            sample = getSampleStyleSheet()
+            styles.byName.update(sample.byName)
+            styles.byAlias.update(sample.byAlias)
+            build(styles, report_color(primary_color), report_color(header_color))
+            _registry[key] = styles.freeze()
+    return styles
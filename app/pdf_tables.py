@@ -0,0 +1,54 @@
+"""
+Chunked tables for long PDF match logs
+
+A single Table holding every match has to be split again at every page
+break, re-measuring everything left over, so multi-season histories render
+in roughly quadratic time and hold every cell flowable at once.
+chunked_table() emits a sequence of LongTables of a fixed number of rows,
+each with the header repeated, so splitting work is bounded per chunk and
+total render time grows linearly with the number of matches.
+
+lean_cell() keeps rows cheap: text that fits its column on one line stays a
+plain string drawn straight from the table style, and only text that needs
+wrapping becomes a Paragraph.
+"""
+
+from typing import List, Sequence, Any
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import LongTable, Paragraph, TableStyle
+
+# Data rows per LongTable; even, so ROWBACKGROUNDS banding continues across chunks
+MATCH_TABLE_CHUNK_ROWS = 100
+
+
+def lean_cell(text: Any, style: ParagraphStyle, width: float, padding: float = 12) -> Any:
+    """Return text as a plain string if it fits width on one line, else as a wrapping Paragraph.
+
+    Plain strings are drawn with the table's FONTNAME/FONTSIZE/ALIGN
+    commands, which must match style for the two forms to look the same.
+    """
+    text = '' if text is None else str(text)
+    if '<' not in text and '&' not in text and '\n' not in text and \
+            stringWidth(text, style.fontName, style.fontSize) <= width - padding:
+        return text
+    return Paragraph(text, style)
+
+
+def chunked_table(header: Sequence[Any], rows: Sequence[Sequence[Any]], col_widths: List[float],
+                  style: TableStyle, chunk_rows: int = MATCH_TABLE_CHUNK_ROWS) -> List[LongTable]:
+    """Split rows into LongTables of at most chunk_rows data rows, each starting with header.
+
+    style is applied to every chunk, so its commands should address rows
+    relative to the chunk (row 0 is the header, -1 the last row).
+    """
+    if chunk_rows < 2 or chunk_rows % 2:
+        raise ValueError("chunk_rows must be an even number of at least 2")
+    tables = []
+    for start in range(0, max(len(rows), 1), chunk_rows):
+        table = LongTable([list(header)] + [list(r) for r in rows[start:start + chunk_rows]],
+                          colWidths=col_widths, repeatRows=1)
+        table.setStyle(style)
+        tables.append(table)
+    return tables
@@ -0,0 +1,144 @@
+"""
+Player photo variants for FutureElite
+
+Uploads are kept as-is, and next to each original the pipeline writes
+normalized JPEG variants: a small thumbnail for the web pages and copies
+sized for the PDF photo box (2.5 x 3 inches) at 300 dpi for print and
+150 dpi for the optimized on-screen profile. PDFs embed one of these, which
+ReportLab copies into the document as a JPEG stream without decoding or
+scaling the multi-megabyte original.
+
+Variants are derived files: <stem>_<variant>.jpg beside the original. They
+are created on upload and, for photos uploaded before the pipeline existed,
+on first use.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+# Browser cache lifetime for served photos (one year)
+PHOTO_CACHE_MAX_AGE = 365 * 24 * 3600
+
+# Variant name -> (max width, max height, JPEG quality)
+PHOTO_VARIANTS = {
+    'thumb': (256, 256, 82),
+    'print': (750, 900, 85),
+    'screen': (375, 450, 80),
+}
+
+
+def resolve_photo_path(photo_path: Optional[str]) -> Optional[str]:
+    """Resolve a stored photo path (relative to the working or project directory) to an existing file"""
+    if not photo_path:
+        return None
+    if os.path.exists(photo_path):
+        return photo_path
+    if not os.path.isabs(photo_path):
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        candidate = os.path.join(app_dir, photo_path)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def variant_path(photo_path: str, variant: str) -> str:
+    path = Path(photo_path)
+    return str(path.with_name(f"{path.stem}_{variant}.jpg"))
+
+
+def _is_current(photo_path: str, variant_file: str) -> bool:
+    try:
+        return os.stat(variant_file).st_mtime_ns >= os.stat(photo_path).st_mtime_ns
+    except OSError:
+        return False
+
+
+def create_photo_variants(photo_path: str) -> Dict[str, str]:
+    """Write every variant of photo_path and return {variant: path}.
+
+    Returns an empty dict if Pillow is not installed; callers then fall back
+    to the original file.
+    """
+    if not PIL_AVAILABLE:
+        return {}
+    with Image.open(photo_path) as original:
+        # Apply camera orientation and flatten transparency onto white for JPEG
+        img = ImageOps.exif_transpose(original)
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel('A'))
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        variants = {}
+        directory = os.path.dirname(os.path.abspath(photo_path))
+        for variant, (max_width, max_height, quality) in PHOTO_VARIANTS.items():
+            sized = img.copy()
+            sized.thumbnail((max_width, max_height), Image.LANCZOS)
+            target = variant_path(photo_path, variant)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    # Baseline (not progressive) JPEG so ReportLab can embed it directly
+                    sized.save(f, 'JPEG', quality=quality, optimize=True)
+                os.replace(tmp_path, target)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            variants[variant] = target
+        return variants
+
+
+def get_photo_variant(photo_path: Optional[str], variant: str) -> Optional[str]:
+    """Path of the requested variant of a stored photo, creating it if missing or stale.
+
+    Falls back to the original file if the variant cannot be made, and
+    returns None if the photo does not exist.
+    """
+    original = resolve_photo_path(photo_path)
+    if original is None:
+        return None
+    target = variant_path(original, variant)
+    if _is_current(original, target):
+        return target
+    try:
+        created = create_photo_variants(original)
+    except Exception as e:
+        logger.warning("Could not create photo variants for %s: %s", original, e)
+        return original
+    return created.get(variant, original)
+
+
+
+@lru_cache(maxsize=512)
+def _content_etag(path: str, inode: int, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def photo_etag(path: str) -> str:
+    """Strong ETag from the file's content, hashed once per version of the file"""
+    st = os.stat(path)
+    return _content_etag(os.path.abspath(path), st.st_ino, st.st_mtime_ns, st.st_size)
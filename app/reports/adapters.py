@@ -272,6 +272,7 @@ def build_player_from_data(
     if settings.position:
         # Could parse from notes or other fields if secondary positions are stored
         # For now, leave as None unless we have a specific field
+        pass
     
     return Player(
         fullName=settings.player_name,
@@ -3,10 +3,10 @@ Base PDF generator class with common functionality for all reports.
 """
 
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch, mm
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from typing import List, Optional
@@ -14,56 +14,63 @@ from datetime import datetime
 
 from .types import Player
 from .formatters import get_report_generation_date
+from ..pdf_styles import get_report_styles, report_color
+from ..pdf_tables import chunked_table
+from ..pdf_profiles import get_pdf_profile
 
 
 class BasePDFGenerator:
     """Base class for PDF report generators"""
     
-    def __init__(self, player: Player, primary_color: str = "#B22222", header_color: str = "#1F2937"):
+    def __init__(self, player: Player, primary_color: str = "#B22222", header_color: str = "#1F2937",
+                 profile: Optional[str] = None):
         self.player = player
-        self.primary_color = colors.HexColor(primary_color)
-        self.header_color = colors.HexColor(header_color)
-        self.light_grey = colors.HexColor("#F3F4F6")
-        self.dark_grey = colors.HexColor("#6B7280")
+        self.profile = get_pdf_profile(profile)
+        self.primary_color = report_color(primary_color)
+        self.header_color = report_color(header_color)
+        self.light_grey = report_color("#F3F4F6")
+        self.dark_grey = report_color("#6B7280")
         
         # Page setup
         self.page_width, self.page_height = A4
         self.margin = 36  # 0.5 inch
         self.content_width = self.page_width - (2 * self.margin)
         
-        # Create styles
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        # Shared per-theme stylesheet, built once per process
+        self.styles = get_report_styles(primary_color, header_color,
+                                        self._create_custom_styles)
     
-    def _create_custom_styles(self):
-        """Create custom paragraph styles"""
+    @staticmethod
+    def _create_custom_styles(styles: StyleSheet1, primary_color: colors.Color, header_color: colors.Color):
+        """Add custom paragraph styles to a stylesheet for get_report_styles"""
+        dark_grey = report_color("#6B7280")
         # Title style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            parent=self.styles['Title'],
+            parent=styles['Title'],
             fontSize=18,
             spaceAfter=20,
             alignment=TA_CENTER,
-            textColor=self.primary_color,
+            textColor=primary_color,
             fontName='Helvetica-Bold'
         ))
         
         # Section header style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=12,
             spaceAfter=12,
             spaceBefore=16,
             alignment=TA_LEFT,
-            textColor=self.header_color,
+            textColor=header_color,
             fontName='Helvetica-Bold'
         ))
         
         # Table header style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableHeader',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9,
             alignment=TA_CENTER,
             textColor=colors.white,
@@ -71,9 +78,9 @@ class BasePDFGenerator:
         ))
         
         # Table cell style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableCell',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9,
             alignment=TA_LEFT,
             fontName='Helvetica',
@@ -81,9 +88,9 @@ class BasePDFGenerator:
         ))
         
         # Table cell center style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='TableCellCenter',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9,
             alignment=TA_CENTER,
             fontName='Helvetica',
@@ -91,12 +98,12 @@ class BasePDFGenerator:
         ))
         
         # Footer style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='Footer',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=8,
             alignment=TA_RIGHT,
-            textColor=self.dark_grey,
+            textColor=dark_grey,
             fontName='Helvetica'
         ))
     
@@ -149,4 +156,34 @@ class BasePDFGenerator:
         
         table.setStyle(style)
         return table
+    
+    def _create_chunked_table(self, data: List[List], col_widths: Optional[List[float]] = None) -> List[LongTable]:
+        """Create a styled table as fixed-size LongTable chunks for long row counts.
+
+        Same look as _create_table, with the header repeated on each chunk and page.
+        """
+        style = TableStyle([
+            # Header row
+            ('BACKGROUND', (0, 0), (-1, 0), self.header_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            
+            # Data rows, alternate row colors
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.light_grey]),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 1), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+        ])
+        return chunked_table(data[0], data[1:], col_widths, style)
 
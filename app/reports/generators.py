@@ -2,8 +2,11 @@
 Main entry point for generating all three report types.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from .types import Player
 from .adapters import build_player_from_data
@@ -23,6 +26,22 @@ from ..models import (
 )
 
 
+# Report key -> renderer, in the order reports are generated
+REPORT_GENERATORS = {
+    'season_tracker': generate_season_tracker,
+    'scout_report': generate_scout_report,
+    'player_resume': generate_player_resume,
+}
+
+
+def _render_report(report: str, player: Player, output_dir: str,
+                   profile: Optional[str] = None) -> Tuple[str, float]:
+    """Render one report and time it; module-level so pool processes can run it"""
+    start = time.perf_counter()
+    path = REPORT_GENERATORS[report](player, output_dir, profile)
+    return path, time.perf_counter() - start
+
+
 def generate_all_reports(
     settings: AppSettings,
     matches: List[AppMatch],
@@ -32,11 +51,18 @@ def generate_all_reports(
     training_camps: Optional[List[TrainingCamp]] = None,
     physical_metrics: Optional[List[PhysicalMetrics]] = None,
     references: Optional[List[Reference]] = None,
-    output_dir: str = "output"
+    output_dir: str = "output",
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    profile: Optional[str] = None
 ) -> dict:
     """
     Generate all three PDF reports from app data models.
     
+    With parallel=True the Player is built once, pickled to a process pool
+    and the three reports render concurrently, so the whole call takes about
+    as long as the slowest report instead of the sum of all three.
+    
     Args:
         settings: AppSettings object
         matches: List of Match objects
@@ -47,13 +73,17 @@ def generate_all_reports(
         physical_metrics: List of PhysicalMetrics objects
         references: List of Reference objects
         output_dir: Output directory for PDFs
+        parallel: Render the reports concurrently in a process pool
+        max_workers: Pool size for parallel mode (defaults to one process per report)
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
         
     Returns:
-        Dictionary with paths to generated PDFs:
+        Dictionary with paths to generated PDFs and render time per report:
         {
             'season_tracker': path,
             'scout_report': path,
-            'player_resume': path
+            'player_resume': path,
+            'timings': {'season_tracker': seconds, ...}
         }
     """
     # Build Player object from app data
@@ -69,15 +99,22 @@ def generate_all_reports(
     )
     
     # Generate all three reports
-    season_tracker_path = generate_season_tracker(player, output_dir)
-    scout_report_path = generate_scout_report(player, output_dir)
-    player_resume_path = generate_player_resume(player, output_dir)
+    if parallel:
+        with ProcessPoolExecutor(
+            max_workers=max_workers or len(REPORT_GENERATORS),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            futures = {
+                report: executor.submit(_render_report, report, player, output_dir, profile)
+                for report in REPORT_GENERATORS
+            }
+            rendered = {report: future.result() for report, future in futures.items()}
+    else:
+        rendered = {report: _render_report(report, player, output_dir, profile) for report in REPORT_GENERATORS}
     
-    return {
-        'season_tracker': season_tracker_path,
-        'scout_report': scout_report_path,
-        'player_resume': player_resume_path
-    }
+    results = {report: path for report, (path, _) in rendered.items()}
+    results['timings'] = {report: seconds for report, (_, seconds) in rendered.items()}
+    return results
 
 
 def generate_season_tracker_from_data(
@@ -89,7 +126,8 @@ def generate_season_tracker_from_data(
     training_camps: Optional[List[TrainingCamp]] = None,
     physical_metrics: Optional[List[PhysicalMetrics]] = None,
     references: Optional[List[Reference]] = None,
-    output_dir: str = "output"
+    output_dir: str = "output",
+    profile: Optional[str] = None
 ) -> str:
     """Generate Season Tracker report from app data models"""
     player = build_player_from_data(
@@ -102,7 +140,7 @@ def generate_season_tracker_from_data(
         physical_metrics=physical_metrics,
         references=references
     )
-    return generate_season_tracker(player, output_dir)
+    return generate_season_tracker(player, output_dir, profile)
 
 
 def generate_scout_report_from_data(
@@ -114,7 +152,8 @@ def generate_scout_report_from_data(
     training_camps: Optional[List[TrainingCamp]] = None,
     physical_metrics: Optional[List[PhysicalMetrics]] = None,
     references: Optional[List[Reference]] = None,
-    output_dir: str = "output"
+    output_dir: str = "output",
+    profile: Optional[str] = None
 ) -> str:
     """Generate Scout Report from app data models"""
     player = build_player_from_data(
@@ -127,7 +166,7 @@ def generate_scout_report_from_data(
         physical_metrics=physical_metrics,
         references=references
     )
-    return generate_scout_report(player, output_dir)
+    return generate_scout_report(player, output_dir, profile)
 
 
 def generate_player_resume_from_data(
@@ -139,7 +178,8 @@ def generate_player_resume_from_data(
     training_camps: Optional[List[TrainingCamp]] = None,
     physical_metrics: Optional[List[PhysicalMetrics]] = None,
     references: Optional[List[Reference]] = None,
-    output_dir: str = "output"
+    output_dir: str = "output",
+    profile: Optional[str] = None
 ) -> str:
     """Generate Player Resume from app data models"""
     player = build_player_from_data(
@@ -152,5 +192,5 @@ def generate_player_resume_from_data(
         physical_metrics=physical_metrics,
         references=references
     )
-    return generate_player_resume(player, output_dir)
+    return generate_player_resume(player, output_dir, profile)
 
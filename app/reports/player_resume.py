@@ -7,9 +7,10 @@ Comprehensive career document, multi-page allowed.
 import os
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_LEFT
 from reportlab.pdfgen import canvas
-from typing import List
+from typing import List, Optional
 
 from .base_generator import BasePDFGenerator
 from .types import Player
@@ -47,7 +48,8 @@ class PlayerResumeGenerator(BasePDFGenerator):
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            pageCompression=self.profile.page_compression
         )
         
         story = []
@@ -400,13 +402,14 @@ class PlayerResumeGenerator(BasePDFGenerator):
         return elements
 
 
-def generate_player_resume(player: Player, output_dir: str = "output") -> str:
+def generate_player_resume(player: Player, output_dir: str = "output", profile: Optional[str] = None) -> str:
     """
     Generate Player Resume PDF report.
     
     Args:
         player: Player object with match data
         output_dir: Output directory for PDF
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
         
     Returns:
         Path to generated PDF file
@@ -423,6 +426,6 @@ def generate_player_resume(player: Player, output_dir: str = "output") -> str:
     output_path = os.path.join(output_dir, filename)
     
     # Generate PDF
-    generator = PlayerResumeGenerator(player)
+    generator = PlayerResumeGenerator(player, profile=profile)
     return generator.generate(output_path)
 
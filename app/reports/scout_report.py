@@ -9,7 +9,7 @@ from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
-from typing import List
+from typing import List, Optional
 
 from .base_generator import BasePDFGenerator
 from .types import Player
@@ -46,7 +46,8 @@ class ScoutReportGenerator(BasePDFGenerator):
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            pageCompression=self.profile.page_compression
         )
         
         story = []
@@ -217,13 +218,14 @@ class ScoutReportGenerator(BasePDFGenerator):
         return elements
 
 
-def generate_scout_report(player: Player, output_dir: str = "output") -> str:
+def generate_scout_report(player: Player, output_dir: str = "output", profile: Optional[str] = None) -> str:
     """
     Generate Scout Report PDF (1-2 pages maximum).
     
     Args:
         player: Player object with match data
         output_dir: Output directory for PDF
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
         
     Returns:
         Path to generated PDF file
@@ -240,6 +242,6 @@ def generate_scout_report(player: Player, output_dir: str = "output") -> str:
     output_path = os.path.join(output_dir, filename)
     
     # Generate PDF
-    generator = ScoutReportGenerator(player)
+    generator = ScoutReportGenerator(player, profile=profile)
     return generator.generate(output_path)
 
@@ -7,9 +7,10 @@ Detailed match-by-match log for the current season.
 import os
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.pdfgen import canvas
-from typing import List
+from typing import List, Optional
 
 from .base_generator import BasePDFGenerator
 from .types import Player
@@ -42,7 +43,8 @@ class SeasonTrackerGenerator(BasePDFGenerator):
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            pageCompression=self.profile.page_compression
         )
         
         story = []
@@ -227,19 +229,20 @@ class SeasonTrackerGenerator(BasePDFGenerator):
             self.content_width * 0.25,  # Notes
         ]
         
-        table = self._create_table(table_data, col_widths=col_widths)
-        elements.append(table)
+        # Chunked so multi-season histories render in linear time
+        elements.extend(self._create_chunked_table(table_data, col_widths=col_widths))
         
         return elements
 
 
-def generate_season_tracker(player: Player, output_dir: str = "output") -> str:
+def generate_season_tracker(player: Player, output_dir: str = "output", profile: Optional[str] = None) -> str:
     """
     Generate Season Tracker PDF report.
     
     Args:
         player: Player object with match data
         output_dir: Output directory for PDF
+        profile: Output profile from pdf_profiles ('default' or 'optimized')
         
     Returns:
         Path to generated PDF file
@@ -256,6 +259,6 @@ def generate_season_tracker(player: Player, output_dir: str = "output") -> str:
     output_path = os.path.join(output_dir, filename)
     
     # Generate PDF
-    generator = SeasonTrackerGenerator(player)
+    generator = SeasonTrackerGenerator(player, profile=profile)
     return generator.generate(output_path)
 
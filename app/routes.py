@@ -1,7 +1,8 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, send_file, current_app
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, send_file, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 import re
 from datetime import datetime
+import io
 import os
 import zipfile
 import tempfile
@@ -31,9 +32,18 @@ except ImportError:
     EXCEL_SUPPORT = False
 
 from .models import Match, MatchCategory, MatchResult, AppSettings, PhysicalMeasurement, Achievement, ClubHistory, TrainingCamp, PhysicalMetrics, Reference, SubscriptionStatus, Subscription, User
-from .storage import StorageManager
+from .storage import get_storage_manager, UpsertResult
+from .entitlements import get_entitlements
+from .match_stats import STATS_PERIODS
 from .utils import validate_match_data, parse_input_date, format_date_for_input
-from .pdf import generate_season_pdf, generate_scout_pdf, generate_player_resume_pdf
+from . import pdf as pdf_module
+from .pdf_jobs import get_pdf_job_queue, JobRejected, JOB_RENDERERS
+from .pdf_cache import get_pdf_cache, report_cache_key
+from .pdf_profiles import PDF_PROFILES, DEFAULT_PDF_PROFILE
+from .excel_import import open_workbook, is_full_backup, parse_match_sheet, read_backup, ExcelImportError
+from .excel_export import write_export_workbook, EXPORT_FILENAME, EXPORT_MIMETYPE
+from .backup import iter_backup_archive, is_backup_archive, restore_backup_archive, backup_filename, BackupError
+from .photos import create_photo_variants, get_photo_variant, photo_etag, PHOTO_VARIANTS, PHOTO_CACHE_MAX_AGE
 from .phv_calculator import calculate_phv, validate_measurements_for_phv, calculate_predicted_adult_height, calculate_age_at_date
 from .elite_benchmarks import get_elite_benchmarks_for_age, compare_to_elite
 from .config import SUPPORT_EMAIL, SUBSCRIPTION_PRICING, CURRENT_YEAR
@@ -50,7 +60,7 @@ except ImportError:
 bp = Blueprint('main', __name__)
 
 # Initialize storage
-storage = StorageManager()
+storage = get_storage_manager()
 
 # Free tier limits
 FREE_TIER_LIMITS = {
@@ -92,10 +102,7 @@ def check_subscription_and_limit(user_id, resource_type, current_count=None):
     Check if user has active subscription and if they've reached free tier limits.
     Returns: (has_access, limit, current_count, error_message)
     """
-    subscription = storage.get_subscription_by_user_id(user_id)
-    has_active_subscription = subscription and subscription.status == SubscriptionStatus.ACTIVE
-    
-    if has_active_subscription:
+    if get_entitlements().get(user_id).is_active:
         return (True, None, current_count, None)  # No limits for paid users
     
     # Free user - check limits
@@ -382,60 +389,106 @@ def fixtures():
     return jsonify({'success': True, 'fixtures': [f.model_dump() for f in fixtures]})
 
 
+def _render_pdf(kind: str, output_dir: str, **kwargs):
+    """Serve a cached report, or queue a render and return 202 with the job
+    (rendering inline if jobs are disabled)"""
+    cache = get_pdf_cache(output_dir)
+    cache_key = report_cache_key(kind, kwargs) if cache.enabled else None
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        pdf_path, filename = cached
+        return send_file(
+            str(pdf_path),
+            as_attachment=True,
+            download_name=filename,
+            mimetype='application/pdf'
+        )
+
+    queue = get_pdf_job_queue(output_dir)
+    if not queue.enabled:
+        # Render into memory and send the bytes; nothing is written to output/
+        buffer = io.BytesIO()
+        filename = getattr(pdf_module, JOB_RENDERERS[kind])(target=buffer, **kwargs)
+        data = buffer.getvalue()
+        if cache_key:
+            cache.put_bytes(cache_key, data, filename)
+        response = current_app.response_class(data, mimetype='application/pdf')
+        response.headers.set('Content-Disposition', 'attachment', filename=filename)
+        return response
+
+    try:
+        job = queue.submit(current_user.id, kind, kwargs, cache=cache, cache_key=cache_key)
+    except JobRejected as e:
+        response = jsonify({'success': False, 'errors': [str(e)]})
+        response.status_code = e.status_code
+        if e.status_code == 503:
+            response.headers['Retry-After'] = '5'
+        return response
+
+    return jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': url_for('main.pdf_job_status', job_id=job['id']),
+        'download_url': url_for('main.pdf_job_download', job_id=job['id'])
+    }), 202
+
+
+@bp.route('/pdf-jobs/<job_id>')
+@login_required
+def pdf_job_status(job_id):
+    """Poll a queued PDF render"""
+    output_dir = os.path.join(current_app.root_path, '..', 'output')
+    job = get_pdf_job_queue(output_dir).get_job(job_id, current_user.id)
+    if job is None:
+        return jsonify({'success': False, 'errors': ['Job not found']}), 404
+    return jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'error': job.get('error'),
+        'queue_seconds': job.get('queue_seconds'),
+        'render_seconds': job.get('render_seconds'),
+        'download_url': url_for('main.pdf_job_download', job_id=job['id']) if job['status'] == 'done' else None
+    })
+
+
+@bp.route('/pdf-jobs/<job_id>/download')
+@login_required
+def pdf_job_download(job_id):
+    """Download the PDF produced by a finished job"""
+    output_dir = os.path.join(current_app.root_path, '..', 'output')
+    queue = get_pdf_job_queue(output_dir)
+    job = queue.get_job(job_id, current_user.id)
+    if job is None:
+        return jsonify({'success': False, 'errors': ['Job not found']}), 404
+    pdf_path = queue.get_result_path(job)
+    if pdf_path is None:
+        return jsonify({'success': False, 'status': job['status'], 'errors': [job.get('error') or 'Report is not ready yet']}), 409
+    return send_file(
+        str(pdf_path),
+        as_attachment=True,
+        download_name=pdf_path.name,
+        mimetype='application/pdf'
+    )
+
+
 @bp.route('/pdf', methods=['POST'])
 @login_required
 def generate_pdf():
     """Generate PDF report - accepts data from client"""
     try:
-        # Check subscription status - try multiple methods
-        subscription = storage.get_subscription_by_user_id(current_user.id)
+        # Check subscription status (includes the single-orphan fallback)
+        entitlement = get_entitlements().get(current_user.id, claim_orphan=True)
         
-        # If no subscription found by user_id, check if there's exactly one active subscription
-        # This handles cases where user_id format changed (e.g., client-side ID vs server-side ID)
-        if not subscription:
-            subscriptions = storage.load_subscriptions()
-            active_subs = [s for s in subscriptions if s.get('status', '').lower() == 'active']
-            
-            # If there's exactly one active subscription, it's likely for the current user
-            # Update it to use the correct user_id
-            if len(active_subs) == 1:
-                sub_data = active_subs[0]
-                try:
-                    # Create subscription object and update user_id
-                    if 'status' in sub_data and isinstance(sub_data['status'], str):
-                        sub_data['status'] = SubscriptionStatus(sub_data['status'].lower())
-                    subscription = Subscription(**sub_data)
-                    subscription.user_id = current_user.id
-                    storage.save_subscription(subscription)
-                    current_app.logger.info(f"Updated subscription user_id from {sub_data.get('user_id')} to {current_user.id}")
-                except Exception as e:
-                    current_app.logger.error(f"Error updating subscription: {e}")
-                    subscription = None
-        
-        # Debug logging
-        current_app.logger.info(f"PDF generation request for user {current_user.id}")
-        current_app.logger.info(f"Subscription found: {subscription is not None}")
-        if subscription:
-            current_app.logger.info(f"Subscription status: {subscription.status}, type: {type(subscription.status)}")
-            current_app.logger.info(f"Subscription status == ACTIVE: {subscription.status == SubscriptionStatus.ACTIVE}")
-            current_app.logger.info(f"Subscription status value: {subscription.status.value if hasattr(subscription.status, 'value') else subscription.status}")
-        
-        # Check if subscription is active - simplified check
-        is_active = False
-        if subscription:
-            # Get status value (works for both enum and string)
-            status_value = subscription.status.value if hasattr(subscription.status, 'value') else str(subscription.status)
-            is_active = status_value.lower() == SubscriptionStatus.ACTIVE.value.lower()
-            current_app.logger.info(f"Status value: {status_value}, ACTIVE value: {SubscriptionStatus.ACTIVE.value}, is_active: {is_active}")
-        
-        if not subscription or not is_active:
-            current_app.logger.warning(f"PDF generation blocked for user {current_user.id}: subscription={subscription is not None}, is_active={is_active}")
+        if not entitlement.is_active:
+            current_app.logger.warning(f"PDF generation blocked for user {current_user.id}: subscription={entitlement.has_subscription}, is_active=False")
             return jsonify({
                 'success': False,
                 'errors': ['PDF generation is a premium feature. Please subscribe to unlock this feature.'],
                 'debug': {
-                    'has_subscription': subscription is not None,
-                    'status': subscription.status if subscription else None,
+                    'has_subscription': entitlement.has_subscription,
+                    'status': entitlement.status if entitlement.has_subscription else None,
                     'user_id': current_user.id
                 }
             }), 403
@@ -455,6 +508,11 @@ def generate_pdf():
         if period not in valid_periods:
             period = 'all_time'
         
+        # Output profile: 'optimized' makes smaller files for email and mobile
+        profile = data.get('profile', DEFAULT_PDF_PROFILE)
+        if profile not in PDF_PROFILES:
+            profile = DEFAULT_PDF_PROFILE
+        
         # Load settings from server (most up-to-date, includes player profile data)
         # Merge with client settings to ensure we have all data
         try:
@@ -739,15 +797,9 @@ def generate_pdf():
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate PDF with period filter
-        pdf_path = generate_season_pdf(matches, settings, output_dir, physical_measurements, physical_metrics, period=period)
-        
-        # Return the PDF file directly
-        return send_file(
-            pdf_path,
-            as_attachment=True,
-            download_name=os.path.basename(pdf_path),
-            mimetype='application/pdf'
-        )
+        return _render_pdf('season', output_dir, matches=matches, settings=settings,
+                           physical_measurements=physical_measurements,
+                           physical_metrics=physical_metrics, period=period, profile=profile)
         
     except Exception as e:
         import traceback
@@ -761,183 +813,60 @@ def generate_pdf():
 @login_required
 def export_data():
     """Export all data as Excel file"""
+    if not EXCEL_SUPPORT:
+        return jsonify({'success': False, 'errors': ['Excel support not available. Please install openpyxl: pip install openpyxl']}), 400
+    
     temp_file = None
     try:
         user_id = current_user.id
-        # Get all data for this user
-        data = storage.export_data(user_id)
-        
-        # Create temporary Excel file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
         
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill
+        # Write rows straight from the storage generators into a write-only workbook.
+        # The anonymous temp file is removed when send_file closes it after streaming.
+        temp_file = tempfile.TemporaryFile(suffix='.xlsx')
+        write_export_workbook(storage.iter_export_data(user_id), temp_file)
+        temp_file.seek(0)
         
-        wb = Workbook()
-        wb.remove(wb.active)  # Remove default sheet
-        
-        # Helper function to add a sheet with data
-        def add_sheet(sheet_name, data_list, headers):
-            if not data_list:
-                return
-            ws = wb.create_sheet(title=sheet_name)
-            
-            # Add headers with styling
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for col_idx, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col_idx, value=header)
-                cell.fill = header_fill
-                cell.font = header_font
-            
-            # Add data rows
-            for row_idx, item in enumerate(data_list, 2):
-                if isinstance(item, dict):
-                    for col_idx, header in enumerate(headers, 1):
-                        value = item.get(header, '')
-                        # Convert None to empty string
-                        if value is None:
-                            value = ''
-                        ws.cell(row=row_idx, column=col_idx, value=value)
-        
-        # Add Matches sheet
-        if data.get('matches'):
-            matches_headers = ['id', 'date', 'opponent', 'venue', 'result', 'goals', 'assists', 
-                             'minutes_played', 'category', 'season', 'notes', 'clean_sheets']
-            matches_data = []
-            for match in data['matches']:
-                if isinstance(match, dict):
-                    matches_data.append(match)
-                else:
-                    matches_data.append(match.model_dump() if hasattr(match, 'model_dump') else match.dict())
-            add_sheet('Matches', matches_data, matches_headers)
-        
-        # Add Settings sheet
-        if data.get('settings'):
-            settings_dict = data['settings']
-            if hasattr(settings_dict, 'model_dump'):
-                settings_dict = settings_dict.model_dump()
-            elif hasattr(settings_dict, 'dict'):
-                settings_dict = settings_dict.dict()
-            
-            ws = wb.create_sheet(title='Settings')
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            ws.cell(row=1, column=1, value='Setting').fill = header_fill
-            ws.cell(row=1, column=1).font = header_font
-            ws.cell(row=1, column=2, value='Value').fill = header_fill
-            ws.cell(row=1, column=2).font = header_font
-            
-            row = 2
-            for key, value in settings_dict.items():
-                if value is not None:
-                    ws.cell(row=row, column=1, value=str(key))
-                    # Handle list values
-                    if isinstance(value, list):
-                        ws.cell(row=row, column=2, value=', '.join(str(v) for v in value))
-                    else:
-                        ws.cell(row=row, column=2, value=str(value))
-                    row += 1
-        
-        # Add Physical Measurements sheet
-        if data.get('physical_measurements'):
-            measurements_headers = ['id', 'date', 'height_cm', 'weight_kg', 'notes', 'include_in_report']
-            measurements_data = []
-            for m in data['physical_measurements']:
-                if isinstance(m, dict):
-                    measurements_data.append(m)
-                else:
-                    measurements_data.append(m.model_dump() if hasattr(m, 'model_dump') else m.dict())
-            add_sheet('Physical Measurements', measurements_data, measurements_headers)
-        
-        # Add Physical Metrics sheet
-        if data.get('physical_metrics'):
-            metrics_headers = ['id', 'date', 'sprint_speed_ms', 'sprint_speed_kmh', 'sprint_10m_sec', 
-                             'sprint_20m_sec', 'sprint_30m_sec', 'vertical_jump_cm', 'standing_long_jump_cm',
-                             'countermovement_jump_cm', 'agility_time_sec', 'beep_test_level', 'vo2_max',
-                             'include_in_report']
-            metrics_data = []
-            for m in data['physical_metrics']:
-                if isinstance(m, dict):
-                    metrics_data.append(m)
-                else:
-                    metrics_data.append(m.model_dump() if hasattr(m, 'model_dump') else m.dict())
-            add_sheet('Physical Metrics', metrics_data, metrics_headers)
-        
-        # Add Achievements sheet
-        if data.get('achievements'):
-            achievements_headers = ['id', 'date', 'title', 'category', 'season', 'goals', 'assists', 
-                                   'minutes_played', 'clean_sheets', 'notes']
-            achievements_data = []
-            for a in data['achievements']:
-                if isinstance(a, dict):
-                    achievements_data.append(a)
-                else:
-                    achievements_data.append(a.model_dump() if hasattr(a, 'model_dump') else a.dict())
-            add_sheet('Achievements', achievements_data, achievements_headers)
-        
-        # Add Club History sheet
-        if data.get('club_history'):
-            club_headers = ['id', 'club_name', 'season', 'age_group', 'position', 'achievements']
-            club_data = []
-            for c in data['club_history']:
-                if isinstance(c, dict):
-                    club_data.append(c)
-                else:
-                    club_data.append(c.model_dump() if hasattr(c, 'model_dump') else c.dict())
-            add_sheet('Club History', club_data, club_headers)
-        
-        # Add Training Camps sheet
-        if data.get('training_camps'):
-            camp_headers = ['id', 'camp_name', 'organizer', 'location', 'start_date', 'end_date', 
-                          'age_group', 'focus_area']
-            camp_data = []
-            for c in data['training_camps']:
-                if isinstance(c, dict):
-                    camp_data.append(c)
-                else:
-                    camp_data.append(c.model_dump() if hasattr(c, 'model_dump') else c.dict())
-            add_sheet('Training Camps', camp_data, camp_headers)
-        
-        # Add References sheet
-        if data.get('references'):
-            ref_headers = ['id', 'name', 'position', 'organization', 'email', 'phone', 'relationship', 'notes']
-            ref_data = []
-            for r in data['references']:
-                if isinstance(r, dict):
-                    ref_data.append(r)
-                else:
-                    ref_data.append(r.model_dump() if hasattr(r, 'model_dump') else r.dict())
-            add_sheet('References', ref_data, ref_headers)
-        
-        # Save workbook
-        wb.save(temp_file.name)
-        
-        return send_file(temp_file.name, 
-                        as_attachment=True, 
-                        download_name='FutureElite_Export.xlsx',
-                        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        return send_file(temp_file,
+                        as_attachment=True,
+                        download_name=EXPORT_FILENAME,
+                        mimetype=EXPORT_MIMETYPE)
         
     except (IOError, OSError) as e:
-        if temp_file and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+        if temp_file:
+            temp_file.close()
         return jsonify({'success': False, 'errors': [f'Error creating export: {str(e)}']}), 500
     except Exception as e:
-        if temp_file and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+        if temp_file:
+            temp_file.close()
         return jsonify({'success': False, 'errors': [str(e)]}), 500
 
 
+@bp.route('/export-backup')
+@login_required
+def export_backup():
+    """Export all data and the player photo as a full-backup ZIP, streamed as it is written"""
+    archive = iter_backup_archive(storage, current_user.id)
+    return Response(stream_with_context(archive),
+                    mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{backup_filename()}"'})
+
+
+def _import_summary(results: Dict[str, UpsertResult]) -> Dict[str, Any]:
+    """Totals and per-collection counts of what an import did, for the JSON response"""
+    summary = {field: sum(getattr(r, field) for r in results.values()) for field in UpsertResult._fields}
+    summary['collections'] = {name: r._asdict() for name, r in results.items()}
+    return summary
+
+
 @bp.route('/import', methods=['POST'])
 @login_required
-def import_data(file_path=None, filename=None):
+def import_data(file_path=None, filename=None, workbook=None):
     """Import data from Excel or ZIP file
     
     Args:
         file_path: Optional path to a file. If provided, uses this instead of request.files['file']
         filename: Optional filename. If provided with file_path, uses this instead of file.filename
+        workbook: Optional workbook already opened from file_path with open_workbook (the caller closes it)
     """
     temp_file = None
     try:
@@ -990,97 +919,27 @@ def import_data(file_path=None, filename=None):
                     os.unlink(temp_file_path)
                 return jsonify({'success': False, 'errors': ['Excel support not available. Please install openpyxl: pip install openpyxl']}), 400
             
-            workbook = openpyxl.load_workbook(temp_file_path, data_only=True)
-            
-            # Initialize data structures
-            matches_data = []
-            settings_data = {}
-            physical_measurements_data = []
-            physical_metrics_data = []
-            achievements_data = []
-            club_history_data = []
-            training_camps_data = []
-            references_data = []
-            
-            # Helper function to read sheet data
-            def read_sheet(sheet_name, headers=None):
-                if sheet_name not in workbook.sheetnames:
-                    return []
-                ws = workbook[sheet_name]
-                data = []
-                if headers:
-                    # Find header row
-                    header_row = None
-                    for row_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
-                        if row and row[0] and str(row[0]).strip() in headers:
-                            header_row = row_idx
-                            break
-                    
-                    if header_row:
-                        # Get headers from that row
-                        header_map = {}
-                        for col_idx, header in enumerate(ws[header_row], 1):
-                            if header:
-                                header_map[col_idx] = str(header).strip()
-                        
-                        # Read data rows
-                        for row in ws.iter_rows(min_row=header_row + 1, values_only=True):
-                            if not any(row):  # Skip empty rows
-                                continue
-                            item = {}
-                            for col_idx, value in enumerate(row, 1):
-                                if col_idx in header_map and value is not None:
-                                    item[header_map[col_idx]] = value
-                            if item:
-                                data.append(item)
-                else:
-                    # Read as key-value pairs (for Settings sheet)
-                    for row in ws.iter_rows(min_row=2, values_only=True):
-                        if row[0] and row[1] is not None:
-                            key = str(row[0]).strip()
-                            value = row[1]
-                            # Convert string representations of lists back to lists
-                            if isinstance(value, str) and value.startswith('[') and value.endswith(']'):
-                                try:
-                                    import ast
-                                    value = ast.literal_eval(value)
-                                except:
-                                    pass
-                            settings_data[key] = value
-                return data
-            
-            # Read each sheet
-            matches_data = read_sheet('Matches', ['id', 'date', 'opponent', 'venue', 'result', 'goals', 'assists', 'minutes_played', 'category', 'season', 'notes', 'clean_sheets'])
-            read_sheet('Settings')  # Settings is key-value format
-            physical_measurements_data = read_sheet('Physical Measurements', ['id', 'date', 'height_cm', 'weight_kg', 'notes', 'include_in_report'])
-            physical_metrics_data = read_sheet('Physical Metrics', ['id', 'date', 'sprint_speed_ms', 'sprint_speed_kmh', 'sprint_10m_sec', 'sprint_20m_sec', 'sprint_30m_sec', 'vertical_jump_cm', 'standing_long_jump_cm', 'countermovement_jump_cm', 'agility_time_sec', 'beep_test_level', 'vo2_max', 'include_in_report'])
-            achievements_data = read_sheet('Achievements', ['id', 'date', 'title', 'category', 'season', 'goals', 'assists', 'minutes_played', 'clean_sheets', 'notes'])
-            club_history_data = read_sheet('Club History', ['id', 'club_name', 'season', 'age_group', 'position', 'achievements'])
-            training_camps_data = read_sheet('Training Camps', ['id', 'camp_name', 'organizer', 'location', 'start_date', 'end_date', 'age_group', 'focus_area'])
-            references_data = read_sheet('References', ['id', 'name', 'position', 'organization', 'email', 'phone', 'relationship', 'notes'])
-            
-            # Prepare import data
-            import_data = {
-                'matches': matches_data,
-                'settings': settings_data,
-                'physical_measurements': physical_measurements_data,
-                'club_history': club_history_data,
-                'training_camps': training_camps_data,
-                'physical_metrics': physical_metrics_data,
-                'achievements': achievements_data,
-                'references': references_data
-            }
-            
-            success = storage.import_data(import_data, user_id)
+            # Stream every sheet from one read-only pass over the workbook
+            opened_here = workbook is None
+            if opened_here:
+                workbook = open_workbook(temp_file_path)
+            try:
+                import_data = read_backup(workbook)
+            finally:
+                if opened_here:
+                    workbook.close()
             
-            # Clean up
-            if temp_file and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            try:
+                results = storage.merge_import(import_data, user_id)
+            except (ValueError, TypeError) as e:
+                return jsonify({'success': False, 'errors': [f'Failed to import data: {str(e)}']}), 400
+            finally:
+                # Clean up
+                if temp_file and os.path.exists(temp_file_path):
+                    os.unlink(temp_file_path)
             
-            if success:
-                return jsonify({'success': True, 'message': 'Data imported successfully from Excel file'})
-            else:
-                return jsonify({'success': False, 'errors': ['Failed to import data']}), 400
+            return jsonify({'success': True, 'message': 'Data imported successfully from Excel file',
+                            **_import_summary(results)})
         
         # Import from ZIP file (existing functionality)
         # Only process as ZIP if it's actually a ZIP file
@@ -1124,6 +983,19 @@ def import_data(file_path=None, filename=None):
                         os.unlink(temp_file_path)
                     return jsonify({'success': False, 'errors': ['Suspicious compression ratio detected. File may be a ZIP bomb.']}), 400
             
+            # Full backups (manifest + JSON Lines members) are validated and applied member by member
+            if is_backup_archive(zip_file):
+                photos_dir = os.path.join(current_app.root_path, '..', 'data', 'photos')
+                try:
+                    results = restore_backup_archive(zip_file, storage, user_id, photos_dir)
+                except BackupError as e:
+                    if temp_file:
+                        os.unlink(temp_file_path)
+                    return jsonify({'success': False, 'errors': [str(e)]}), 400
+                if temp_file:
+                    os.unlink(temp_file_path)
+                return jsonify({'success': True, 'message': 'Backup restored successfully', **_import_summary(results)})
+            
             # Read files with size limits
             def read_zip_file_safe(zip_file, filename, max_size=MAX_FILE_SIZE):
                 """Safely read a file from ZIP with size limit"""
@@ -1197,16 +1069,16 @@ def import_data(file_path=None, filename=None):
             'physical_metrics': physical_metrics_data
         }
         
-        success = storage.import_data(import_data, user_id)
-        
-        # Clean up
-        if temp_file and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+        try:
+            results = storage.merge_import(import_data, user_id)
+        except (ValueError, TypeError) as e:
+            return jsonify({'success': False, 'errors': [f'Failed to import data: {str(e)}']}), 400
+        finally:
+            # Clean up
+            if temp_file and os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
         
-        if success:
-            return jsonify({'success': True})
-        else:
-            return jsonify({'success': False, 'errors': ['Failed to import data']}), 400
+        return jsonify({'success': True, **_import_summary(results)})
         
     except (zipfile.BadZipFile, json.JSONDecodeError, Exception) as e:
         if temp_file and os.path.exists(temp_file_path):
@@ -1328,6 +1200,7 @@ def import_excel():
         return jsonify({'success': False, 'errors': ['Excel support not available. Please install openpyxl: pip install openpyxl']}), 400
     
     temp_file = None
+    temp_file_path = None
     try:
         if 'file' not in request.files:
             return jsonify({'success': False, 'errors': ['No file provided']}), 400
@@ -1345,392 +1218,43 @@ def import_excel():
         # Save file temporarily first
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
         file.save(temp_file.name)
-        
-        # Check if this is a full backup (has multiple sheets) or match-only import
-        try:
-            workbook_check = openpyxl.load_workbook(temp_file.name, data_only=True)
-            is_full_backup = len(workbook_check.sheetnames) > 1 or 'Settings' in workbook_check.sheetnames or 'Physical Measurements' in workbook_check.sheetnames
-            workbook_check.close()
-        except Exception as e:
-            current_app.logger.error(f"Error checking workbook for full backup: {e}", exc_info=True)
-            if temp_file and os.path.exists(temp_file.name):
-                os.unlink(temp_file.name)
-            return jsonify({'success': False, 'errors': [f'Error reading Excel file: {str(e)}']}), 500
-        
-        # If it's a full backup, use the main import route which handles full backups
-        if is_full_backup:
-            temp_file_path = temp_file.name
-            temp_file.close()
-            
-            # Call import_data with the file path directly (avoids ImmutableMultiDict issue)
-            try:
-                result = import_data(file_path=temp_file_path, filename=filename)
-                return result
-            except Exception as e:
-                current_app.logger.error(f"Error in import_data for full backup: {e}", exc_info=True)
-                # Clean up temp file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                return jsonify({'success': False, 'errors': [f'Error importing full backup: {str(e)}']}), 500
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-        
-        # Get import mode
-        import_mode = request.form.get('import_mode', 'replace')  # 'replace' or 'append'
-        
-        # File is already saved in temp_file from above, reuse it
-        # No need to save again - the file object can only be read once
+        temp_file.close()
+        temp_file_path = temp_file.name
         
         # Check file size (max 10MB for Excel import)
-        file_size = os.path.getsize(temp_file.name)
-        if file_size > 10 * 1024 * 1024:
-            os.unlink(temp_file.name)
+        if os.path.getsize(temp_file_path) > 10 * 1024 * 1024:
+            os.unlink(temp_file_path)
             return jsonify({'success': False, 'errors': ['File too large. Maximum size is 10MB']}), 400
         
-        # Security: Parse Excel file in data-only mode to prevent formula injection
-        workbook = openpyxl.load_workbook(temp_file.name, data_only=True)
-        sheet = workbook.active
+        # Security: Open once, read-only and data-only to prevent formula injection
+        try:
+            workbook = open_workbook(temp_file_path)
+        except Exception as e:
+            current_app.logger.error(f"Error reading Excel workbook: {e}", exc_info=True)
+            os.unlink(temp_file_path)
+            return jsonify({'success': False, 'errors': [f'Error reading Excel file: {str(e)}']}), 500
         
-        # Security: Helper function to sanitize cell values and prevent formula injection
-        def sanitize_cell_value(cell_value):
-            """Sanitize cell value to prevent formula injection"""
-            if cell_value is None:
-                return None
-            # Convert to string and strip
-            value = str(cell_value).strip()
-            # Security: Reject formulas (cells starting with =, +, -, @)
-            if value and value[0] in ['=', '+', '-', '@']:
-                # Log potential formula injection attempt
-                current_app.logger.warning(f"Potential formula injection detected: {value[:50]}")
-                return None  # Reject formulas
-            return value
-        
-        # Find header row (look for "Opponent" or similar)
-        header_row = None
-        for idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
-            if row and any(cell and 'opponent' in str(cell).lower().strip() for cell in row if cell):
-                header_row = idx
-                break
-        
-        # If not found, try first row as header
-        if not header_row:
-            header_row = 1
-        
-        # Read headers - handle None values and normalize, sanitize to prevent formula injection
-        headers = []
-        for cell in sheet[header_row]:
-            if cell is None or cell.value is None:
-                headers.append('')
-            else:
-                # Security: Sanitize header to prevent formula injection
-                header_str = sanitize_cell_value(cell.value)
-                headers.append(header_str if header_str else '')
-        
-        # Map column names to our fields (flexible matching)
-        col_map = {}
-        found_headers = []
-        for idx, header in enumerate(headers):
-            if not header:
-                continue
-            
-            # Normalize header: lowercase, strip whitespace, normalize whitespace
-            header_clean = str(header).lower().strip()
-            header_clean = ' '.join(header_clean.split())  # Normalize multiple spaces to single space
-            found_headers.append(f"'{header}'")
-            
-            # Opponent column - try multiple variations
-            if 'opponent' in header_clean and 'opponent' not in col_map:
-                col_map['opponent'] = idx
-            elif header_clean in ['opp', 'vs', 'versus', 'against'] and 'opponent' not in col_map:
-                col_map['opponent'] = idx
-            
-            # Location column
-            if 'location' in header_clean and 'location' not in col_map:
-                col_map['location'] = idx
-            elif header_clean in ['venue', 'place', 'stadium', 'ground'] and 'location' not in col_map:
-                col_map['location'] = idx
-            
-            # Date column - try multiple variations
-            if 'date' in header_clean and 'date' not in col_map:
-                col_map['date'] = idx
-            elif header_clean in ['match date', 'game date', 'played', 'when'] and 'date' not in col_map:
-                col_map['date'] = idx
-            
-            # Category column
-            if ('category' in header_clean or 'type' in header_clean) and 'category' not in col_map:
-                col_map['category'] = idx
-            elif header_clean in ['match type', 'competition'] and 'category' not in col_map:
-                col_map['category'] = idx
-            
-            # Score column
-            if 'score' in header_clean and 'score' not in col_map:
-                col_map['score'] = idx
-            elif header_clean in ['result', 'final score', 'ft'] and 'score' not in col_map:
-                col_map['score'] = idx
-            
-            # Goals column (check for "brodie goals" or just "goals" or "g")
-            if 'goal' in header_clean and 'goals' not in col_map:
-                if 'brodie' in header_clean or header_clean in ['g', 'goals', 'goal', 'brodie goals', 'brodie goal']:
-                    col_map['goals'] = idx
-            
-            # Assists column
-            if 'assist' in header_clean and 'assists' not in col_map:
-                if 'brodie' in header_clean or header_clean in ['a', 'assists', 'assist', 'brodie assists', 'brodie assist']:
-                    col_map['assists'] = idx
-            
-            # Minutes column
-            if ('minute' in header_clean or 'min' in header_clean) and 'minutes' not in col_map:
-                if 'brodie' in header_clean or header_clean in ['min', 'minutes', 'mins', 'playing minutes', 'time', 'played']:
-                    col_map['minutes'] = idx
-            
-            # Notes column
-            if 'note' in header_clean and 'notes' not in col_map:
-                col_map['notes'] = idx
-            elif header_clean in ['comment', 'comments', 'remarks'] and 'notes' not in col_map:
-                col_map['notes'] = idx
-        
-        # Required columns - provide detailed error message
-        if 'opponent' not in col_map or 'date' not in col_map:
-            missing = []
-            if 'opponent' not in col_map:
-                missing.append('Opponent')
-            if 'date' not in col_map:
-                missing.append('Date')
+        try:
+            # If it's a full backup, use the main import route which handles full backups
+            if is_full_backup(workbook):
+                try:
+                    return import_data(file_path=temp_file_path, filename=filename, workbook=workbook)
+                except Exception as e:
+                    current_app.logger.error(f"Error in import_data for full backup: {e}", exc_info=True)
+                    return jsonify({'success': False, 'errors': [f'Error importing full backup: {str(e)}']}), 500
             
-            error_msg = f'Excel file must contain "{", ".join(missing)}" column(s). '
-            error_msg += f'Found headers: {", ".join(found_headers[:10])}'  # Show first 10 headers
-            if temp_file and os.path.exists(temp_file.name):
-                os.unlink(temp_file.name)
-            return jsonify({'success': False, 'errors': [error_msg]}), 400
-        
-        # Parse rows
-        imported_matches = []
-        errors = []
-        match_counter = 0  # Counter to ensure unique IDs
-        rows_checked = 0
-        last_row_idx = header_row
-        
-        for row_idx, row in enumerate(sheet.iter_rows(min_row=header_row + 1, values_only=True), header_row + 1):
-            rows_checked += 1
-            last_row_idx = row_idx
-            # Skip completely empty rows
-            if not row or not any(cell is not None and str(cell).strip() for cell in row if cell is not None):
-                continue
+            # Get import mode
+            import_mode = request.form.get('import_mode', 'replace')  # 'replace' or 'append'
             
+            # Stream and validate the match rows
             try:
-                # Extract data - handle None and empty values better, sanitize to prevent formula injection
-                opponent_idx = col_map.get('opponent')
-                if opponent_idx is not None and opponent_idx < len(row):
-                    opponent_raw = row[opponent_idx]
-                    opponent = sanitize_cell_value(opponent_raw) if opponent_raw is not None else ''
-                else:
-                    opponent = ''
-                
-                # Skip if opponent is empty or is the header text or instruction rows
-                if not opponent or opponent.lower() in ['opponent', 'opp', 'vs', 'versus', 'against', '']:
-                    continue
-                
-                # Skip instruction rows (from template)
-                if opponent.upper().startswith('INSTRUCTIONS') or opponent.upper().startswith('REQUIRED'):
-                    continue
-                
-                # Extract other fields with better None handling, sanitize to prevent formula injection
-                location_idx = col_map.get('location')
-                if location_idx is not None and location_idx < len(row) and row[location_idx] is not None:
-                    location = sanitize_cell_value(row[location_idx]) or 'Unknown'
-                else:
-                    location = 'Unknown'
-                
-                date_idx = col_map.get('date')
-                if date_idx is not None and date_idx < len(row):
-                    date_cell = sanitize_cell_value(row[date_idx])
-                else:
-                    date_cell = None
-                
-                category_idx = col_map.get('category')
-                if category_idx is not None and category_idx < len(row) and row[category_idx] is not None:
-                    category = sanitize_cell_value(row[category_idx]) or 'Pre-Season Friendly'
-                else:
-                    category = 'Pre-Season Friendly'
-                
-                score_idx = col_map.get('score')
-                if score_idx is not None and score_idx < len(row) and row[score_idx] is not None:
-                    score = sanitize_cell_value(row[score_idx])
-                else:
-                    score = None
-                
-                goals_idx = col_map.get('goals')
-                if goals_idx is not None and goals_idx < len(row):
-                    goals = row[goals_idx]
-                else:
-                    goals = 0
-                
-                assists_idx = col_map.get('assists')
-                if assists_idx is not None and assists_idx < len(row):
-                    assists = row[assists_idx]
-                else:
-                    assists = 0
-                
-                minutes_idx = col_map.get('minutes')
-                if minutes_idx is not None and minutes_idx < len(row):
-                    minutes = row[minutes_idx]
-                else:
-                    minutes = 0
-                
-                notes_idx = col_map.get('notes')
-                if notes_idx is not None and notes_idx < len(row) and row[notes_idx] is not None:
-                    notes = sanitize_cell_value(row[notes_idx]) or ''
-                else:
-                    notes = ''
-                
-                # Parse date - try multiple formats including Excel serial numbers
-                date_str = None
-                if date_cell is None:
-                    errors.append(f"Row {row_idx}: Missing date (opponent: {opponent})")
-                    continue
-                elif isinstance(date_cell, datetime):
-                    date_str = date_cell.strftime("%d %b %Y")
-                elif isinstance(date_cell, (int, float)):
-                    # Excel date serial number
-                    try:
-                        from openpyxl.utils import datetime_from_excel
-                        date_obj = datetime_from_excel(date_cell)
-                        date_str = date_obj.strftime("%d %b %Y")
-                    except:
-                        # Try as days since 1900
-                        try:
-                            from datetime import timedelta
-                            base_date = datetime(1899, 12, 30)
-                            date_obj = base_date + timedelta(days=int(date_cell))
-                            date_str = date_obj.strftime("%d %b %Y")
-                        except Exception as e:
-                            errors.append(f"Row {row_idx}: Invalid date number '{date_cell}' (opponent: {opponent}): {str(e)}")
-                            continue
-                elif isinstance(date_cell, str):
-                    date_cell_clean = date_cell.strip()
-                    # Try multiple date formats
-                    date_formats = [
-                        "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
-                        "%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d",
-                        "%d %b %Y", "%d %B %Y",
-                        "%b %d, %Y", "%B %d, %Y",
-                        "%d/%m/%y", "%d-%m-%y"
-                    ]
-                    date_parsed = False
-                    for fmt in date_formats:
-                        try:
-                            date_obj = datetime.strptime(date_cell_clean, fmt)
-                            date_str = date_obj.strftime("%d %b %Y")
-                            date_parsed = True
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if not date_parsed:
-                        errors.append(f"Row {row_idx}: Invalid date format '{date_cell}' (opponent: {opponent})")
-                        continue
-                else:
-                    errors.append(f"Row {row_idx}: Invalid date type '{type(date_cell)}' (opponent: {opponent})")
-                    continue
-                
-                # Parse numeric values
-                try:
-                    goals = int(float(goals)) if goals else 0
-                except (ValueError, TypeError):
-                    goals = 0
-                
-                try:
-                    assists = int(float(assists)) if assists else 0
-                except (ValueError, TypeError):
-                    assists = 0
-                
-                try:
-                    minutes = int(float(minutes)) if minutes else 0
-                except (ValueError, TypeError):
-                    minutes = 0
-                
-                # Format score
-                if score and score.strip() and score.lower() not in ['none', 'n/a', '']:
-                    # Handle different score formats
-                    score = score.replace(' ', '')
-                    if '-' in score:
-                        parts = score.split('-')
-                        if len(parts) == 2:
-                            score = f"{parts[0].strip()} - {parts[1].strip()}"
-                    formatted_score = score
-                else:
-                    formatted_score = None
-                
-                # Determine result from score
-                result = None
-                if formatted_score:
-                    try:
-                        parts = formatted_score.split(' - ')
-                        if len(parts) == 2:
-                            our_score = int(parts[0].strip())
-                            their_score = int(parts[1].strip())
-                            if our_score > their_score:
-                                result = MatchResult.WIN
-                            elif our_score < their_score:
-                                result = MatchResult.LOSS
-                            else:
-                                result = MatchResult.DRAW
-                    except (ValueError, IndexError):
-                        pass
-                
-                # Parse category
-                try:
-                    if category:
-                        category_lower = category.lower()
-                        if 'league' in category_lower:
-                            match_category = MatchCategory.LEAGUE
-                        elif 'friendly' in category_lower and 'pre-season' not in category_lower:
-                            match_category = MatchCategory.FRIENDLY
-                        elif 'pre-season' in category_lower or 'pre season' in category_lower:
-                            match_category = MatchCategory.PRE_SEASON_FRIENDLY
-                        else:
-                            match_category = MatchCategory.PRE_SEASON_FRIENDLY
-                    else:
-                        match_category = MatchCategory.PRE_SEASON_FRIENDLY
-                except (AttributeError, TypeError):
-                    match_category = MatchCategory.PRE_SEASON_FRIENDLY
-                
-                # Create match with unique ID (use counter to ensure uniqueness)
-                match_counter += 1
-                base_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-                unique_id = f"{base_id}_{match_counter:04d}"
-                
-                match = Match(
-                    id=unique_id,
-                    category=match_category,
-                    date=date_str,
-                    opponent=opponent,
-                    location=location,
-                    result=result,
-                    score=formatted_score,
-                    brodie_goals=goals,
-                    brodie_assists=assists,
-                    minutes_played=minutes,
-                    notes=notes,
-                    is_fixture=False
-                )
-                
-                imported_matches.append(match)
-                
-            except Exception as e:
-                # Try to get opponent name for better error message
-                try:
-                    opponent_for_error = opponent if 'opponent' in locals() else 'unknown'
-                    errors.append(f"Row {row_idx} (opponent: {opponent_for_error}): {str(e)}")
-                except:
-                    errors.append(f"Row {row_idx}: {str(e)}")
-                continue
-        
-        # Clean up temp file
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+                imported_matches, errors, rows_checked = parse_match_sheet(workbook.active)
+            except ExcelImportError as e:
+                return jsonify({'success': False, 'errors': [str(e)]}), 400
+        finally:
+            workbook.close()
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
         
         if not imported_matches:
             error_msg = 'No valid matches found in Excel file.'
@@ -1738,26 +1262,25 @@ def import_excel():
                 error_msg += f' Found {len(errors)} error(s).'
             return jsonify({'success': False, 'errors': [error_msg] + errors[:20]}), 400
         
-        # Save matches to server storage
+        # Save matches to server storage in one write; replace mode drops the user's
+        # existing matches in the same write. Rows that duplicate a stored match (or an
+        # earlier row) update that match instead of adding another copy.
         user_id = current_user.id
-        if import_mode == 'replace':
-            # Delete existing matches for this user first
-            existing_matches = storage.load_matches()
-            existing_matches = [m for m in existing_matches if m.get('user_id') != user_id]
-            storage._save_matches(existing_matches)
+        result = storage.bulk_upsert('matches', imported_matches, user_id,
+                                     replace=(import_mode == 'replace'), dedupe=True)
         
-        # Save imported matches to server storage
-        for match in imported_matches:
-            storage.save_match(match, user_id)
+        current_app.logger.info(f"Saved {result.inserted} new and {result.updated} updated matches "
+                                f"({result.skipped} duplicates skipped) to server storage for user {user_id}")
         
-        current_app.logger.info(f"Saved {len(imported_matches)} matches to server storage for user {user_id}")
-        
-        # Convert matches to dictionaries for JSON response
-        matches_data = [m.model_dump() for m in imported_matches]
+        # Return the user's stored matches so the client mirrors the deduplicated result
+        matches_data = [m.model_dump() for m in storage.get_all_matches(user_id)]
         
         response = {
             'success': True,
-            'imported': len(imported_matches),
+            'imported': result.inserted + result.updated,
+            'inserted': result.inserted,
+            'updated': result.updated,
+            'skipped': result.skipped,
             'matches': matches_data,  # Return matches to client
             'import_mode': import_mode,  # Return mode so client knows what to do
             'rows_checked': rows_checked,
@@ -1765,7 +1288,7 @@ def import_excel():
         }
         
         if errors:
-            response['warning'] = f'Imported {len(imported_matches)} matches, but {len(errors)} row(s) had errors.'
+            response['warning'] = f'Imported {result.inserted + result.updated} matches, but {len(errors)} row(s) had errors.'
         elif len(imported_matches) == 0:
             response['warning'] = 'No matches were imported. Please check that your Excel file has data rows with valid Opponent and Date values.'
         
@@ -1913,8 +1436,7 @@ def update_settings():
         
         # If date_of_birth was provided and we have measurements, try to calculate PHV automatically
         # Only for paid users
-        subscription = storage.get_subscription_by_user_id(user_id)
-        has_active_subscription = subscription and subscription.status == SubscriptionStatus.ACTIVE
+        has_active_subscription = get_entitlements().get(user_id).is_active
         
         if settings.date_of_birth and has_active_subscription:
             try:
@@ -1995,6 +1517,12 @@ def upload_photo():
         # Save file
         file.save(filepath)
         
+        # Pre-size the web thumbnail and print copy used by the PDFs
+        try:
+            create_photo_variants(filepath)
+        except Exception as e:
+            current_app.logger.warning(f"Could not create photo variants for {new_filename}: {e}")
+        
         # Update settings with relative path
         settings = storage.load_settings(user_id)
         # Store relative path from project root
@@ -2045,17 +1573,11 @@ def serve_photo(filename):
             from flask import Response
             return Response('Photo not found', status=404, mimetype='text/plain')
         
-        # Get user's photo path from settings to verify ownership (optional check)
-        user_id = current_user.id
-        settings = storage.load_settings(user_id)
-        
-        # Check if this photo belongs to the current user (optional - allow if file exists)
-        if settings.player_photo_path and filename not in settings.player_photo_path:
-            # Also check if user is admin (can view any photo)
-            admin_username = os.environ.get('ADMIN_USERNAME', '').strip()
-            if current_user.username != admin_username:
-                # Still allow if file exists - might be from import
-                pass
+        # ?variant=thumb serves a pre-sized copy instead of the original upload
+        variant = request.args.get('variant')
+        if variant in PHOTO_VARIANTS:
+            filepath = get_photo_variant(filepath, variant) or filepath
+            filename = os.path.basename(filepath)
         
         # Determine MIME type from extension
         ext = filename.rsplit('.', 1)[1].lower()
@@ -2068,8 +1590,22 @@ def serve_photo(filename):
         }
         mimetype = mime_types.get(ext, 'image/jpeg')
         
-        # Serve file
-        return send_file(filepath, mimetype=mimetype)
+        # Photo filenames are random per upload, so a given URL's content only changes
+        # if a variant is regenerated; the content ETag covers that case
+        etag = photo_etag(filepath)
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            accel_prefix = os.environ.get('PHOTO_ACCEL_REDIRECT_PREFIX', '').strip()
+            if accel_prefix:
+                # nginx streams the file from an internal location; the worker only sends headers
+                response = current_app.response_class(mimetype=mimetype)
+                response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + filename
+            else:
+                response = send_file(filepath, mimetype=mimetype, etag=False, conditional=False)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f'private, max-age={PHOTO_CACHE_MAX_AGE}'
+        return response
         
     except Exception as e:
         current_app.logger.error(f"Error serving photo: {e}", exc_info=True)
@@ -2085,49 +1621,21 @@ def get_stats():
         user_id = current_user.id
         period = request.args.get('period', 'all_time')  # Default to all_time
         
+        # period=all returns every period at once, keyed by period name
+        if period == 'all':
+            return jsonify({
+                'success': True,
+                'stats': storage.get_all_period_stats(user_id),
+                'period': period
+            })
+        
         # Validate period
-        valid_periods = ['all_time', 'season', '12_months', '6_months', '3_months', 'last_month']
-        if period not in valid_periods:
+        if period not in STATS_PERIODS:
             period = 'all_time'
         
-        season_stats = storage.get_season_stats(user_id, period=period)
-        
-        # For category stats, we need to filter matches first
-        from .utils import filter_matches_by_period
-        settings = storage.load_settings(user_id)
-        all_matches = storage.get_all_matches(user_id)
-        completed_matches = [m for m in all_matches if not m.is_fixture]
-        
-        if period and period != 'all_time':
-            filtered_matches = filter_matches_by_period(completed_matches, period, settings.season_year)
-        else:
-            filtered_matches = completed_matches
-        
-        pre_season_matches = [m for m in filtered_matches if m.category.value == "Pre-Season Friendly"]
-        league_matches = [m for m in filtered_matches if m.category.value == "League"]
-        
-        pre_season_stats = storage.get_category_stats("Pre-Season Friendly", user_id)
-        league_stats = storage.get_category_stats("League", user_id)
-        
-        # Recalculate category stats from filtered matches
-        def calc_stats_from_matches(match_list):
-            return {
-                "matches": len(match_list),
-                "goals": sum(m.brodie_goals for m in match_list),
-                "assists": sum(m.brodie_assists for m in match_list),
-                "minutes": sum(m.minutes_played for m in match_list)
-            }
-        
-        pre_season_stats = calc_stats_from_matches(pre_season_matches)
-        league_stats = calc_stats_from_matches(league_matches)
-        
         return jsonify({
             'success': True,
-            'stats': {
-                'season': season_stats,
-                'pre_season': pre_season_stats,
-                'league': league_stats
-            },
+            'stats': storage.get_stats_summary(user_id, period=period),
             'period': period
         })
         
@@ -2948,55 +2456,17 @@ def delete_achievement(achievement_id):
 def generate_scout_pdf_route():
     """Generate scout-friendly PDF report - accepts data from client"""
     try:
-        # Check subscription status - try multiple methods
-        subscription = storage.get_subscription_by_user_id(current_user.id)
-        
-        # If no subscription found by user_id, check if there's exactly one active subscription
-        # This handles cases where user_id format changed (e.g., client-side ID vs server-side ID)
-        if not subscription:
-            subscriptions = storage.load_subscriptions()
-            active_subs = [s for s in subscriptions if s.get('status', '').lower() == 'active']
-            
-            # If there's exactly one active subscription, it's likely for the current user
-            # Update it to use the correct user_id
-            if len(active_subs) == 1:
-                sub_data = active_subs[0]
-                try:
-                    # Create subscription object and update user_id
-                    if 'status' in sub_data and isinstance(sub_data['status'], str):
-                        sub_data['status'] = SubscriptionStatus(sub_data['status'].lower())
-                    subscription = Subscription(**sub_data)
-                    subscription.user_id = current_user.id
-                    storage.save_subscription(subscription)
-                    current_app.logger.info(f"Updated subscription user_id from {sub_data.get('user_id')} to {current_user.id}")
-                except Exception as e:
-                    current_app.logger.error(f"Error updating subscription: {e}")
-                    subscription = None
+        # Check subscription status (includes the single-orphan fallback)
+        entitlement = get_entitlements().get(current_user.id, claim_orphan=True)
         
-        # Debug logging
-        current_app.logger.info(f"Scout PDF generation request for user {current_user.id}")
-        current_app.logger.info(f"Subscription found: {subscription is not None}")
-        if subscription:
-            current_app.logger.info(f"Subscription status: {subscription.status}, type: {type(subscription.status)}")
-            current_app.logger.info(f"Subscription status == ACTIVE: {subscription.status == SubscriptionStatus.ACTIVE}")
-            current_app.logger.info(f"Subscription status value: {subscription.status.value if hasattr(subscription.status, 'value') else subscription.status}")
-        
-        # Check if subscription is active - simplified check
-        is_active = False
-        if subscription:
-            # Get status value (works for both enum and string)
-            status_value = subscription.status.value if hasattr(subscription.status, 'value') else str(subscription.status)
-            is_active = status_value.lower() == SubscriptionStatus.ACTIVE.value.lower()
-            current_app.logger.info(f"Status value: {status_value}, ACTIVE value: {SubscriptionStatus.ACTIVE.value}, is_active: {is_active}")
-        
-        if not subscription or not is_active:
-            current_app.logger.warning(f"Scout PDF generation blocked for user {current_user.id}: subscription={subscription is not None}, is_active={is_active}")
+        if not entitlement.is_active:
+            current_app.logger.warning(f"Scout PDF generation blocked for user {current_user.id}: subscription={entitlement.has_subscription}, is_active=False")
             return jsonify({
                 'success': False,
                 'errors': ['Scout report generation is a premium feature. Please subscribe to unlock this feature.'],
                 'debug': {
-                    'has_subscription': subscription is not None,
-                    'status': subscription.status if subscription else None,
+                    'has_subscription': entitlement.has_subscription,
+                    'status': entitlement.status if entitlement.has_subscription else None,
                     'user_id': current_user.id
                 }
             }), 403
@@ -3020,6 +2490,11 @@ def generate_scout_pdf_route():
         if period not in valid_periods:
             period = 'all_time'
         
+        # Output profile: 'optimized' makes smaller files for email and mobile
+        profile = data.get('profile', DEFAULT_PDF_PROFILE)
+        if profile not in PDF_PROFILES:
+            profile = DEFAULT_PDF_PROFILE
+        
         # Load settings from server (most up-to-date, includes player profile data)
         # Merge with client settings to ensure we have all data
         try:
@@ -3340,25 +2815,19 @@ def generate_scout_pdf_route():
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate PDF with period filter
-        pdf_path = generate_scout_pdf(
-            matches, 
-            settings, 
-            achievements, 
-            club_history, 
-            physical_measurements,
-            training_camps,
-            physical_metrics,
-            references,
+        return _render_pdf(
+            'scout',
             output_dir,
-            period=period
-        )
-        
-        # Return the PDF file directly
-        return send_file(
-            pdf_path,
-            as_attachment=True,
-            download_name=os.path.basename(pdf_path),
-            mimetype='application/pdf'
+            matches=matches,
+            settings=settings,
+            achievements=achievements,
+            club_history=club_history,
+            physical_measurements=physical_measurements,
+            training_camps=training_camps,
+            physical_metrics=physical_metrics,
+            references=references,
+            period=period,
+            profile=profile
         )
         
     except Exception as e:
@@ -3374,41 +2843,17 @@ def generate_scout_pdf_route():
 def generate_player_resume_pdf_route():
     """Generate Player Resume PDF report - accepts data from client"""
     try:
-        # Check subscription status - try multiple methods
-        subscription = storage.get_subscription_by_user_id(current_user.id)
-        
-        # If no subscription found by user_id, check if there's exactly one active subscription
-        if not subscription:
-            subscriptions = storage.load_subscriptions()
-            active_subs = [s for s in subscriptions if s.get('status', '').lower() == 'active']
-            
-            if len(active_subs) == 1:
-                sub_data = active_subs[0]
-                try:
-                    if 'status' in sub_data and isinstance(sub_data['status'], str):
-                        sub_data['status'] = SubscriptionStatus(sub_data['status'].lower())
-                    subscription = Subscription(**sub_data)
-                    subscription.user_id = current_user.id
-                    storage.save_subscription(subscription)
-                    current_app.logger.info(f"Updated subscription user_id from {sub_data.get('user_id')} to {current_user.id}")
-                except Exception as e:
-                    current_app.logger.error(f"Error updating subscription: {e}")
-                    subscription = None
+        # Check subscription status (includes the single-orphan fallback)
+        entitlement = get_entitlements().get(current_user.id, claim_orphan=True)
         
-        # Check if subscription is active
-        is_active = False
-        if subscription:
-            status_value = subscription.status.value if hasattr(subscription.status, 'value') else str(subscription.status)
-            is_active = status_value.lower() == SubscriptionStatus.ACTIVE.value.lower()
-        
-        if not subscription or not is_active:
-            current_app.logger.warning(f"Player Resume PDF generation blocked for user {current_user.id}: subscription={subscription is not None}, is_active={is_active}")
+        if not entitlement.is_active:
+            current_app.logger.warning(f"Player Resume PDF generation blocked for user {current_user.id}: subscription={entitlement.has_subscription}, is_active=False")
             return jsonify({
                 'success': False,
                 'errors': ['Player Resume generation is a premium feature. Please subscribe to unlock this feature.'],
                 'debug': {
-                    'has_subscription': subscription is not None,
-                    'status': subscription.status if subscription else None,
+                    'has_subscription': entitlement.has_subscription,
+                    'status': entitlement.status if entitlement.has_subscription else None,
                     'user_id': current_user.id
                 }
             }), 403
@@ -3439,6 +2884,11 @@ def generate_player_resume_pdf_route():
         if period not in valid_periods:
             period = 'season'
         
+        # Output profile: 'optimized' makes smaller files for email and mobile
+        profile = data.get('profile', DEFAULT_PDF_PROFILE)
+        if profile not in PDF_PROFILES:
+            profile = DEFAULT_PDF_PROFILE
+        
         # Load settings from server (most up-to-date, includes player profile data)
         try:
             server_settings = storage.load_settings(user_id)
@@ -3642,25 +3092,19 @@ def generate_player_resume_pdf_route():
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate PDF with period filter
-        pdf_path = generate_player_resume_pdf(
-            matches, 
-            settings, 
-            achievements, 
-            club_history, 
-            physical_measurements,
-            training_camps,
-            physical_metrics,
-            references,
+        return _render_pdf(
+            'resume',
             output_dir,
-            period=period
-        )
-        
-        # Return the PDF file directly
-        return send_file(
-            pdf_path,
-            as_attachment=True,
-            download_name=os.path.basename(pdf_path),
-            mimetype='application/pdf'
+            matches=matches,
+            settings=settings,
+            achievements=achievements,
+            club_history=club_history,
+            physical_measurements=physical_measurements,
+            training_camps=training_camps,
+            physical_metrics=physical_metrics,
+            references=references,
+            period=period,
+            profile=profile
         )
         
     except Exception as e:
@@ -4329,6 +3773,7 @@ def cancel_user_subscription(user_id):
         subscription.cancel_at_period_end = True
         subscription.updated_at = datetime.now().strftime("%d %b %Y")
         storage.save_subscription(subscription)
+        get_entitlements().invalidate(user_id)
         
         current_app.logger.info(f"Subscription cancelled for user {user_id} by admin {current_username}")
         return jsonify({'success': True, 'message': 'Subscription cancelled successfully'})
@@ -4372,6 +3817,18 @@ def api_admin_users():
         return jsonify({'success': False, 'errors': ['Error loading users']}), 500
 
 
+@bp.route('/api/admin/pdf-jobs')
+@login_required
+def api_admin_pdf_jobs():
+    """PDF job queue depth and render durations (admin only)"""
+    # Denied when no ADMIN_USERNAME is configured
+    if not is_admin_user():
+        return jsonify({'success': False, 'errors': ['Access denied']}), 403
+    
+    output_dir = os.path.join(current_app.root_path, '..', 'output')
+    return jsonify({'success': True, **get_pdf_job_queue(output_dir).summary()})
+
+
 @bp.route('/api/admin/delete-user/<user_id>', methods=['POST'])
 @login_required
 def delete_user(user_id):
@@ -4472,6 +3929,7 @@ def check_overdue_subscriptions():
                             subscription.cancel_at_period_end = True
                             subscription.updated_at = datetime.now().strftime("%d %b %Y")
                             storage.save_subscription(subscription)
+                            get_entitlements().invalidate(subscription.user_id)
                             cancelled_count += 1
                             
                             current_app.logger.info(f"Auto-cancelled overdue subscription for user {subscription.user_id}")
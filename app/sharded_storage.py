@@ -0,0 +1,355 @@
+"""
+Per-user sharded storage engine for FutureElite
+
+Player data is stored in one directory per user:
+
+    data/users/<user_id>/matches.json
+    data/users/<user_id>/achievements.json
+    data/users/<user_id>/settings.json
+    ...
+
+so a save only serialises and rewrites that user's records, and writers for
+different users never touch the same file. Account-level files (users.json,
+subscriptions.json, reset_tokens.json) stay in the flat layout, as do any
+legacy records that have no user_id.
+"""
+
+import logging
+import re
+import shutil
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+from .models import (
+    Match, AppSettings, PhysicalMeasurement, Achievement, ClubHistory,
+    TrainingCamp, PhysicalMetrics, Reference
+)
+from .storage import StorageManager, file_lock, _notify_user_changed, _file_signature, _merge_records
+
+logger = logging.getLogger(__name__)
+
+
+# Collection name -> flat file attribute on StorageManager
+SHARDED_COLLECTIONS = {
+    'matches': 'matches_file',
+    'physical_measurements': 'physical_measurements_file',
+    'achievements': 'achievements_file',
+    'club_history': 'club_history_file',
+    'training_camps': 'training_camps_file',
+    'physical_metrics': 'physical_metrics_file',
+    'references': 'references_file',
+}
+
+_SAFE_USER_ID = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+
+class ShardedStorageManager(StorageManager):
+    """StorageManager that keeps each user's collections in their own directory"""
+
+    def __init__(self, data_dir: str = "data"):
+        self.users_dir = Path(data_dir) / "users"
+        super().__init__(data_dir)
+        self.users_dir.mkdir(exist_ok=True)
+
+    # ========== Shard files ==========
+    def _user_dir(self, user_id: str) -> Path:
+        # user_id becomes a path component, so never let it escape users_dir
+        if not user_id or user_id in ('.', '..') or not _SAFE_USER_ID.match(user_id):
+            raise ValueError(f"Invalid user id for sharded storage: {user_id!r}")
+        return self.users_dir / user_id
+
+    def _shard_file(self, user_id: str, name: str) -> Path:
+        return self._user_dir(user_id) / f"{name}.json"
+
+    def _shard_user_ids(self) -> List[str]:
+        try:
+            return sorted(p.name for p in self.users_dir.iterdir() if p.is_dir())
+        except FileNotFoundError:
+            return []
+
+    # ========== Generic per-user collection helpers ==========
+    def _load_shard(self, name: str, user_id: str) -> list:
+        return self._read_json(self._shard_file(user_id, name), [])
+
+    def _save_shard(self, name: str, user_id: str, records: list) -> None:
+        self._write_json(self._shard_file(user_id, name), records, name.replace('_', ' '))
+
+    def _load_collection(self, name: str, user_id: Optional[str] = None) -> list:
+        if user_id:
+            return self._load_shard(name, user_id)
+        # Unowned legacy records from the flat file, then every user's shard
+        records = self._read_json(getattr(self, SHARDED_COLLECTIONS[name]), [])
+        for shard_user_id in self._shard_user_ids():
+            records.extend(self._load_shard(name, shard_user_id))
+        return records
+
+    def _save_collection(self, name: str, records: list) -> None:
+        """Split a full collection by user_id and rewrite the affected shards"""
+        by_user: Dict[str, list] = {}
+        unowned = []
+        for record in records:
+            user_id = record.get('user_id')
+            if user_id:
+                by_user.setdefault(user_id, []).append(record)
+            else:
+                unowned.append(record)
+
+        for shard_user_id in self._shard_user_ids():
+            if shard_user_id not in by_user and self._shard_file(shard_user_id, name).exists():
+                by_user[shard_user_id] = []
+        for user_id, user_records in by_user.items():
+            self._save_shard(name, user_id, user_records)
+        self._write_json(getattr(self, SHARDED_COLLECTIONS[name]), unowned, name.replace('_', ' '))
+
+    def _upsert(self, name: str, user_id: str, record: Dict[str, Any]) -> None:
+        with file_lock(self._shard_file(user_id, name)):
+            before = self._matches_signature(user_id) if name == 'matches' else None
+            records = self._load_shard(name, user_id)
+            old_record = None
+            for i, existing in enumerate(records):
+                if existing.get('id') == record.get('id'):
+                    old_record = existing
+                    records[i] = record
+                    break
+            else:
+                records.append(record)
+            self._save_shard(name, user_id, records)
+            if name == 'matches':
+                self._matches_changed(user_id, before, [(old_record, record)])
+
+    def _delete(self, name: str, record_id: str, user_id: str) -> bool:
+        with file_lock(self._shard_file(user_id, name)):
+            before = self._matches_signature(user_id) if name == 'matches' else None
+            records = self._load_shard(name, user_id)
+            remaining = [r for r in records if r.get('id') != record_id]
+            if len(remaining) < len(records):
+                self._save_shard(name, user_id, remaining)
+                if name == 'matches':
+                    removed = [r for r in records if r.get('id') == record_id]
+                    self._matches_changed(user_id, before, [(r, None) for r in removed])
+                return True
+            return False
+
+    def _bulk_apply(self, collection: str, user_id: str, upserts: list, delete_ids: Iterable[str] = (),
+                    delete_all: bool = False,
+                    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None) -> list:
+        """Apply a bulk write to the user's shard alone, rewriting it once"""
+        with file_lock(self._shard_file(user_id, collection)):
+            before = self._matches_signature(user_id) if collection == 'matches' else None
+            records, changes = _merge_records(self._load_shard(collection, user_id), user_id,
+                                              upserts, delete_ids, delete_all, fingerprint)
+            if changes:
+                self._save_shard(collection, user_id, records)
+                if collection == 'matches':
+                    self._matches_changed(user_id, before, changes)
+        return changes
+
+    def _matches_signature(self, user_id: str) -> Optional[tuple]:
+        return _file_signature(self._shard_file(user_id, 'matches'))
+
+    # ========== Matches ==========
+    def _save_matches(self, matches: list) -> None:
+        self._save_collection('matches', matches)
+
+    def load_matches(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('matches', user_id)
+
+    def save_match(self, match: Match, user_id: str) -> str:
+        match_dict = match.model_dump()
+        match_dict['user_id'] = user_id
+        self._upsert('matches', user_id, match_dict)
+        return match.id
+
+    def delete_match(self, match_id: str, user_id: str) -> bool:
+        return self._delete('matches', match_id, user_id)
+
+    # ========== Physical measurements ==========
+    def _save_physical_measurements(self, measurements: list) -> None:
+        self._save_collection('physical_measurements', measurements)
+
+    def load_physical_measurements(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('physical_measurements', user_id)
+
+    def save_physical_measurement(self, measurement: PhysicalMeasurement, user_id: str) -> str:
+        measurement_dict = measurement.model_dump()
+        measurement_dict['user_id'] = user_id
+        self._upsert('physical_measurements', user_id, measurement_dict)
+        return measurement.id
+
+    def delete_physical_measurement(self, measurement_id: str, user_id: str) -> bool:
+        return self._delete('physical_measurements', measurement_id, user_id)
+
+    # ========== Achievements ==========
+    def _save_achievements(self, achievements: list) -> None:
+        self._save_collection('achievements', achievements)
+
+    def load_achievements(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('achievements', user_id)
+
+    def save_achievement(self, achievement: Achievement, user_id: str) -> str:
+        achievement_dict = achievement.model_dump()
+        achievement_dict['user_id'] = user_id
+        self._upsert('achievements', user_id, achievement_dict)
+        return achievement.id
+
+    def delete_achievement(self, achievement_id: str, user_id: str) -> bool:
+        return self._delete('achievements', achievement_id, user_id)
+
+    # ========== Club history ==========
+    def _save_club_history(self, club_history: list) -> None:
+        self._save_collection('club_history', club_history)
+
+    def load_club_history(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('club_history', user_id)
+
+    def save_club_history_entry(self, club_history: ClubHistory, user_id: str) -> str:
+        entry_dict = club_history.model_dump()
+        entry_dict['user_id'] = user_id
+        self._upsert('club_history', user_id, entry_dict)
+        return club_history.id
+
+    def delete_club_history_entry(self, entry_id: str, user_id: str) -> bool:
+        return self._delete('club_history', entry_id, user_id)
+
+    # ========== Training camps ==========
+    def _save_training_camps(self, training_camps: list) -> None:
+        self._save_collection('training_camps', training_camps)
+
+    def load_training_camps(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('training_camps', user_id)
+
+    def save_training_camp(self, training_camp: TrainingCamp, user_id: str) -> str:
+        camp_dict = training_camp.model_dump()
+        camp_dict['user_id'] = user_id
+        self._upsert('training_camps', user_id, camp_dict)
+        return training_camp.id
+
+    def delete_training_camp(self, camp_id: str, user_id: str) -> bool:
+        return self._delete('training_camps', camp_id, user_id)
+
+    # ========== Physical metrics ==========
+    def _save_physical_metrics(self, metrics: list) -> None:
+        self._save_collection('physical_metrics', metrics)
+
+    def load_physical_metrics(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('physical_metrics', user_id)
+
+    def save_physical_metric(self, metric: PhysicalMetrics, user_id: str) -> str:
+        metric_dict = metric.model_dump()
+        metric_dict['user_id'] = user_id
+        self._upsert('physical_metrics', user_id, metric_dict)
+        return metric.id
+
+    def delete_physical_metric(self, metric_id: str, user_id: str) -> bool:
+        return self._delete('physical_metrics', metric_id, user_id)
+
+    # ========== References ==========
+    def _save_references(self, references: list) -> None:
+        try:
+            self._save_collection('references', references)
+        except RuntimeError as e:
+            logger.error("Error saving references: %s", e)
+
+    def load_references(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('references', user_id)
+
+    def save_reference(self, reference: Reference) -> Reference:
+        self._upsert('references', reference.user_id, reference.model_dump())
+        return reference
+
+    def delete_reference(self, reference_id: str, user_id: Optional[str] = None) -> bool:
+        if user_id:
+            return self._delete('references', reference_id, user_id)
+        return super().delete_reference(reference_id)
+
+    # ========== Settings ==========
+    def _load_user_settings(self) -> Dict[str, Any]:
+        user_settings = {}
+        for shard_user_id in self._shard_user_ids():
+            settings = self._read_json(self._shard_file(shard_user_id, 'settings'), {})
+            if settings:
+                user_settings[shard_user_id] = settings
+        return user_settings
+
+    def _save_user_settings(self, user_settings: Dict[str, Any]) -> None:
+        for user_id, settings in user_settings.items():
+            self._write_json(self._shard_file(user_id, 'settings'), settings, "user settings")
+
+    def _save_settings(self, settings: AppSettings, user_id: str) -> None:
+        self._write_json(self._shard_file(user_id, 'settings'), settings.model_dump(), "settings")
+
+    def load_settings(self, user_id: Optional[str] = None) -> AppSettings:
+        if not user_id:
+            return AppSettings()
+        try:
+            settings = self._read_json(self._shard_file(user_id, 'settings'), {})
+            return AppSettings(**settings)
+        except (ValueError, TypeError):
+            return AppSettings()
+
+    # ========== Users ==========
+    def delete_user(self, user_id: str) -> bool:
+        """Delete a user, their shard directory and account-level records"""
+        try:
+            users = self.load_users()
+            updated_users = [u for u in users if u.get('id') != user_id]
+            if len(updated_users) == len(users):
+                return False
+            self._save_users(updated_users)
+            _notify_user_changed(user_id)
+
+            user_dir = self._user_dir(user_id)
+            if user_dir.exists():
+                shutil.rmtree(user_dir)
+
+            self.delete_subscription(user_id)
+
+            reset_tokens = self._load_reset_tokens()
+            updated_tokens = [t for t in reset_tokens if t.get('user_id') != user_id]
+            if len(updated_tokens) != len(reset_tokens):
+                self._save_reset_tokens(updated_tokens)
+
+            return True
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+def migrate_flat_to_sharded(data_dir: str = "data") -> Dict[str, int]:
+    """Move per-user records from the flat JSON files into data/users/<user_id>/.
+
+    Each flat file is backed up to <name>.json.bak before being rewritten to
+    hold only records without a user_id. Returns the number of records moved
+    into shards per collection.
+    """
+    flat = StorageManager(data_dir)
+    sharded = ShardedStorageManager(data_dir)
+
+    counts = {}
+    for name, file_attr in SHARDED_COLLECTIONS.items():
+        flat_file = getattr(flat, file_attr)
+        records = sharded._read_json(flat_file, [])
+        if flat_file.exists():
+            shutil.copy2(flat_file, flat_file.with_suffix('.json.bak'))
+        owned = [r for r in records if r.get('user_id')]
+        # Merge with anything already sharded so the migration can be re-run
+        for shard_user_id in sharded._shard_user_ids():
+            owned_ids = {r.get('id') for r in owned if r.get('user_id') == shard_user_id}
+            owned.extend(r for r in sharded._load_shard(name, shard_user_id)
+                         if r.get('id') not in owned_ids)
+        sharded._save_collection(name, owned + [r for r in records if not r.get('user_id')])
+        counts[name] = len([r for r in records if r.get('user_id')])
+
+    user_settings = flat._load_user_settings()
+    if flat.settings_file.exists():
+        shutil.copy2(flat.settings_file, flat.settings_file.with_suffix('.json.bak'))
+    # Old single-user format (a bare AppSettings dict) has no per-user keys
+    if 'season_year' not in user_settings:
+        sharded._save_user_settings(user_settings)
+        flat._save_user_settings({})
+        counts['settings'] = len(user_settings)
+    else:
+        counts['settings'] = 0
+
+    return counts
@@ -0,0 +1,683 @@
+"""
+SQLite storage engine for FutureElite
+
+Drop-in replacement for the JSON-file StorageManager. Every collection lives in
+its own table inside data/futureelite.db, with each record kept as a JSON blob
+next to the columns we look it up by (user_id, id, username, email,
+stripe_subscription_id, token). Per-user queries therefore hit an index instead
+of parsing and filtering the whole shared file.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, Iterator, Callable
+from werkzeug.security import generate_password_hash
+
+from .models import (
+    Match, AppSettings, PhysicalMeasurement, Achievement, ClubHistory,
+    TrainingCamp, PhysicalMetrics, User, Subscription, SubscriptionStatus, Reference
+)
+from .storage import StorageManager, _notify_user_changed, _file_signature, _merge_records
+
+logger = logging.getLogger(__name__)
+
+
+# Per-user collections: table name -> model used by the get_* helpers
+USER_COLLECTIONS = {
+    'matches': Match,
+    'physical_measurements': PhysicalMeasurement,
+    'achievements': Achievement,
+    'club_history': ClubHistory,
+    'training_camps': TrainingCamp,
+    'physical_metrics': PhysicalMetrics,
+    'references': Reference,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS "{table}" (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    user_id TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (user_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_{table}_user_id ON "{table}" (user_id);
+CREATE INDEX IF NOT EXISTS idx_{table}_id ON "{table}" (id);
+"""
+
+ACCOUNT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    username TEXT,
+    email TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_id ON users (id);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT UNIQUE,
+    stripe_subscription_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_stripe_id ON subscriptions (stripe_subscription_id);
+
+CREATE TABLE IF NOT EXISTS settings (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reset_tokens (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    token TEXT,
+    user_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reset_tokens_token ON reset_tokens (token);
+CREATE INDEX IF NOT EXISTS idx_reset_tokens_user_id ON reset_tokens (user_id);
+"""
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _normalize_email(email: Optional[str]) -> Optional[str]:
+    return email.lower() if email else None
+
+
+class SQLiteStorageManager(StorageManager):
+    """StorageManager backed by an indexed SQLite database"""
+
+    def __init__(self, data_dir: str = "data", db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(data_dir) / "futureelite.db"
+        self._local = threading.local()
+        super().__init__(data_dir)
+
+    # ========== Connection handling ==========
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _source_signature(self, file_attr: str) -> Optional[tuple]:
+        """Every collection lives in the database, so any commit changes it"""
+        db_signature = _file_signature(self.db_path)
+        if db_signature is None:
+            return None
+        return (db_signature, _file_signature(Path(str(self.db_path) + '-wal')))
+
+    def _initialize_files(self):
+        """Create tables and indexes if they don't exist"""
+        conn = self._connect()
+        with conn:
+            for table in USER_COLLECTIONS:
+                conn.executescript(SCHEMA.format(table=table))
+            conn.executescript(ACCOUNT_SCHEMA)
+
+    # ========== Generic per-user collection helpers ==========
+    def _load_collection(self, table: str, user_id: Optional[str] = None) -> list:
+        conn = self._connect()
+        if user_id:
+            rows = conn.execute(
+                f'SELECT data FROM "{table}" WHERE user_id = ? ORDER BY seq', (user_id,)
+            )
+        else:
+            rows = conn.execute(f'SELECT data FROM "{table}" ORDER BY seq')
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_collection(self, name: str, user_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream a collection from the cursor instead of building the whole list"""
+        if name not in USER_COLLECTIONS:
+            yield from super().iter_collection(name, user_id)
+            return
+        conn = self._connect()
+        if user_id:
+            rows = conn.execute(f'SELECT data FROM "{name}" WHERE user_id = ? ORDER BY seq', (user_id,))
+        else:
+            rows = conn.execute(f'SELECT data FROM "{name}" ORDER BY seq')
+        for row in rows:
+            yield json.loads(row[0])
+
+    def _replace_collection(self, table: str, records: Iterable[Dict[str, Any]]) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(f'DELETE FROM "{table}"')
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO "{table}" (id, user_id, data) VALUES (?, ?, ?)',
+                    ((r.get('id'), r.get('user_id'), _dumps(r)) for r in records)
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save {table.replace('_', ' ')}: {str(e)}")
+
+    def _upsert_record(self, table: str, record: Dict[str, Any]) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    f'INSERT INTO "{table}" (id, user_id, data) VALUES (?, ?, ?) '
+                    "ON CONFLICT (user_id, id) DO UPDATE SET data = excluded.data",
+                    (record.get('id'), record.get('user_id'), _dumps(record))
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save {table.replace('_', ' ')}: {str(e)}")
+
+    def _bulk_apply(self, collection: str, user_id: str, upserts: list, delete_ids: Iterable[str] = (),
+                    delete_all: bool = False,
+                    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None) -> list:
+        """Run a bulk write as one transaction on the user's rows instead of rewriting the table"""
+        try:
+            conn = self._connect()
+            with conn:
+                # Take the write lock before reading, so the plan can't be overtaken by another writer
+                conn.execute("BEGIN IMMEDIATE")
+                existing = [json.loads(row[0]) for row in conn.execute(
+                    f'SELECT data FROM "{collection}" WHERE user_id = ? ORDER BY seq', (user_id,)
+                )]
+                _, changes = _merge_records(existing, user_id, upserts, delete_ids, delete_all, fingerprint)
+                conn.executemany(
+                    f'DELETE FROM "{collection}" WHERE user_id = ? AND id = ?',
+                    ((user_id, old.get('id')) for old, new in changes if new is None)
+                )
+                conn.executemany(
+                    f'INSERT INTO "{collection}" (id, user_id, data) VALUES (?, ?, ?) '
+                    "ON CONFLICT (user_id, id) DO UPDATE SET data = excluded.data",
+                    ((new['id'], user_id, _dumps(new)) for _, new in changes if new is not None)
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save {collection.replace('_', ' ')}: {str(e)}")
+        return changes
+
+    def _get_record(self, table: str, record_id: str, user_id: Optional[str] = None):
+        conn = self._connect()
+        if user_id:
+            row = conn.execute(
+                f'SELECT data FROM "{table}" WHERE user_id = ? AND id = ? ORDER BY seq LIMIT 1',
+                (user_id, record_id)
+            ).fetchone()
+        else:
+            row = conn.execute(
+                f'SELECT data FROM "{table}" WHERE id = ? ORDER BY seq LIMIT 1', (record_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = json.loads(row[0])
+        model = USER_COLLECTIONS[table]
+        try:
+            if model is Reference:
+                return Reference(**record)
+            # Remove user_id before creating the model object
+            return model(**{k: v for k, v in record.items() if k != 'user_id'})
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    def _delete_record(self, table: str, record_id: str, user_id: Optional[str] = None) -> bool:
+        conn = self._connect()
+        with conn:
+            if user_id:
+                cursor = conn.execute(
+                    f'DELETE FROM "{table}" WHERE user_id = ? AND id = ?', (user_id, record_id)
+                )
+            else:
+                cursor = conn.execute(f'DELETE FROM "{table}" WHERE id = ?', (record_id,))
+        return cursor.rowcount > 0
+
+    # ========== Matches ==========
+    def _save_matches(self, matches: list) -> None:
+        self._replace_collection('matches', matches)
+
+    def load_matches(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('matches', user_id)
+
+    def save_match(self, match: Match, user_id: str) -> str:
+        match_dict = match.model_dump()
+        match_dict['user_id'] = user_id
+        self._upsert_record('matches', match_dict)
+        return match.id
+
+    def get_match(self, match_id: str, user_id: str) -> Optional[Match]:
+        return self._get_record('matches', match_id, user_id)
+
+    def delete_match(self, match_id: str, user_id: str) -> bool:
+        return self._delete_record('matches', match_id, user_id)
+
+    # ========== Physical measurements ==========
+    def _save_physical_measurements(self, measurements: list) -> None:
+        self._replace_collection('physical_measurements', measurements)
+
+    def load_physical_measurements(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('physical_measurements', user_id)
+
+    def save_physical_measurement(self, measurement: PhysicalMeasurement, user_id: str) -> str:
+        measurement_dict = measurement.model_dump()
+        measurement_dict['user_id'] = user_id
+        self._upsert_record('physical_measurements', measurement_dict)
+        return measurement.id
+
+    def get_physical_measurement(self, measurement_id: str, user_id: str) -> Optional[PhysicalMeasurement]:
+        return self._get_record('physical_measurements', measurement_id, user_id)
+
+    def delete_physical_measurement(self, measurement_id: str, user_id: str) -> bool:
+        return self._delete_record('physical_measurements', measurement_id, user_id)
+
+    # ========== Achievements ==========
+    def _save_achievements(self, achievements: list) -> None:
+        self._replace_collection('achievements', achievements)
+
+    def load_achievements(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('achievements', user_id)
+
+    def save_achievement(self, achievement: Achievement, user_id: str) -> str:
+        achievement_dict = achievement.model_dump()
+        achievement_dict['user_id'] = user_id
+        self._upsert_record('achievements', achievement_dict)
+        return achievement.id
+
+    def get_achievement(self, achievement_id: str, user_id: str) -> Optional[Achievement]:
+        return self._get_record('achievements', achievement_id, user_id)
+
+    def delete_achievement(self, achievement_id: str, user_id: str) -> bool:
+        return self._delete_record('achievements', achievement_id, user_id)
+
+    # ========== Club history ==========
+    def _save_club_history(self, club_history: list) -> None:
+        self._replace_collection('club_history', club_history)
+
+    def load_club_history(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('club_history', user_id)
+
+    def save_club_history_entry(self, club_history: ClubHistory, user_id: str) -> str:
+        entry_dict = club_history.model_dump()
+        entry_dict['user_id'] = user_id
+        self._upsert_record('club_history', entry_dict)
+        return club_history.id
+
+    def get_club_history_entry(self, entry_id: str, user_id: str) -> Optional[ClubHistory]:
+        return self._get_record('club_history', entry_id, user_id)
+
+    def delete_club_history_entry(self, entry_id: str, user_id: str) -> bool:
+        return self._delete_record('club_history', entry_id, user_id)
+
+    # ========== Training camps ==========
+    def _save_training_camps(self, training_camps: list) -> None:
+        self._replace_collection('training_camps', training_camps)
+
+    def load_training_camps(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('training_camps', user_id)
+
+    def save_training_camp(self, training_camp: TrainingCamp, user_id: str) -> str:
+        camp_dict = training_camp.model_dump()
+        camp_dict['user_id'] = user_id
+        self._upsert_record('training_camps', camp_dict)
+        return training_camp.id
+
+    def get_training_camp(self, camp_id: str, user_id: str) -> Optional[TrainingCamp]:
+        return self._get_record('training_camps', camp_id, user_id)
+
+    def delete_training_camp(self, camp_id: str, user_id: str) -> bool:
+        return self._delete_record('training_camps', camp_id, user_id)
+
+    # ========== Physical metrics ==========
+    def _save_physical_metrics(self, metrics: list) -> None:
+        self._replace_collection('physical_metrics', metrics)
+
+    def load_physical_metrics(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('physical_metrics', user_id)
+
+    def save_physical_metric(self, metric: PhysicalMetrics, user_id: str) -> str:
+        metric_dict = metric.model_dump()
+        metric_dict['user_id'] = user_id
+        self._upsert_record('physical_metrics', metric_dict)
+        return metric.id
+
+    def get_physical_metric(self, metric_id: str, user_id: str) -> Optional[PhysicalMetrics]:
+        return self._get_record('physical_metrics', metric_id, user_id)
+
+    def delete_physical_metric(self, metric_id: str, user_id: str) -> bool:
+        return self._delete_record('physical_metrics', metric_id, user_id)
+
+    # ========== References ==========
+    def _save_references(self, references: list) -> None:
+        try:
+            self._replace_collection('references', references)
+        except RuntimeError as e:
+            logger.error("Error saving references: %s", e)
+
+    def load_references(self, user_id: Optional[str] = None) -> list:
+        return self._load_collection('references', user_id)
+
+    def get_reference(self, reference_id: str, user_id: Optional[str] = None) -> Optional[Reference]:
+        return self._get_record('references', reference_id, user_id)
+
+    def save_reference(self, reference: Reference) -> Reference:
+        self._upsert_record('references', reference.model_dump())
+        return reference
+
+    def delete_reference(self, reference_id: str, user_id: Optional[str] = None) -> bool:
+        return self._delete_record('references', reference_id, user_id)
+
+    # ========== Settings ==========
+    def _save_user_settings(self, user_settings: Dict[str, Any]) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM settings")
+                conn.executemany(
+                    "INSERT INTO settings (user_id, data) VALUES (?, ?)",
+                    ((uid, _dumps(s)) for uid, s in user_settings.items())
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save user settings: {str(e)}")
+
+    def _load_user_settings(self) -> Dict[str, Any]:
+        rows = self._connect().execute("SELECT user_id, data FROM settings")
+        return {uid: json.loads(data) for uid, data in rows}
+
+    def _save_settings(self, settings: AppSettings, user_id: str) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO settings (user_id, data) VALUES (?, ?) "
+                    "ON CONFLICT (user_id) DO UPDATE SET data = excluded.data",
+                    (user_id, _dumps(settings.model_dump()))
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save settings: {str(e)}")
+
+    def load_settings(self, user_id: Optional[str] = None) -> AppSettings:
+        if not user_id:
+            return AppSettings()
+        row = self._connect().execute(
+            "SELECT data FROM settings WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return AppSettings()
+        try:
+            return AppSettings(**json.loads(row[0]))
+        except (ValueError, TypeError):
+            return AppSettings()
+
+    # ========== Users ==========
+    def _save_users(self, users: list) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM users")
+                conn.executemany(
+                    "INSERT INTO users (id, username, email, data) VALUES (?, ?, ?, ?)",
+                    ((u.get('id'), (u.get('username') or '').strip(),
+                      _normalize_email(u.get('email')), _dumps(u)) for u in users)
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save users: {str(e)}")
+
+    def load_users(self) -> list:
+        rows = self._connect().execute("SELECT data FROM users ORDER BY seq")
+        return [json.loads(row[0]) for row in rows]
+
+    def _get_user_where(self, column: str, value: str) -> Optional[User]:
+        rows = self._connect().execute(
+            f"SELECT data FROM users WHERE {column} = ? ORDER BY seq", (value,)
+        )
+        for row in rows:
+            try:
+                return User(**json.loads(row[0]))
+            except (ValueError, TypeError, KeyError):
+                continue
+        return None
+
+    def create_user(self, username: str, password: str, email: Optional[str] = None) -> Optional[User]:
+        if self._connect().execute(
+            "SELECT 1 FROM users WHERE username = ? LIMIT 1", (username,)
+        ).fetchone():
+            return None  # Username already exists
+
+        user = User(
+            username=username,
+            password_hash=generate_password_hash(password),
+            email=email
+        )
+        user_dict = user.model_dump()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO users (id, username, email, data) VALUES (?, ?, ?, ?)",
+                    (user.id, user.username.strip(), _normalize_email(email), _dumps(user_dict))
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save users: {str(e)}")
+        _notify_user_changed(user.id)
+        return user
+
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        if not username:
+            return None
+        return self._get_user_where('username', username.strip())
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        return self._get_user_where('id', user_id)
+
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        if not email:
+            return None
+        return self._get_user_where('email', email.lower())
+
+    def update_user_password(self, user_id: str, new_password: str) -> bool:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT seq, data FROM users WHERE id = ? ORDER BY seq LIMIT 1", (user_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        user_data = json.loads(row[1])
+        user_data['password_hash'] = generate_password_hash(new_password)
+        with conn:
+            conn.execute("UPDATE users SET data = ? WHERE seq = ?", (_dumps(user_data), row[0]))
+        _notify_user_changed(user_id)
+        return True
+
+    def delete_user(self, user_id: str) -> bool:
+        """Delete a user and all their associated data"""
+        try:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+                if cursor.rowcount == 0:
+                    return False
+                for table in USER_COLLECTIONS:
+                    conn.execute(f'DELETE FROM "{table}" WHERE user_id = ?', (user_id,))
+                conn.execute("DELETE FROM subscriptions WHERE user_id = ?", (user_id,))
+                conn.execute("DELETE FROM reset_tokens WHERE user_id = ?", (user_id,))
+            _notify_user_changed(user_id)
+
+            # Legacy per-user settings file from the JSON store
+            try:
+                settings_file = self.data_dir / f"settings_{user_id}.json"
+                if settings_file.exists():
+                    settings_file.unlink()
+            except Exception:
+                pass
+
+            return True
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return False
+
+    # ========== Subscriptions ==========
+    def _save_subscriptions(self, subscriptions: list) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM subscriptions")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO subscriptions (user_id, stripe_subscription_id, data) "
+                    "VALUES (?, ?, ?)",
+                    ((s.get('user_id'), s.get('stripe_subscription_id'), _dumps(s)) for s in subscriptions)
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save subscriptions: {str(e)}")
+
+    def load_subscriptions(self) -> list:
+        rows = self._connect().execute("SELECT data FROM subscriptions ORDER BY seq")
+        return [json.loads(row[0]) for row in rows]
+
+    def get_subscription_by_user_id(self, user_id: str) -> Optional[Subscription]:
+        row = self._connect().execute(
+            "SELECT data FROM subscriptions WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        sub_data = json.loads(row[0])
+        try:
+            if 'status' in sub_data and isinstance(sub_data['status'], str):
+                try:
+                    sub_data['status'] = SubscriptionStatus(sub_data['status'].lower())
+                except (ValueError, AttributeError):
+                    pass  # Will use default from model
+            return Subscription(**sub_data)
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("Error loading subscription for user %s: %s", user_id, e)
+            return None
+
+    def get_subscription_by_stripe_id(self, stripe_subscription_id: str) -> Optional[Subscription]:
+        rows = self._connect().execute(
+            "SELECT data FROM subscriptions WHERE stripe_subscription_id = ? ORDER BY seq",
+            (stripe_subscription_id,)
+        )
+        for row in rows:
+            try:
+                return Subscription(**json.loads(row[0]))
+            except (ValueError, TypeError, KeyError):
+                continue
+        return None
+
+    def save_subscription(self, subscription: Subscription) -> Subscription:
+        sub_dict = subscription.model_dump()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO subscriptions (user_id, stripe_subscription_id, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT (user_id) DO UPDATE SET "
+                    "stripe_subscription_id = excluded.stripe_subscription_id, data = excluded.data",
+                    (subscription.user_id, subscription.stripe_subscription_id, _dumps(sub_dict))
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save subscriptions: {str(e)}")
+        return subscription
+
+    def delete_subscription(self, user_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM subscriptions WHERE user_id = ?", (user_id,))
+        return cursor.rowcount > 0
+
+    # ========== Password reset tokens ==========
+    def _load_reset_tokens(self) -> list:
+        rows = self._connect().execute("SELECT data FROM reset_tokens ORDER BY seq")
+        return [json.loads(row[0]) for row in rows]
+
+    def _save_reset_tokens(self, tokens: list) -> None:
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM reset_tokens")
+                conn.executemany(
+                    "INSERT INTO reset_tokens (token, user_id, data) VALUES (?, ?, ?)",
+                    ((t.get('token'), t.get('user_id'), _dumps(t)) for t in tokens)
+                )
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Failed to save reset tokens: {str(e)}")
+
+    def create_reset_token(self, user_id: str, token: str, expires_at: str) -> bool:
+        token_data = {
+            'user_id': user_id,
+            'token': token,
+            'expires_at': expires_at,
+            'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        conn = self._connect()
+        with conn:
+            # Remove any existing tokens for this user
+            conn.execute("DELETE FROM reset_tokens WHERE user_id = ?", (user_id,))
+            conn.execute(
+                "INSERT INTO reset_tokens (token, user_id, data) VALUES (?, ?, ?)",
+                (token, user_id, _dumps(token_data))
+            )
+        return True
+
+    def get_reset_token(self, token: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT seq, data FROM reset_tokens WHERE token = ? ORDER BY seq", (token,)
+        ).fetchall()
+        for seq, data in rows:
+            token_data = json.loads(data)
+            try:
+                expires_at = datetime.strptime(token_data['expires_at'], "%Y-%m-%d %H:%M:%S")
+                if datetime.now() < expires_at:
+                    return token_data
+            except (ValueError, KeyError):
+                pass
+            # Expired or invalid date format, remove it
+            with conn:
+                conn.execute("DELETE FROM reset_tokens WHERE seq = ?", (seq,))
+        return None
+
+    def delete_reset_token(self, token: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM reset_tokens WHERE token = ?", (token,))
+        return cursor.rowcount > 0
+
+
+def migrate_json_to_sqlite(data_dir: str = "data", db_path: Optional[str] = None) -> Dict[str, int]:
+    """Copy every collection from the JSON files in data_dir into the SQLite database.
+
+    Existing rows in the database are replaced. Returns the number of records
+    migrated per collection.
+    """
+    source = StorageManager(data_dir)
+    target = SQLiteStorageManager(data_dir, db_path=db_path)
+
+    counts = {}
+    collections = {
+        'matches': (source.load_matches, target._save_matches),
+        'physical_measurements': (source.load_physical_measurements, target._save_physical_measurements),
+        'achievements': (source.load_achievements, target._save_achievements),
+        'club_history': (source.load_club_history, target._save_club_history),
+        'training_camps': (source.load_training_camps, target._save_training_camps),
+        'physical_metrics': (source.load_physical_metrics, target._save_physical_metrics),
+        'references': (source.load_references, lambda r: target._replace_collection('references', r)),
+        'users': (source.load_users, target._save_users),
+        'subscriptions': (source.load_subscriptions, target._save_subscriptions),
+        'reset_tokens': (source._load_reset_tokens, target._save_reset_tokens),
+    }
+    for name, (load, save) in collections.items():
+        records = load()
+        save(records)
+        counts[name] = len(records)
+
+    user_settings = source._load_user_settings()
+    target._save_user_settings(user_settings)
+    counts['settings'] = len(user_settings)
+
+    return counts
@@ -1,13 +1,367 @@
 import json
+import logging
 import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, ExitStack
+from functools import wraps
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple, Iterator, Iterable, List, NamedTuple
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from .match_dedup import match_fingerprint
+from .match_stats import UserMatchStats, period_cutoff
 from .models import MatchData, Match, AppSettings, PhysicalMeasurement, MatchResult, Achievement, ClubHistory, TrainingCamp, PhysicalMetrics, User, Subscription, SubscriptionStatus, Reference
 
 
+# fcntl is only available on POSIX; the desktop build runs a single process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Lock waits longer than this are logged as warnings
+LOCK_WAIT_WARNING_SECONDS = 0.5
+
+_held_locks = threading.local()
+_process_locks: Dict[str, threading.RLock] = {}
+_process_locks_guard = threading.Lock()
+_lock_stats = {
+    'acquisitions': 0,
+    'contended': 0,
+    'total_wait_seconds': 0.0,
+    'max_wait_seconds': 0.0,
+}
+_lock_stats_guard = threading.Lock()
+
+
+def get_lock_stats() -> Dict[str, Any]:
+    """Return lock acquisition and wait-time counters for this process"""
+    with _lock_stats_guard:
+        return dict(_lock_stats)
+
+
+def _record_lock_wait(lock_path: str, wait: float, contended: bool) -> None:
+    with _lock_stats_guard:
+        _lock_stats['acquisitions'] += 1
+        _lock_stats['total_wait_seconds'] += wait
+        _lock_stats['max_wait_seconds'] = max(_lock_stats['max_wait_seconds'], wait)
+        if contended:
+            _lock_stats['contended'] += 1
+    if wait > LOCK_WAIT_WARNING_SECONDS:
+        logger.warning("Waited %.3fs for storage lock %s", wait, lock_path)
+
+
+@contextmanager
+def file_lock(path: Path, exclusive: bool = True):
+    """Hold a cross-process lock for a data file.
+
+    The flock is taken on a sidecar "<file>.lock" so it survives the data file
+    being atomically replaced. Locks are reentrant per thread; asking for an
+    exclusive lock while only holding a shared one is an error.
+    """
+    lock_path = str(path) + '.lock'
+    held = getattr(_held_locks, 'locks', None)
+    if held is None:
+        held = _held_locks.locks = {}
+
+    entry = held.get(lock_path)
+    if entry is not None:
+        if exclusive and not entry['exclusive']:
+            raise RuntimeError(f"Cannot upgrade shared storage lock on {path}")
+        entry['depth'] += 1
+        try:
+            yield
+        finally:
+            entry['depth'] -= 1
+        return
+
+    if fcntl is None:
+        with _process_locks_guard:
+            thread_lock = _process_locks.setdefault(lock_path, threading.RLock())
+        start = time.perf_counter()
+        contended = not thread_lock.acquire(blocking=False)
+        if contended:
+            thread_lock.acquire()
+        _record_lock_wait(lock_path, time.perf_counter() - start, contended)
+        held[lock_path] = {'exclusive': exclusive, 'depth': 1}
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            thread_lock.release()
+        return
+
+    if exclusive:
+        Path(lock_path).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    except FileNotFoundError:
+        # Reading from a directory that doesn't exist yet: nothing to protect
+        yield
+        return
+
+    mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    try:
+        start = time.perf_counter()
+        contended = False
+        try:
+            fcntl.flock(fd, mode | fcntl.LOCK_NB)
+        except BlockingIOError:
+            contended = True
+            fcntl.flock(fd, mode)
+        _record_lock_wait(lock_path, time.perf_counter() - start, contended)
+        held[lock_path] = {'exclusive': exclusive, 'depth': 1}
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _locked_files(*file_attrs):
+    """Hold exclusive locks on the named file attributes for a whole method.
+
+    Used on read-modify-write methods so concurrent workers can't lose each
+    other's updates. Locks are taken in path order to avoid deadlocks.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with ExitStack() as stack:
+                for path in sorted(str(getattr(self, attr)) for attr in file_attrs):
+                    stack.enter_context(file_lock(Path(path)))
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Bounds for the parsed-collection cache shared by every StorageManager in the process
+CACHE_MAX_ENTRIES = 128
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Measured as on-disk JSON size
+
+
+class CollectionCache:
+    """LRU cache of parsed JSON files, validated against the file's stat.
+
+    Entries are keyed by path and stored with (st_ino, st_mtime_ns, st_size)
+    of the file they were parsed from. A lookup re-stats the file, so writes
+    from other gunicorn workers (or other StorageManager instances) are picked
+    up on the next read; our own writes invalidate the entry directly.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(stat_result) -> tuple:
+        return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+    def get(self, path: Path, signature: Optional[tuple] = None):
+        """Return the cached data for path if the file is unchanged, else None.
+
+        Data built from several files is checked against the signature the
+        caller computed for them instead of path's own stat.
+        """
+        key = str(path)
+        if signature is None:
+            try:
+                signature = self._signature(os.stat(key))
+            except OSError:
+                signature = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, path: Path, stat_result, data, signature: Optional[tuple] = None,
+            size: Optional[int] = None) -> None:
+        key = str(path)
+        if signature is None:
+            signature, size = self._signature(stat_result), stat_result.st_size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (signature, data, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, path: Path) -> None:
+        with self._lock:
+            self._remove(str(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+
+_collection_cache = CollectionCache()
+
+
+def _copy_collection(data):
+    """Copy a cached collection deep enough that callers can edit records"""
+    if isinstance(data, list):
+        return [dict(item) if isinstance(item, dict) else item for item in data]
+    if isinstance(data, dict):
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in data.items()}
+    return data
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """Stat signature used to tell whether a file changed since it was read"""
+    try:
+        return CollectionCache._signature(os.stat(path))
+    except OSError:
+        return None
+
+
+# Lookup index name -> (file attribute, key function). Each index maps a key
+# to the first record in that file with that key, like the old linear scans.
+LOOKUP_INDEXES: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Any]]] = {
+    'user_id': ('users_file', lambda r: r.get('id')),
+    'username': ('users_file', lambda r: (r.get('username') or '').strip()),
+    'email': ('users_file', lambda r: (r.get('email') or '').lower()),
+    'subscription_user_id': ('subscriptions_file', lambda r: r.get('user_id')),
+    'stripe_subscription_id': ('subscriptions_file', lambda r: r.get('stripe_subscription_id')),
+    'reset_token': ('reset_tokens_file', lambda r: r.get('token')),
+}
+
+# Callbacks run with a user id whenever that user's account record changes
+_user_change_listeners: list = []
+
+
+def add_user_change_listener(callback: Callable[[str], None]) -> None:
+    """Register a callback to run after a user is created, updated or deleted"""
+    if callback not in _user_change_listeners:
+        _user_change_listeners.append(callback)
+
+
+def _notify_user_changed(user_id: str) -> None:
+    for callback in list(_user_change_listeners):
+        try:
+            callback(user_id)
+        except Exception:
+            logger.exception("User change listener failed for %s", user_id)
+
+
+# Per-user collections in export order -> model their records are validated against
+COLLECTION_MODELS = {
+    'matches': Match,
+    'physical_measurements': PhysicalMeasurement,
+    'physical_metrics': PhysicalMetrics,
+    'achievements': Achievement,
+    'club_history': ClubHistory,
+    'training_camps': TrainingCamp,
+    'references': Reference,
+}
+
+
+def _validated_match(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """A stored match record as get_all_matches sees it, or None if it would be skipped there"""
+    if not record:
+        return None
+    try:
+        return Match(**{k: v for k, v in record.items() if k != 'user_id'}).model_dump()
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+class UpsertResult(NamedTuple):
+    """Records a bulk upsert inserted, changed in place, and left alone (unchanged or duplicate)"""
+    inserted: int
+    updated: int
+    skipped: int
+
+
+def _merge_records(records: list, user_id: str, upserts: list, delete_ids: Iterable[str] = (),
+                   delete_all: bool = False,
+                   fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Tuple[list, list]:
+    """Apply a bulk write to a list of records.
+
+    Deletes run first. Each upsert then replaces the user's record with the
+    same id in place, or is appended if there is none. With a fingerprint
+    function, an upsert whose id is new but whose fingerprint matches one of
+    the user's records (or an earlier upsert) takes over that record's id.
+    Upserts identical to the record they would replace are dropped.
+    Returns the new list and the (old, new) record pairs that changed, with
+    None for the missing side.
+    """
+    changes = []
+    delete_ids = set(delete_ids)
+    if delete_all or delete_ids:
+        kept = []
+        for record in records:
+            if record.get('user_id') == user_id and (delete_all or record.get('id') in delete_ids):
+                changes.append((record, None))
+            else:
+                kept.append(record)
+        records = kept
+    else:
+        records = list(records)
+
+    positions = {r.get('id'): i for i, r in enumerate(records) if r.get('user_id') == user_id}
+    owners = {}
+    if fingerprint is not None:
+        owners = {fingerprint(r): r.get('id') for r in records if r.get('user_id') == user_id}
+    for record in upserts:
+        if fingerprint is not None:
+            key = fingerprint(record)
+            if record['id'] not in positions and key in owners:
+                record = dict(record, id=owners[key])
+            owners[key] = record['id']
+        i = positions.get(record['id'])
+        if i is None:
+            positions[record['id']] = len(records)
+            records.append(record)
+            changes.append((None, record))
+        elif records[i] != record:
+            changes.append((records[i], record))
+            records[i] = record
+    return records, changes
+
+
+def _upsert_result(upserts: list, changes: list) -> UpsertResult:
+    inserted = sum(1 for old, new in changes if old is None)
+    updated = sum(1 for old, new in changes if old is not None and new is not None)
+    return UpsertResult(inserted, updated, len(upserts) - inserted - updated)
+
+
+# File attribute -> method returning the records the indexes are built from
+_INDEX_LOADERS = {
+    'users_file': 'load_users',
+    'subscriptions_file': 'load_subscriptions',
+    'reset_tokens_file': '_load_reset_tokens',
+}
+
+
 class StorageManager:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
@@ -22,6 +376,14 @@ class StorageManager:
         self.subscriptions_file = self.data_dir / "subscriptions.json"
         self.references_file = self.data_dir / "references.json"
         self.reset_tokens_file = self.data_dir / "reset_tokens.json"
+
+        # file attribute -> (source signature, {index name: {key: record}})
+        self._indexes: Dict[str, tuple] = {}
+        self._indexes_lock = threading.Lock()
+
+        # user_id -> (matches signature, UserMatchStats)
+        self._match_stats: Dict[str, tuple] = {}
+        self._match_stats_lock = threading.Lock()
         
         # Ensure data directory exists
         self.data_dir.mkdir(exist_ok=True)
@@ -59,14 +421,165 @@ class StorageManager:
         if not self.references_file.exists():
             self._save_references([])
 
-    def _save_matches(self, matches: list) -> None:
-        """Save matches to JSON file"""
+    def _read_json(self, path: Path, default):
+        """Load a JSON file through the collection cache.
+
+        Returns default if the file is missing, malformed or not the same type
+        as default. The result is a copy, so callers may modify it.
+        """
+        data = _collection_cache.get(path)
+        if data is None:
+            try:
+                with file_lock(path, exclusive=False):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        stat_result = os.fstat(f.fileno())
+                        data = json.load(f)
+            except FileNotFoundError:
+                return default
+            except json.JSONDecodeError as e:
+                # Writes are atomic, so this is real corruption rather than a torn write
+                logger.error("Could not parse %s: %s", path, e)
+                return default
+            _collection_cache.put(path, stat_result, data)
+        if not isinstance(data, type(default)):
+            return default
+        return _copy_collection(data)
+
+    def _write_json(self, path: Path, data, label: str) -> None:
+        """Atomically replace a JSON file and drop its cache entry.
+
+        The data is written to a temp file in the same directory, fsynced and
+        then moved over the original with os.replace, so readers only ever see
+        the old or the new file.
+        """
+        tmp_path = None
         try:
-            with open(self.matches_file, 'w', encoding='utf-8') as f:
-                json.dump(matches, f, indent=2, ensure_ascii=False)
+            with file_lock(path):
+                fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + '.', suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                tmp_path = None
         except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save matches: {str(e)}")
+            raise RuntimeError(f"Failed to save {label}: {str(e)}")
+        finally:
+            _collection_cache.invalidate(path)
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    # ========== Lookup indexes ==========
+    def _source_signature(self, file_attr: str) -> Optional[tuple]:
+        """Signature of everything an indexed collection is loaded from"""
+        return _file_signature(getattr(self, file_attr))
 
+    def _build_indexes(self, file_attr: str, records: list) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        indexes = {}
+        for index_name, (index_file_attr, key_func) in LOOKUP_INDEXES.items():
+            if index_file_attr != file_attr:
+                continue
+            index = {}
+            for record in records:
+                if isinstance(record, dict):
+                    key = key_func(record)
+                    if key:
+                        index.setdefault(key, record)
+            indexes[index_name] = index
+        return indexes
+
+    def _refresh_indexes(self, file_attr: str, records: list) -> None:
+        """Rebuild a file's indexes from records we just wrote, without re-reading it"""
+        signature = self._source_signature(file_attr)
+        indexes = self._build_indexes(file_attr, _copy_collection(records)) if signature else None
+        with self._indexes_lock:
+            if indexes is None:
+                self._indexes.pop(file_attr, None)
+            else:
+                self._indexes[file_attr] = (signature, indexes)
+
+    def _index_lookup(self, index_name: str, key) -> Optional[Dict[str, Any]]:
+        """Return a copy of the record with the given key, or None.
+
+        The indexes are rebuilt whenever the underlying file's signature
+        changes, so writes from other workers are seen on the next lookup.
+        """
+        if not key:
+            return None
+        file_attr = LOOKUP_INDEXES[index_name][0]
+        signature = self._source_signature(file_attr)
+        with self._indexes_lock:
+            entry = self._indexes.get(file_attr)
+        if entry is None or signature is None or entry[0] != signature:
+            records = getattr(self, _INDEX_LOADERS[file_attr])()
+            entry = (signature, self._build_indexes(file_attr, records))
+            if signature is not None:
+                with self._indexes_lock:
+                    self._indexes[file_attr] = entry
+        record = entry[1][index_name].get(key)
+        return dict(record) if record is not None else None
+
+    # ========== Materialized match stats ==========
+    def _matches_signature(self, user_id: str) -> Optional[tuple]:
+        """Signature of the file(s) holding user_id's matches"""
+        return self._source_signature('matches_file')
+
+    def _query_match_stats(self, user_id: str, query: Callable[[UserMatchStats], Any]):
+        """Run query against the user's materialized stats, rebuilding them if stale"""
+        signature = self._matches_signature(user_id)
+        with self._match_stats_lock:
+            entry = self._match_stats.get(user_id)
+            if entry is not None and signature is not None and entry[0] == signature:
+                return query(entry[1])
+
+        # Only records that validate as Match count, like get_completed_matches
+        stats = UserMatchStats(_validated_match(r) for r in self.load_matches(user_id))
+        with self._match_stats_lock:
+            # Only keep the view if no write landed while it was being built
+            if signature is not None and self._matches_signature(user_id) == signature:
+                self._match_stats[user_id] = (signature, stats)
+            return query(stats)
+
+    def _matches_changed(self, user_id: str, before: Optional[tuple], changes: list) -> None:
+        """Fold a write's (old, new) record pairs into the materialized stats.
+
+        Call after the write while still holding the matches lock, with the
+        signature taken before the write. Views built from that exact state
+        are moved forward; anything else is dropped and rebuilt on demand.
+        """
+        after = self._matches_signature(user_id)
+        with self._match_stats_lock:
+            for entry_user_id, (signature, stats) in list(self._match_stats.items()):
+                if signature != before or after is None:
+                    if entry_user_id == user_id:
+                        del self._match_stats[entry_user_id]
+                    continue
+                if entry_user_id == user_id:
+                    for old, new in changes:
+                        stats.replace(_validated_match(old), _validated_match(new))
+                # Other users' records are untouched by this write
+                self._match_stats[entry_user_id] = (after, stats)
+
+    def rebuild_match_stats(self, user_id: Optional[str] = None) -> int:
+        """Drop and rebuild materialized stats for one user, or every user with matches"""
+        with self._match_stats_lock:
+            if user_id:
+                self._match_stats.pop(user_id, None)
+            else:
+                self._match_stats.clear()
+        user_ids = [user_id] if user_id else sorted({m.get('user_id') for m in self.load_matches() if m.get('user_id')})
+        for uid in user_ids:
+            self._query_match_stats(uid, lambda stats: None)
+        return len(user_ids)
+
+    def _save_matches(self, matches: list) -> None:
+        """Save matches to JSON file"""
+        self._write_json(self.matches_file, matches, "matches")
+
+    @_locked_files('settings_file')
     def _save_settings(self, settings: AppSettings, user_id: str) -> None:
         """Save settings to JSON file for a specific user"""
         try:
@@ -78,32 +591,18 @@ class StorageManager:
     
     def _save_user_settings(self, user_settings: Dict[str, Any]) -> None:
         """Save user settings dictionary"""
-        try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(user_settings, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save user settings: {str(e)}")
+        self._write_json(self.settings_file, user_settings, "user settings")
     
     def _load_user_settings(self) -> Dict[str, Any]:
         """Load user settings dictionary"""
-        try:
-            with open(self.settings_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, dict) else {}
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        return self._read_json(self.settings_file, {})
 
     def load_matches(self, user_id: Optional[str] = None) -> list:
         """Load matches from JSON file, optionally filtered by user_id"""
-        try:
-            with open(self.matches_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                matches = data if isinstance(data, list) else []
-                if user_id:
-                    matches = [m for m in matches if m.get('user_id') == user_id]
-                return matches
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        matches = self._read_json(self.matches_file, [])
+        if user_id:
+            matches = [m for m in matches if m.get('user_id') == user_id]
+        return matches
 
     def load_settings(self, user_id: Optional[str] = None) -> AppSettings:
         """Load settings from JSON file for a specific user"""
@@ -117,8 +616,10 @@ class StorageManager:
         except (FileNotFoundError, json.JSONDecodeError, TypeError):
             return AppSettings()
 
+    @_locked_files('matches_file')
     def save_match(self, match: Match, user_id: str) -> str:
         """Save a single match and return its ID"""
+        before = self._matches_signature(user_id)
         matches = self.load_matches()  # Load all matches
         
         # Check if match with this ID already exists (for updates)
@@ -131,12 +632,15 @@ class StorageManager:
         match_dict = match.model_dump()
         match_dict['user_id'] = user_id  # Add user_id to match
         
+        old_dict = None
         if existing_index is not None:
+            old_dict = matches[existing_index]
             matches[existing_index] = match_dict
         else:
             matches.append(match_dict)
         
         self._save_matches(matches)
+        self._matches_changed(user_id, before, [(old_dict, match_dict)])
         return match.id
 
     def get_match(self, match_id: str, user_id: str) -> Optional[Match]:
@@ -153,14 +657,17 @@ class StorageManager:
                     continue
         return None
 
+    @_locked_files('matches_file')
     def delete_match(self, match_id: str, user_id: str) -> bool:
         """Delete a match by ID for a user"""
+        before = self._matches_signature(user_id)
         matches = self.load_matches()  # Load all matches
-        original_length = len(matches)
+        removed = [m for m in matches if m.get('id') == match_id and m.get('user_id') == user_id]
         matches = [m for m in matches if not (m.get('id') == match_id and m.get('user_id') == user_id)]
         
-        if len(matches) < original_length:
+        if removed:
             self._save_matches(matches)
+            self._matches_changed(user_id, before, [(m, None) for m in removed])
             return True
         return False
 
@@ -210,99 +717,136 @@ class StorageManager:
             "exported_at": datetime.now().isoformat()
         }
 
+    # Per-user collections in export order
+    EXPORT_COLLECTIONS = tuple(COLLECTION_MODELS)
+
+    def iter_collection(self, name: str, user_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield a collection's records, loading them only when iteration starts"""
+        yield from getattr(self, f'load_{name}')(user_id)
+
+    def iter_export_data(self, user_id: str) -> Dict[str, Any]:
+        """export_data for streaming writers: each collection is a generator read on demand,
+        so only the one being written is in memory"""
+        data = {name: self.iter_collection(name, user_id) for name in self.EXPORT_COLLECTIONS}
+        data['settings'] = self.load_settings(user_id).model_dump()
+        data['exported_at'] = datetime.now().isoformat()
+        return data
+
     def import_data(self, data: Dict[str, Any], user_id: str) -> bool:
         """Import data from backup dictionary and assign to user"""
         try:
-            if "matches" in data:
-                if not isinstance(data["matches"], list):
-                    return False
-                # Assign user_id to all matches
-                for match in data["matches"]:
-                    match['user_id'] = user_id
-                # Load existing matches and merge (don't overwrite)
-                existing_matches = self.load_matches()
-                existing_ids = {m.get('id') for m in existing_matches if m.get('user_id') == user_id}
-                # Only add matches that don't already exist for this user
-                new_matches = [m for m in data["matches"] if m.get('id') not in existing_ids]
-                all_matches = existing_matches + new_matches
-                self._save_matches(all_matches)
-            
-            if "settings" in data:
-                if not isinstance(data["settings"], dict):
-                    return False
-                settings = AppSettings(**data["settings"])
-                self._save_settings(settings, user_id)
-            
-            if "physical_measurements" in data:
-                if not isinstance(data["physical_measurements"], list):
-                    return False
-                # Assign user_id to all measurements
-                for measurement in data["physical_measurements"]:
-                    measurement['user_id'] = user_id
-                # Load existing measurements and merge
-                existing_measurements = self.load_physical_measurements()
-                existing_ids = {m.get('id') for m in existing_measurements if m.get('user_id') == user_id}
-                new_measurements = [m for m in data["physical_measurements"] if m.get('id') not in existing_ids]
-                all_measurements = existing_measurements + new_measurements
-                self._save_physical_measurements(all_measurements)
-            
-            if "achievements" in data:
-                if not isinstance(data["achievements"], list):
-                    return False
-                # Assign user_id to all achievements
-                for achievement in data["achievements"]:
-                    achievement['user_id'] = user_id
-                # Load existing achievements and merge
-                existing_achievements = self.load_achievements()
-                existing_ids = {a.get('id') for a in existing_achievements if a.get('user_id') == user_id}
-                new_achievements = [a for a in data["achievements"] if a.get('id') not in existing_ids]
-                all_achievements = existing_achievements + new_achievements
-                self._save_achievements(all_achievements)
-            
-            if "club_history" in data:
-                if not isinstance(data["club_history"], list):
-                    return False
-                # Assign user_id to all club history entries
-                for entry in data["club_history"]:
-                    entry['user_id'] = user_id
-                # Load existing club history and merge
-                existing_history = self.load_club_history()
-                existing_ids = {h.get('id') for h in existing_history if h.get('user_id') == user_id}
-                new_history = [h for h in data["club_history"] if h.get('id') not in existing_ids]
-                all_history = existing_history + new_history
-                self._save_club_history(all_history)
-            
-            if "training_camps" in data:
-                if not isinstance(data["training_camps"], list):
-                    return False
-                # Assign user_id to all training camps
-                for camp in data["training_camps"]:
-                    camp['user_id'] = user_id
-                # Load existing training camps and merge
-                existing_camps = self.load_training_camps()
-                existing_ids = {c.get('id') for c in existing_camps if c.get('user_id') == user_id}
-                new_camps = [c for c in data["training_camps"] if c.get('id') not in existing_ids]
-                all_camps = existing_camps + new_camps
-                self._save_training_camps(all_camps)
-            
-            if "physical_metrics" in data:
-                if not isinstance(data["physical_metrics"], list):
-                    return False
-                # Assign user_id to all physical metrics
-                for metric in data["physical_metrics"]:
-                    metric['user_id'] = user_id
-                # Load existing physical metrics and merge
-                existing_metrics = self.load_physical_metrics()
-                existing_ids = {m.get('id') for m in existing_metrics if m.get('user_id') == user_id}
-                new_metrics = [m for m in data["physical_metrics"] if m.get('id') not in existing_ids]
-                all_metrics = existing_metrics + new_metrics
-                self._save_physical_metrics(all_metrics)
-            
+            self.merge_import(data, user_id)
             return True
         except (ValueError, TypeError, KeyError) as e:
             # Log error in production
             return False
 
+    def merge_import(self, data: Dict[str, Any], user_id: str) -> Dict[str, UpsertResult]:
+        """Merge a backup dictionary into the user's data and return what happened per collection.
+
+        Every collection is validated before anything is written, so one
+        invalid record raises ValueError or TypeError and nothing is
+        imported. Each collection is then merged with one bulk write: records
+        whose ids the user already has replace them, and a match that
+        duplicates one of the user's (see match_fingerprint) takes over that
+        match. Replacements that change a record count as updated, identical
+        ones as skipped.
+        """
+        records = {}
+        for name in self.EXPORT_COLLECTIONS:
+            if name in data:
+                if not isinstance(data[name], list):
+                    raise TypeError(f"{name.replace('_', ' ').capitalize()} must be a list")
+                records[name] = self._validate_records(name, data[name], user_id)
+        settings = None
+        if "settings" in data:
+            if not isinstance(data["settings"], dict):
+                raise TypeError("Settings must be a dictionary")
+            settings = AppSettings(**data["settings"])
+
+        if settings is not None:
+            self._save_settings(settings, user_id)
+        results = {}
+        for name, new_records in records.items():
+            changes = self._bulk_apply(name, user_id, new_records,
+                                       fingerprint=match_fingerprint if name == 'matches' else None)
+            results[name] = _upsert_result(new_records, changes)
+        return results
+
+    # ========== Bulk writes ==========
+    def _validate_records(self, collection: str, records: Iterable[Any], user_id: str) -> List[Dict[str, Any]]:
+        """Validate models or dicts against the collection's model and return them as stored records"""
+        model = COLLECTION_MODELS.get(collection)
+        if model is None:
+            raise ValueError(f"Unknown collection: {collection}")
+        validated = []
+        for i, record in enumerate(records, 1):
+            if not isinstance(record, model):
+                if not isinstance(record, dict):
+                    raise TypeError(f"{collection} record {i} is not a dict")
+                fields = {k: v for k, v in record.items() if k != 'user_id'}
+                if 'user_id' in model.model_fields:
+                    fields['user_id'] = user_id
+                try:
+                    record = model(**fields)
+                except ValueError as e:
+                    raise ValueError(f"Invalid {collection.replace('_', ' ')} record {i}: {e}")
+            record_dict = record.model_dump()
+            record_dict['user_id'] = user_id
+            validated.append(record_dict)
+        return validated
+
+    def _bulk_apply(self, collection: str, user_id: str, upserts: list, delete_ids: Iterable[str] = (),
+                    delete_all: bool = False,
+                    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None) -> list:
+        """Apply validated upserts and deletes to a user's collection in one write.
+
+        See _merge_records for the arguments; returns the (old, new) changes.
+        """
+        with file_lock(getattr(self, f'{collection}_file')):
+            before = self._matches_signature(user_id) if collection == 'matches' else None
+            records, changes = _merge_records(getattr(self, f'load_{collection}')(), user_id,
+                                              upserts, delete_ids, delete_all, fingerprint)
+            if changes:
+                getattr(self, f'_save_{collection}')(records)
+                if collection == 'matches':
+                    self._matches_changed(user_id, before, changes)
+        return changes
+
+    def bulk_upsert(self, collection: str, records: Iterable[Any], user_id: str, replace: bool = False,
+                    dedupe: bool = False) -> UpsertResult:
+        """Insert or update many of a user's records with a single write.
+
+        records are models or dicts for one of COLLECTION_MODELS. All of them
+        are validated first, so a bad record raises ValueError and nothing is
+        written. With replace=True the user's other records in the collection
+        are deleted in the same write. With dedupe=True, matches whose
+        match_fingerprint equals one the user already has (or one earlier in
+        records) update that match instead of being added again.
+        """
+        records = self._validate_records(collection, records, user_id)
+        changes = []
+        if records or replace:
+            fingerprint = match_fingerprint if dedupe and collection == 'matches' else None
+            changes = self._bulk_apply(collection, user_id, records, delete_all=replace, fingerprint=fingerprint)
+        return _upsert_result(records, changes)
+
+    def bulk_delete(self, collection: str, record_ids: Optional[Iterable[str]], user_id: str) -> int:
+        """Delete many of a user's records (all of them if record_ids is None) with a single write.
+
+        Returns the number of records deleted.
+        """
+        if collection not in COLLECTION_MODELS:
+            raise ValueError(f"Unknown collection: {collection}")
+        if record_ids is None:
+            changes = self._bulk_apply(collection, user_id, [], delete_all=True)
+        else:
+            record_ids = set(record_ids)
+            if not record_ids:
+                return 0
+            changes = self._bulk_apply(collection, user_id, [], delete_ids=record_ids)
+        return len(changes)
+
     def get_season_stats(self, user_id: Optional[str] = None, period: Optional[str] = None) -> Dict[str, Any]:
         """Calculate season statistics, optionally filtered by time period
         
@@ -310,6 +854,10 @@ class StorageManager:
             user_id: User ID to filter matches
             period: Time period filter ('all_time', 'season', '12_months', '6_months', '3_months', 'last_month')
         """
+        if user_id:
+            cutoff = self._period_cutoff(user_id, period)
+            return self._query_match_stats(user_id, lambda stats: stats.season_stats(cutoff))
+        
         completed_matches = self.get_completed_matches(user_id)
         
         # Filter by period if specified
@@ -346,6 +894,11 @@ class StorageManager:
 
     def get_category_stats(self, category: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Calculate statistics for a specific category"""
+        if user_id:
+            return self._query_match_stats(
+                user_id, lambda stats: stats.category_stats(category, include_fixtures=True)
+            )
+        
         category_matches = self.get_matches_by_category(category, user_id)
         
         stats = {
@@ -362,27 +915,33 @@ class StorageManager:
         
         return stats
     
+    def _period_cutoff(self, user_id: str, period: Optional[str]):
+        season_year = self.load_settings(user_id).season_year if period == 'season' else None
+        return period_cutoff(period, season_year)
+
+    def get_stats_summary(self, user_id: str, period: Optional[str] = None) -> Dict[str, Any]:
+        """Season, pre-season and league stats for completed matches in a period"""
+        cutoff = self._period_cutoff(user_id, period)
+        return self._query_match_stats(user_id, lambda stats: stats.summary(cutoff))
+
+    def get_all_period_stats(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """get_stats_summary for every period, computed together"""
+        season_year = self.load_settings(user_id).season_year
+        return self._query_match_stats(user_id, lambda stats: stats.period_summaries(season_year))
+    
     # Physical Measurements methods
     def _save_physical_measurements(self, measurements: list) -> None:
         """Save physical measurements to JSON file"""
-        try:
-            with open(self.physical_measurements_file, 'w', encoding='utf-8') as f:
-                json.dump(measurements, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save physical measurements: {str(e)}")
+        self._write_json(self.physical_measurements_file, measurements, "physical measurements")
     
     def load_physical_measurements(self, user_id: Optional[str] = None) -> list:
         """Load physical measurements from JSON file, optionally filtered by user_id"""
-        try:
-            with open(self.physical_measurements_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                measurements = data if isinstance(data, list) else []
-                if user_id:
-                    measurements = [m for m in measurements if m.get('user_id') == user_id]
-                return measurements
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        measurements = self._read_json(self.physical_measurements_file, [])
+        if user_id:
+            measurements = [m for m in measurements if m.get('user_id') == user_id]
+        return measurements
     
+    @_locked_files('physical_measurements_file')
     def save_physical_measurement(self, measurement: PhysicalMeasurement, user_id: str) -> str:
         """Save a single physical measurement and return its ID"""
         measurements = self.load_physical_measurements()  # Load all
@@ -432,6 +991,7 @@ class StorageManager:
                 continue
         return measurements
     
+    @_locked_files('physical_measurements_file')
     def delete_physical_measurement(self, measurement_id: str, user_id: str) -> bool:
         """Delete a physical measurement by ID for a user"""
         measurements = self.load_physical_measurements()  # Load all
@@ -446,24 +1006,16 @@ class StorageManager:
     # Achievements methods
     def _save_achievements(self, achievements: list) -> None:
         """Save achievements to JSON file"""
-        try:
-            with open(self.achievements_file, 'w', encoding='utf-8') as f:
-                json.dump(achievements, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save achievements: {str(e)}")
+        self._write_json(self.achievements_file, achievements, "achievements")
     
     def load_achievements(self, user_id: Optional[str] = None) -> list:
         """Load achievements from JSON file, optionally filtered by user_id"""
-        try:
-            with open(self.achievements_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                achievements = data if isinstance(data, list) else []
-                if user_id:
-                    achievements = [a for a in achievements if a.get('user_id') == user_id]
-                return achievements
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        achievements = self._read_json(self.achievements_file, [])
+        if user_id:
+            achievements = [a for a in achievements if a.get('user_id') == user_id]
+        return achievements
     
+    @_locked_files('achievements_file')
     def save_achievement(self, achievement: Achievement, user_id: str) -> str:
         """Save a single achievement and return its ID"""
         achievements = self.load_achievements()  # Load all
@@ -513,6 +1065,7 @@ class StorageManager:
                 continue
         return achievements
     
+    @_locked_files('achievements_file')
     def delete_achievement(self, achievement_id: str, user_id: str) -> bool:
         """Delete an achievement by ID for a user"""
         achievements = self.load_achievements()  # Load all
@@ -527,24 +1080,16 @@ class StorageManager:
     # Club History methods
     def _save_club_history(self, club_history: list) -> None:
         """Save club history to JSON file"""
-        try:
-            with open(self.club_history_file, 'w', encoding='utf-8') as f:
-                json.dump(club_history, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save club history: {str(e)}")
+        self._write_json(self.club_history_file, club_history, "club history")
     
     def load_club_history(self, user_id: Optional[str] = None) -> list:
         """Load club history from JSON file, optionally filtered by user_id"""
-        try:
-            with open(self.club_history_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                history = data if isinstance(data, list) else []
-                if user_id:
-                    history = [h for h in history if h.get('user_id') == user_id]
-                return history
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        history = self._read_json(self.club_history_file, [])
+        if user_id:
+            history = [h for h in history if h.get('user_id') == user_id]
+        return history
     
+    @_locked_files('club_history_file')
     def save_club_history_entry(self, club_history: ClubHistory, user_id: str) -> str:
         """Save a single club history entry and return its ID"""
         history = self.load_club_history()  # Load all
@@ -594,6 +1139,7 @@ class StorageManager:
                 continue
         return history
     
+    @_locked_files('club_history_file')
     def delete_club_history_entry(self, entry_id: str, user_id: str) -> bool:
         """Delete a club history entry by ID for a user"""
         history = self.load_club_history()  # Load all
@@ -608,24 +1154,16 @@ class StorageManager:
     # Training Camp methods
     def _save_training_camps(self, training_camps: list) -> None:
         """Save training camps to JSON file"""
-        try:
-            with open(self.training_camps_file, 'w', encoding='utf-8') as f:
-                json.dump(training_camps, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save training camps: {str(e)}")
+        self._write_json(self.training_camps_file, training_camps, "training camps")
     
     def load_training_camps(self, user_id: Optional[str] = None) -> list:
         """Load training camps from JSON file, optionally filtered by user_id"""
-        try:
-            with open(self.training_camps_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                camps = data if isinstance(data, list) else []
-                if user_id:
-                    camps = [c for c in camps if c.get('user_id') == user_id]
-                return camps
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        camps = self._read_json(self.training_camps_file, [])
+        if user_id:
+            camps = [c for c in camps if c.get('user_id') == user_id]
+        return camps
     
+    @_locked_files('training_camps_file')
     def save_training_camp(self, training_camp: TrainingCamp, user_id: str) -> str:
         """Save a single training camp entry and return its ID"""
         camps = self.load_training_camps()  # Load all
@@ -674,6 +1212,7 @@ class StorageManager:
                 continue
         return camps
     
+    @_locked_files('training_camps_file')
     def delete_training_camp(self, camp_id: str, user_id: str) -> bool:
         """Delete a training camp entry by ID for a user"""
         camps = self.load_training_camps()  # Load all
@@ -688,24 +1227,16 @@ class StorageManager:
     # Physical Metrics methods
     def _save_physical_metrics(self, metrics: list) -> None:
         """Save physical metrics to JSON file"""
-        try:
-            with open(self.physical_metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(metrics, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save physical metrics: {str(e)}")
+        self._write_json(self.physical_metrics_file, metrics, "physical metrics")
     
     def load_physical_metrics(self, user_id: Optional[str] = None) -> list:
         """Load physical metrics from JSON file, optionally filtered by user_id"""
-        try:
-            with open(self.physical_metrics_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                metrics = data if isinstance(data, list) else []
-                if user_id:
-                    metrics = [m for m in metrics if m.get('user_id') == user_id]
-                return metrics
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        metrics = self._read_json(self.physical_metrics_file, [])
+        if user_id:
+            metrics = [m for m in metrics if m.get('user_id') == user_id]
+        return metrics
     
+    @_locked_files('physical_metrics_file')
     def save_physical_metric(self, metric: PhysicalMetrics, user_id: str) -> str:
         """Save a single physical metric entry and return its ID"""
         metrics = self.load_physical_metrics()  # Load all
@@ -754,6 +1285,7 @@ class StorageManager:
                 continue
         return metrics
     
+    @_locked_files('physical_metrics_file')
     def delete_physical_metric(self, metric_id: str, user_id: str) -> bool:
         """Delete a physical metric entry by ID for a user"""
         metrics = self.load_physical_metrics()  # Load all
@@ -768,21 +1300,14 @@ class StorageManager:
     # User management methods
     def _save_users(self, users: list) -> None:
         """Save users to JSON file"""
-        try:
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(users, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save users: {str(e)}")
+        self._write_json(self.users_file, users, "users")
+        self._refresh_indexes('users_file', users)
     
     def load_users(self) -> list:
         """Load users from JSON file"""
-        try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self._read_json(self.users_file, [])
     
+    @_locked_files('users_file')
     def create_user(self, username: str, password: str, email: Optional[str] = None) -> Optional[User]:
         """Create a new user"""
         # Check if username already exists
@@ -802,6 +1327,7 @@ class StorageManager:
         # Save user
         users.append(user.model_dump())
         self._save_users(users)
+        _notify_user_changed(user.id)
         
         return user
     
@@ -809,26 +1335,23 @@ class StorageManager:
         """Get a user by username (case-sensitive exact match)"""
         if not username:
             return None
-        username = username.strip()
-        users = self.load_users()
-        for user_data in users:
-            # Exact match (case-sensitive)
-            if user_data.get('username', '').strip() == username:
-                try:
-                    return User(**user_data)
-                except (ValueError, TypeError, KeyError):
-                    continue
+        # Exact match (case-sensitive)
+        user_data = self._index_lookup('username', username.strip())
+        if user_data:
+            try:
+                return User(**user_data)
+            except (ValueError, TypeError, KeyError):
+                pass
         return None
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get a user by ID"""
-        users = self.load_users()
-        for user_data in users:
-            if user_data.get('id') == user_id:
-                try:
-                    return User(**user_data)
-                except (ValueError, TypeError, KeyError):
-                    continue
+        user_data = self._index_lookup('user_id', user_id)
+        if user_data:
+            try:
+                return User(**user_data)
+            except (ValueError, TypeError, KeyError):
+                pass
         return None
     
     def get_all_users(self) -> list[User]:
@@ -855,66 +1378,43 @@ class StorageManager:
     # Subscription management methods
     def _save_subscriptions(self, subscriptions: list) -> None:
         """Save subscriptions to JSON file"""
-        try:
-            with open(self.subscriptions_file, 'w', encoding='utf-8') as f:
-                json.dump(subscriptions, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save subscriptions: {str(e)}")
+        self._write_json(self.subscriptions_file, subscriptions, "subscriptions")
+        self._refresh_indexes('subscriptions_file', subscriptions)
     
     def load_subscriptions(self) -> list:
         """Load subscriptions from JSON file"""
-        try:
-            with open(self.subscriptions_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self._read_json(self.subscriptions_file, [])
     
     def get_subscription_by_user_id(self, user_id: str) -> Optional[Subscription]:
         """Get subscription for a user - tries multiple user ID formats"""
-        subscriptions = self.load_subscriptions()
-        
-        # Try exact match first
-        for sub_data in subscriptions:
-            if sub_data.get('user_id') == user_id:
-                try:
-                    # Ensure status is properly converted to enum
-                    if 'status' in sub_data and isinstance(sub_data['status'], str):
-                        try:
-                            from .models import SubscriptionStatus
-                            sub_data['status'] = SubscriptionStatus(sub_data['status'].lower())
-                        except (ValueError, AttributeError):
-                            pass  # Will use default from model
-                    return Subscription(**sub_data)
-                except (ValueError, TypeError, KeyError) as e:
-                    import traceback
-                    print(f"Error loading subscription for user {user_id}: {e}")
-                    traceback.print_exc()
-                    continue
-        
-        # If no exact match, try to find subscription by Stripe customer ID
-        # This handles cases where user_id format changed
-        # First, try to get user by ID to see if we can find a match
-        user = self.get_user_by_id(user_id)
-        if user:
-            # Check if any subscription might belong to this user
-            # (e.g., by username or email if stored in metadata)
-            # For now, return None if no exact match
-            pass
+        sub_data = self._index_lookup('subscription_user_id', user_id)
+        if sub_data:
+            try:
+                # Ensure status is properly converted to enum
+                if 'status' in sub_data and isinstance(sub_data['status'], str):
+                    try:
+                        sub_data['status'] = SubscriptionStatus(sub_data['status'].lower())
+                    except (ValueError, AttributeError):
+                        pass  # Will use default from model
+                return Subscription(**sub_data)
+            except (ValueError, TypeError, KeyError) as e:
+                import traceback
+                print(f"Error loading subscription for user {user_id}: {e}")
+                traceback.print_exc()
         
         return None
     
     def get_subscription_by_stripe_id(self, stripe_subscription_id: str) -> Optional[Subscription]:
         """Get subscription by Stripe subscription ID"""
-        subscriptions = self.load_subscriptions()
-        for sub_data in subscriptions:
-            if sub_data.get('stripe_subscription_id') == stripe_subscription_id:
-                try:
-                    return Subscription(**sub_data)
-                except (ValueError, TypeError, KeyError):
-                    continue
+        sub_data = self._index_lookup('stripe_subscription_id', stripe_subscription_id)
+        if sub_data:
+            try:
+                return Subscription(**sub_data)
+            except (ValueError, TypeError, KeyError):
+                pass
         return None
     
+    @_locked_files('subscriptions_file')
     def save_subscription(self, subscription: Subscription) -> Subscription:
         """Save or update a subscription"""
         subscriptions = self.load_subscriptions()
@@ -933,6 +1433,18 @@ class StorageManager:
         self._save_subscriptions(subscriptions)
         return subscription
     
+    @_locked_files(
+        'users_file',
+        'matches_file',
+        'physical_measurements_file',
+        'achievements_file',
+        'club_history_file',
+        'training_camps_file',
+        'physical_metrics_file',
+        'subscriptions_file',
+        'references_file',
+        'reset_tokens_file'
+    )
     def delete_user(self, user_id: str) -> bool:
         """Delete a user and all their associated data"""
         try:
@@ -954,6 +1466,7 @@ class StorageManager:
             
             # Save updated users list
             self._save_users(updated_users)
+            _notify_user_changed(user_id)
             
             # Delete all user-associated data
             # Delete matches
@@ -1033,6 +1546,7 @@ class StorageManager:
             traceback.print_exc()
             return False
     
+    @_locked_files('subscriptions_file')
     def delete_subscription(self, user_id: str) -> bool:
         """Delete a subscription"""
         subscriptions = self.load_subscriptions()
@@ -1048,24 +1562,16 @@ class StorageManager:
     def _save_references(self, references: list) -> None:
         """Save references to JSON file"""
         try:
-            with open(self.references_file, 'w', encoding='utf-8') as f:
-                json.dump(references, f, indent=2, ensure_ascii=False)
+            self._write_json(self.references_file, references, "references")
         except Exception as e:
             print(f"Error saving references: {e}")
     
     def load_references(self, user_id: Optional[str] = None) -> list:
         """Load references, optionally filtered by user_id"""
-        try:
-            if not self.references_file.exists():
-                return []
-            with open(self.references_file, 'r', encoding='utf-8') as f:
-                references = json.load(f)
-                if user_id:
-                    references = [r for r in references if r.get('user_id') == user_id]
-                return references
-        except Exception as e:
-            print(f"Error loading references: {e}")
-            return []
+        references = self._read_json(self.references_file, [])
+        if user_id:
+            references = [r for r in references if r.get('user_id') == user_id]
+        return references
     
     def get_reference(self, reference_id: str, user_id: Optional[str] = None) -> Optional[Reference]:
         """Get a reference by ID"""
@@ -1075,6 +1581,7 @@ class StorageManager:
                 return Reference(**ref_data)
         return None
     
+    @_locked_files('references_file')
     def save_reference(self, reference: Reference) -> Reference:
         """Save or update a reference"""
         references = self.load_references()
@@ -1095,6 +1602,7 @@ class StorageManager:
         self._save_references(references)
         return reference
     
+    @_locked_files('references_file')
     def delete_reference(self, reference_id: str, user_id: Optional[str] = None) -> bool:
         """Delete a reference"""
         references = self.load_references(user_id)
@@ -1109,23 +1617,14 @@ class StorageManager:
     # Password reset token management
     def _load_reset_tokens(self) -> list:
         """Load reset tokens from JSON file"""
-        try:
-            if not self.reset_tokens_file.exists():
-                return []
-            with open(self.reset_tokens_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self._read_json(self.reset_tokens_file, [])
     
     def _save_reset_tokens(self, tokens: list) -> None:
         """Save reset tokens to JSON file"""
-        try:
-            with open(self.reset_tokens_file, 'w', encoding='utf-8') as f:
-                json.dump(tokens, f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            raise RuntimeError(f"Failed to save reset tokens: {str(e)}")
+        self._write_json(self.reset_tokens_file, tokens, "reset tokens")
+        self._refresh_indexes('reset_tokens_file', tokens)
     
+    @_locked_files('reset_tokens_file')
     def create_reset_token(self, user_id: str, token: str, expires_at: str) -> bool:
         """Create a password reset token"""
         tokens = self._load_reset_tokens()
@@ -1143,24 +1642,21 @@ class StorageManager:
     
     def get_reset_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Get reset token info if valid"""
-        tokens = self._load_reset_tokens()
-        for token_data in tokens:
-            if token_data.get('token') == token:
-                # Check if expired
-                try:
-                    expires_at = datetime.strptime(token_data['expires_at'], "%Y-%m-%d %H:%M:%S")
-                    if datetime.now() < expires_at:
-                        return token_data
-                    else:
-                        # Token expired, remove it
-                        tokens.remove(token_data)
-                        self._save_reset_tokens(tokens)
-                except (ValueError, KeyError):
-                    # Invalid date format, remove token
-                    tokens.remove(token_data)
-                    self._save_reset_tokens(tokens)
+        token_data = self._index_lookup('reset_token', token)
+        if not token_data:
+            return None
+        # Check if expired
+        try:
+            expires_at = datetime.strptime(token_data['expires_at'], "%Y-%m-%d %H:%M:%S")
+            if datetime.now() < expires_at:
+                return token_data
+        except (ValueError, KeyError):
+            pass  # Invalid date format, remove token
+        # Token expired or invalid, remove it
+        self.delete_reset_token(token)
         return None
     
+    @_locked_files('reset_tokens_file')
     def delete_reset_token(self, token: str) -> bool:
         """Delete a reset token (after use)"""
         tokens = self._load_reset_tokens()
@@ -1171,6 +1667,7 @@ class StorageManager:
             return True
         return False
     
+    @_locked_files('users_file')
     def update_user_password(self, user_id: str, new_password: str) -> bool:
         """Update a user's password"""
         users = self.load_users()
@@ -1178,6 +1675,7 @@ class StorageManager:
             if user_data.get('id') == user_id:
                 user_data['password_hash'] = generate_password_hash(new_password)
                 self._save_users(users)
+                _notify_user_changed(user_id)
                 return True
         return False
     
@@ -1185,12 +1683,52 @@ class StorageManager:
         """Get a user by email address"""
         if not email:
             return None
-        users = self.load_users()
-        for user_data in users:
-            if user_data.get('email') and user_data.get('email').lower() == email.lower():
-                try:
-                    return User(**user_data)
-                except (ValueError, TypeError, KeyError):
-                    continue
+        user_data = self._index_lookup('email', email.lower())
+        if user_data:
+            try:
+                return User(**user_data)
+            except (ValueError, TypeError, KeyError):
+                pass
         return None
 
+
+_shared_storage: Dict[tuple, StorageManager] = {}
+_shared_storage_lock = threading.Lock()
+
+
+def get_storage_manager(data_dir: str = "data") -> StorageManager:
+    """Return the process-wide storage engine for data_dir, creating it once.
+
+    Request handlers should use this rather than create_storage_manager so
+    that file setup runs once per process and the lookup indexes are shared.
+    """
+    key = (os.environ.get('STORAGE_BACKEND', 'json').strip().lower(), str(Path(data_dir).resolve()))
+    storage = _shared_storage.get(key)
+    if storage is None:
+        with _shared_storage_lock:
+            storage = _shared_storage.get(key)
+            if storage is None:
+                storage = create_storage_manager(data_dir)
+                _shared_storage[key] = storage
+    return storage
+
+
+def create_storage_manager(data_dir: str = "data") -> StorageManager:
+    """Create the storage engine selected by the STORAGE_BACKEND environment variable
+
+    'json' (default) keeps the flat JSON files, 'sqlite' uses the indexed
+    SQLite database in data_dir/futureelite.db, and 'journal' keeps the JSON
+    files but appends single-record writes to per-collection journals.
+    'sharded' stores each user's collections under data_dir/users/<user_id>/.
+    """
+    backend = os.environ.get('STORAGE_BACKEND', 'json').strip().lower()
+    if backend == 'sqlite':
+        from .sqlite_storage import SQLiteStorageManager
+        return SQLiteStorageManager(data_dir)
+    if backend == 'journal':
+        from .journal_storage import JournaledStorageManager
+        return JournaledStorageManager(data_dir)
+    if backend == 'sharded':
+        from .sharded_storage import ShardedStorageManager
+        return ShardedStorageManager(data_dir)
+    return StorageManager(data_dir)
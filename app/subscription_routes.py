@@ -26,13 +26,14 @@ except ImportError:
     stripe = None
 
 from .models import Subscription, SubscriptionStatus
-from .storage import StorageManager
+from .storage import get_storage_manager
+from .entitlements import get_entitlements
 
 # Create blueprint
 subscription_bp = Blueprint('subscription', __name__)
 
 # Initialize storage
-storage = StorageManager()
+storage = get_storage_manager()
 
 # Security: In-memory store for webhook event IDs (for idempotency)
 # TODO: Replace with persistent storage (Redis/DB) in production for distributed systems
@@ -73,19 +74,19 @@ def get_subscription_status():
         user_id = current_user.id
         
         # Check server-side storage for subscription
-        subscription = storage.get_subscription_by_user_id(user_id)
+        entitlement = get_entitlements().get(user_id)
         
-        if subscription and subscription.status == SubscriptionStatus.ACTIVE:
+        if entitlement.is_active:
             return jsonify({
                 'success': True,
                 'subscription': {
-                    'status': subscription.status,
+                    'status': entitlement.status,
                     'has_access': True,
-                    'plan_name': subscription.plan_name,
-                    'current_period_end': subscription.current_period_end,
-                    'cancel_at_period_end': subscription.cancel_at_period_end,
-                    'stripe_customer_id': subscription.stripe_customer_id,
-                    'stripe_subscription_id': subscription.stripe_subscription_id,
+                    'plan_name': entitlement.plan,
+                    'current_period_end': entitlement.period_end,
+                    'cancel_at_period_end': entitlement.cancel_at_period_end,
+                    'stripe_customer_id': entitlement.stripe_customer_id,
+                    'stripe_subscription_id': entitlement.stripe_subscription_id,
                     'stripe_publishable_key': STRIPE_PUBLISHABLE_KEY
                 }
             })
@@ -93,7 +94,7 @@ def get_subscription_status():
             return jsonify({
                 'success': True,
                 'subscription': {
-                    'status': subscription.status if subscription else SubscriptionStatus.NONE,
+                    'status': entitlement.status,
                     'has_access': False,
                     'stripe_publishable_key': STRIPE_PUBLISHABLE_KEY
                 }
@@ -473,6 +474,7 @@ def handle_subscription_deleted(subscription):
         existing.status = SubscriptionStatus.CANCELED
         existing.updated_at = datetime.now().isoformat()
         storage.save_subscription(existing)
+        get_entitlements().invalidate(existing.user_id)
 
 
 def handle_payment_failed(invoice):
@@ -601,6 +603,7 @@ def update_subscription_from_stripe(stripe_subscription, user_id: str, customer_
         )
         
         storage.save_subscription(subscription)
+        get_entitlements().invalidate(user_id)
         print(f"Subscription saved for user {user_id}: {subscription.status} (plan: {plan_name})")
         
     except Exception as e:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of the Excel export
+Usage: python bench_excel_export.py [counts...]
+
+Exports synthetic match histories of increasing size (default 1000 10000
+50000 100000 rows) with the write-only streaming exporter and with the old
+in-memory workbook that styled every cell, each run in a fresh process, and
+prints the growth in peak RSS during the export and its duration. The
+streaming column should stay roughly flat as the count grows.
+"""
+
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+DEFAULT_COUNTS = [1000, 10000, 50000, 100000]
+
+
+def make_records(count):
+    """Stored match dicts, generated lazily like StorageManager.iter_collection"""
+    for i in range(count):
+        yield {
+            'id': f"20250101_120000_{i:06d}", 'date': "23 Oct 2025", 'opponent': f"Opponent {i % 40}",
+            'location': "Away Ground, Community Sports Park", 'result': "Win", 'score': f"{i % 4} - {i % 3}",
+            'brodie_goals': i % 3, 'brodie_assists': i % 2, 'minutes_played': 60, 'category': "League",
+            'notes': "" if i % 5 else "Played out of position on the left wing in the second half",
+            'user_id': "bench"
+        }
+
+
+def legacy_export(data, target):
+    """The previous /export: a normal Workbook with the header fill and font set cell by cell"""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+    from app.excel_import import BACKUP_SHEETS
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for key, (title, headers) in BACKUP_SHEETS.items():
+        data_list = list(data.get(key) or [])
+        if not data_list:
+            continue
+        ws = wb.create_sheet(title=title)
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF")
+        for col_idx, header in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+        for row_idx, item in enumerate(data_list, 2):
+            for col_idx, header in enumerate(headers, 1):
+                value = item.get(header, '')
+                ws.cell(row=row_idx, column=col_idx, value='' if value is None else value)
+    wb.save(target)
+
+
+def run(mode, count):
+    """Export count rows in this process; returns (peak RSS growth in MB, seconds)"""
+    from app.excel_export import write_export_workbook
+
+    export = legacy_export if mode == 'legacy' else write_export_workbook
+    data = {'matches': make_records(count), 'settings': {'player_name': "Bench Player"}}
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with tempfile.TemporaryFile() as target:
+        export(data, target)
+    seconds = time.perf_counter() - start
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024, seconds
+
+
+def bench(counts):
+    context = multiprocessing.get_context('spawn')
+    print(f"{'rows':>8} {'streaming MB':>13} {'s':>6} {'legacy MB':>10} {'s':>6}")
+    for count in counts:
+        line = f"{count:>8}"
+        for mode in ('streaming', 'legacy'):
+            # A fresh process per run, so each peak is measured from the same baseline
+            with context.Pool(1) as pool:
+                megabytes, seconds = pool.apply(run, (mode, count))
+            line += f" {megabytes:>{13 if mode == 'streaming' else 10}.1f} {seconds:>6.2f}"
+        print(line, flush=True)
+
+
+if __name__ == '__main__':
+    bench([int(a) for a in sys.argv[1:]] or DEFAULT_COUNTS)
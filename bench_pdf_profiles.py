@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare PDF output profiles
+Usage: python bench_pdf_profiles.py [matches] [photo.jpg]
+
+Renders the season, scout and resume reports with the 'default' and
+'optimized' profiles into memory and prints each file's size and render
+time. Without a photo argument a 12 megapixel test photo is generated, so
+the photo variants dominate the way they do for real uploads.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import pdf
+from app.models import AppSettings, Achievement, ClubHistory
+from app.pdf_fragments import get_fragment_cache
+from app.pdf_profiles import PDF_PROFILES
+from app.photos import create_photo_variants
+from bench_pdf_tables import make_matches
+
+REPORTS = {
+    'season': lambda s, m, a, c, target, profile: pdf.generate_season_pdf(m, s, target=target, profile=profile),
+    'scout': lambda s, m, a, c, target, profile: pdf.generate_scout_pdf(m, s, a, c, target=target, profile=profile),
+    'resume': lambda s, m, a, c, target, profile: pdf.generate_player_resume_pdf(m, s, a, c, target=target, profile=profile),
+}
+
+
+def make_photo(directory):
+    from PIL import Image
+    path = os.path.join(directory, 'player_photo_bench.jpg')
+    Image.effect_noise((3000, 4000), 64).convert('RGB').save(path, quality=92)
+    return path
+
+
+def bench(match_count, photo_path=None):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        if photo_path is None:
+            photo_path = make_photo(temp_dir)
+        else:
+            photo_path = shutil.copy(photo_path, temp_dir)
+        # Variants are made on upload, so keep them out of the timings
+        create_photo_variants(photo_path)
+
+        settings = AppSettings(player_name="Bench Player", club_name="Bench FC", player_photo_path=photo_path)
+        matches = make_matches(match_count)
+        achievements = [Achievement(id=f"a{i}", title=f"Award {i}", category="Season", date="01 Jun 2025")
+                        for i in range(5)]
+        club_history = [ClubHistory(id=f"c{i}", club_name=f"Club {i}", season="2024/25") for i in range(4)]
+
+        print(f"{'report':>8}" + "".join(f" {name + ' KB':>14} {'s':>6}" for name in PDF_PROFILES) + f" {'saved':>7}")
+        for report, render in REPORTS.items():
+            line = f"{report:>8}"
+            sizes = []
+            for profile in PDF_PROFILES:
+                get_fragment_cache().clear()
+                target = io.BytesIO()
+                start = time.perf_counter()
+                render(settings, matches, achievements, club_history, target, profile)
+                seconds = time.perf_counter() - start
+                sizes.append(len(target.getvalue()))
+                line += f" {sizes[-1] / 1024:>14.1f} {seconds:>6.2f}"
+            line += f" {100 * (1 - sizes[-1] / sizes[0]):>6.1f}%"
+            print(line, flush=True)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    bench(int(args[0]) if args else 200, args[1] if len(args) > 1 else None)
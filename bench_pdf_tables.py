@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the season match table in PDF reports
+Usage: python bench_pdf_tables.py [--legacy] [counts...]
+
+Builds and renders just the "Season Match Data" table for increasing match
+counts (default 50 500 1000 2500 5000) into memory and prints the time per
+match, which should stay roughly flat as the count grows. --legacy also times the
+old single-Table layout (every cell a Paragraph) for comparison.
+"""
+
+import io
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph
+
+from app import pdf
+from app.models import Match, MatchCategory, MatchResult, AppSettings
+
+DEFAULT_COUNTS = [50, 500, 1000, 2500, 5000]
+
+
+def make_matches(count):
+    """Synthetic match history with a mix of short and wrapping cells"""
+    start = date(2015, 7, 1)
+    results = [MatchResult.WIN, MatchResult.DRAW, MatchResult.LOSS]
+    return [
+        Match(
+            category=MatchCategory.LEAGUE if i % 3 else MatchCategory.PRE_SEASON_FRIENDLY,
+            date=(start + timedelta(days=i)).strftime("%d %b %Y"),
+            opponent=f"Opponent {i % 40}" if i % 7 else f"Opponent Academy Under Twelves Development Squad {i}",
+            location="Home" if i % 2 else "Away Ground, Community Sports Park",
+            result=results[i % 3],
+            score=f"{i % 4} - {i % 3}",
+            brodie_goals=i % 3,
+            brodie_assists=i % 2,
+            minutes_played=60,
+            notes="" if i % 5 else "Played out of position on the left wing in the second half"
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy_cell(text, style, width, padding=12):
+    return Paragraph('' if text is None else str(text), style)
+
+
+def _legacy_table(header, rows, col_widths, style, chunk_rows=None):
+    table = Table([list(header)] + [list(r) for r in rows], colWidths=col_widths, repeatRows=1)
+    table.setStyle(style)
+    return [table]
+
+
+def build_table(generator, matches, legacy=False):
+    """Season match table flowables; legacy restores the old single Table of Paragraphs"""
+    if not legacy:
+        return generator._create_season_matches_table(matches)
+    with patch.object(pdf, 'lean_cell', _legacy_cell), patch.object(pdf, 'chunked_table', _legacy_table):
+        return generator._create_season_matches_table(matches)
+
+
+def render(story):
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=landscape(A4), leftMargin=36, rightMargin=36,
+                            topMargin=36, bottomMargin=36)
+    doc.build(story)
+
+
+def bench(counts, include_legacy=False):
+    generator = pdf.PDFGenerator(AppSettings())
+    modes = [False, True] if include_legacy else [False]
+    print(f"{'matches':>8}" + "".join(f" {label + ' s':>10} {'ms/match':>9}" for label in ['chunked', 'legacy'][:len(modes)]))
+    for count in counts:
+        matches = make_matches(count)
+        line = f"{count:>8}"
+        for legacy in modes:
+            start = time.perf_counter()
+            render(build_table(generator, matches, legacy))
+            seconds = time.perf_counter() - start
+            line += f" {seconds:>10.2f} {seconds * 1000 / count:>9.2f}"
+        print(line, flush=True)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    include_legacy = '--legacy' in args
+    counts = [int(a) for a in args if a != '--legacy'] or DEFAULT_COUNTS
+    bench(counts, include_legacy)
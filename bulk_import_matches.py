@@ -2,9 +2,10 @@
 """
 Bulk import script for matches.
 Run this script to quickly add multiple matches to the app.
+All new matches are validated first and saved with a single write.
 
 Usage:
-    python bulk_import_matches.py
+    python bulk_import_matches.py <user_id> [data_dir]
 """
 
 import sys
@@ -15,12 +16,9 @@ from datetime import datetime
 # Add the app directory to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.storage import StorageManager
+from app.storage import create_storage_manager
 from app.models import Match, MatchCategory, MatchResult
 
-# Initialize storage
-storage = StorageManager()
-
 def determine_result(score: str) -> MatchResult:
     """Determine match result from score"""
     if not score or score.strip() == '':
@@ -60,7 +58,7 @@ def format_score(score: str) -> str:
 # Match data from your table
 # Format: (opponent, location, score, brodie_goals, brodie_assists, minutes, date, category)
 # NOTE: Update the dates below to match your actual match dates!
-# The script will skip matches that already exist (by opponent name and date)
+# The script will skip matches that already exist (by date, opponent, category and score)
 matches_data = [
     ("Altrajz", "Al-Farabi", "3-2", 0, 0, 15, "01 Sep 2025", MatchCategory.PRE_SEASON_FRIENDLY),
     ("Faith Academy", "Al-Farabi", "2-3", 0, 0, 20, "08 Sep 2025", MatchCategory.PRE_SEASON_FRIENDLY),
@@ -78,39 +76,27 @@ matches_data = [
     ("Qadsiah Academy", "Al-Farabi", None, 1, 0, 30, "01 Dec 2025", MatchCategory.LEAGUE),
 ]
 
-def import_matches():
-    """Import all matches from the data list"""
-    existing_matches = storage.load_matches()
-    
-    # Create a set of existing matches by opponent+date for duplicate checking
-    existing_keys = set()
-    for m in existing_matches:
-        opponent = m.get('opponent', '').lower()
-        date = m.get('date', '')
-        existing_keys.add(f"{opponent}_{date}")
+def import_matches(user_id, data_dir='data'):
+    """Import all matches from the data list for one user"""
+    storage = create_storage_manager(data_dir)
+    existing_count = len(storage.load_matches(user_id))
     
-    imported = 0
-    skipped = 0
+    new_matches = []
     errors = []
+    base_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    print(f"Found {len(existing_matches)} existing matches")
+    print(f"Found {existing_count} existing matches")
     print(f"Importing {len(matches_data)} new matches...\n")
     
     for opponent, location, score, goals, assists, minutes, date, category in matches_data:
         try:
-            # Check if match already exists
-            match_key = f"{opponent.lower()}_{date}"
-            if match_key in existing_keys:
-                print(f"⚠️  Skipping {opponent} ({date}) - already exists")
-                skipped += 1
-                continue
-            
             # Format score
             formatted_score = format_score(score) if score else None
             result = determine_result(formatted_score) if formatted_score else None
             
-            # Create match
+            # Create match (ids made in the same second need a suffix to stay unique)
             match = Match(
+                id=f"{base_id}_{len(new_matches) + 1:04d}",
                 category=category,
                 date=date,
                 opponent=opponent,
@@ -123,23 +109,22 @@ def import_matches():
                 notes="",
                 is_fixture=False
             )
-            
-            # Save match
-            match_id = storage.save_match(match)
-            score_display = formatted_score if formatted_score else "No score"
-            print(f"✅ Imported: {opponent} ({date}) - {score_display} | {goals}G {assists}A {minutes}min")
-            imported += 1
-            existing_keys.add(match_key)  # Add to set to prevent duplicates in same import
+            new_matches.append(match)
             
         except Exception as e:
             error_msg = f"❌ Error importing {opponent}: {str(e)}"
             print(error_msg)
             errors.append(error_msg)
     
+    # Save all matches at once; ones that already exist (same date, opponent,
+    # category and score) update the stored match instead of being added again
+    result = storage.bulk_upsert('matches', new_matches, user_id, dedupe=True)
+    
     print(f"\n{'='*70}")
     print(f"Import complete!")
-    print(f"✅ Imported: {imported} matches")
-    print(f"⚠️  Skipped: {skipped} matches (already exist)")
+    print(f"✅ Imported: {result.inserted} matches")
+    print(f"🔄 Updated: {result.updated} matches")
+    print(f"⚠️  Skipped: {result.skipped} matches (already exist)")
     if errors:
         print(f"❌ Errors: {len(errors)} matches")
         for error in errors:
@@ -147,6 +132,12 @@ def import_matches():
     print(f"{'='*70}")
 
 if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python bulk_import_matches.py <user_id> [data_dir]")
+        sys.exit(1)
+    user_id = sys.argv[1]
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else 'data'
+    
     print("="*70)
     print("Bulk Match Import Script")
     print("="*70)
@@ -163,6 +154,6 @@ if __name__ == "__main__":
         sys.exit(0)
     
     print()
-    import_matches()
+    import_matches(user_id, data_dir)
     
     print("\n✅ Done! Refresh your app at http://127.0.0.1:5000/matches to see the new matches.")
@@ -1,20 +1,22 @@
 #!/usr/bin/env python3
 """
-Clear all existing matches and import new data.
+Clear a user's existing matches and import new data.
+The old matches are replaced by the new ones in a single write.
+
+Usage:
+    python clear_and_import_matches.py <user_id> [data_dir]
 """
 
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Add the app directory to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.storage import StorageManager
+from app.storage import create_storage_manager
 from app.models import Match, MatchCategory, MatchResult
 
-# Initialize storage
-storage = StorageManager()
-
 def determine_result(score: str) -> MatchResult:
     """Determine match result from score"""
     if not score or score.strip() == '':
@@ -69,23 +71,22 @@ matches_data = [
     ("Qadsiah Academy", "Al-Farabi", "4-3", 2, 0, 40, "13 Nov 2025", MatchCategory.PRE_SEASON_FRIENDLY, "Both goals reactive finish in crowded box"),
 ]
 
-def clear_and_import():
-    """Clear all existing matches and import new data"""
+def clear_and_import(user_id, data_dir='data'):
+    """Replace a user's matches with the new data"""
     print("="*70)
     print("Clear and Import Matches")
     print("="*70)
     
-    # Clear all existing matches
-    print("\n🗑️  Clearing all existing matches...")
-    storage._save_matches([])
-    existing_count = len(storage.load_matches())
-    print(f"✅ Cleared. Remaining matches: {existing_count}")
+    storage = create_storage_manager(data_dir)
+    existing_count = len(storage.load_matches(user_id))
+    print(f"\n🗑️  {existing_count} existing matches will be cleared")
     
     # Import new matches
     print(f"\n📥 Importing {len(matches_data)} new matches...\n")
     
     imported = 0
     errors = []
+    base_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     # Build all matches first
     all_matches = []
@@ -94,7 +95,9 @@ def clear_and_import():
             formatted_score = format_score(score) if score else None
             result = determine_result(formatted_score) if formatted_score else None
             
+            # Ids made in the same second need a suffix to stay unique
             match = Match(
+                id=f"{base_id}_{len(all_matches) + 1:04d}",
                 category=category,
                 date=date,
                 opponent=opponent,
@@ -108,7 +111,7 @@ def clear_and_import():
                 is_fixture=False
             )
             
-            all_matches.append(match.dict())
+            all_matches.append(match)
             score_display = formatted_score if formatted_score else "No score"
             print(f"✅ {opponent:20s} | {date:12s} | {score_display:8s} | {goals}G {assists}A {minutes}min")
             imported += 1
@@ -118,10 +121,9 @@ def clear_and_import():
             print(error_msg)
             errors.append(error_msg)
     
-    # Save all matches at once
-    if all_matches:
-        storage._save_matches(all_matches)
-        print(f"\n💾 Saved {len(all_matches)} matches to database")
+    # Clear the old matches and save the new ones at once
+    storage.bulk_upsert('matches', all_matches, user_id, replace=True)
+    print(f"\n💾 Saved {len(all_matches)} matches to database")
     
     print(f"\n{'='*70}")
     print(f"Import complete!")
@@ -133,13 +135,19 @@ def clear_and_import():
     print(f"{'='*70}")
 
 if __name__ == "__main__":
-    print("\n⚠️  WARNING: This will DELETE all existing matches and replace them with new data!")
+    if len(sys.argv) < 2:
+        print("Usage: python clear_and_import_matches.py <user_id> [data_dir]")
+        sys.exit(1)
+    user_id = sys.argv[1]
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else 'data'
+    
+    print(f"\n⚠️  WARNING: This will DELETE all existing matches for {user_id} and replace them with new data!")
     response = input("Are you sure you want to continue? (yes/no): ")
     if response.lower() != 'yes':
         print("Operation cancelled.")
         sys.exit(0)
     
-    clear_and_import()
+    clear_and_import(user_id, data_dir)
     
     print("\n✅ Done! Refresh your app at http://127.0.0.1:5000/matches to see the updated matches.")
 
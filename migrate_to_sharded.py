@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Migrate the flat JSON data files into the per-user sharded layout
+Usage: python migrate_to_sharded.py [data_dir]
+
+Player records move to data/users/<user_id>/<collection>.json. The original
+flat files are backed up as <name>.json.bak before being rewritten.
+After migrating, start the app with STORAGE_BACKEND=sharded.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.sharded_storage import migrate_flat_to_sharded
+
+
+def migrate(data_dir='data'):
+    """Split every per-user collection in data_dir into per-user shards"""
+    print(f"Migrating flat JSON data in {data_dir}/ to per-user shards...")
+    counts = migrate_flat_to_sharded(data_dir)
+
+    for collection, count in counts.items():
+        print(f"  {collection}: {count}")
+
+    print("\n" + "="*50)
+    print("Migration completed successfully!")
+    print(f"Shards: {Path(data_dir) / 'users'}")
+    print("Set STORAGE_BACKEND=sharded to use them.")
+    print("="*50)
+    return counts
+
+
+if __name__ == '__main__':
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else 'data'
+    try:
+        migrate(data_dir)
+    except Exception as e:
+        print(f"\nERROR: Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Migrate the JSON data files into the SQLite storage engine
+Usage: python migrate_to_sqlite.py [data_dir]
+
+After migrating, start the app with STORAGE_BACKEND=sqlite.
+The JSON files are left untouched so you can switch back at any time.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.sqlite_storage import migrate_json_to_sqlite
+
+
+def migrate(data_dir='data'):
+    """Copy every JSON collection in data_dir into data_dir/futureelite.db"""
+    print(f"Migrating JSON data in {data_dir}/ to SQLite...")
+    counts = migrate_json_to_sqlite(data_dir)
+
+    for collection, count in counts.items():
+        print(f"  {collection}: {count}")
+
+    print("\n" + "="*50)
+    print("Migration completed successfully!")
+    print(f"Database: {Path(data_dir) / 'futureelite.db'}")
+    print("Set STORAGE_BACKEND=sqlite to use it.")
+    print("="*50)
+    return counts
+
+
+if __name__ == '__main__':
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else 'data'
+    try:
+        migrate(data_dir)
+    except Exception as e:
+        print(f"\nERROR: Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuild the materialized match stats from match history
+Usage: python rebuild_stats.py [data_dir] [user_id]
+
+Stats are maintained incrementally as matches are saved and deleted, and each
+worker rebuilds its copy automatically when the match files change. Run this
+to rebuild them from scratch and print every user's all-time totals, e.g. to
+check them after editing match files by hand.
+"""
+
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.storage import create_storage_manager
+
+
+def rebuild(data_dir='data', user_id=None):
+    """Rebuild stats for one user, or every user with matches"""
+    storage = create_storage_manager(data_dir)
+    print(f"Rebuilding match stats in {data_dir}/...")
+    count = storage.rebuild_match_stats(user_id)
+
+    user_ids = [user_id] if user_id else sorted({m.get('user_id') for m in storage.load_matches() if m.get('user_id')})
+    for uid in user_ids:
+        stats = storage.get_season_stats(uid)
+        print(f"  {uid}: {stats['total_matches']} matches, {stats['wins']}W {stats['draws']}D {stats['losses']}L, "
+              f"{stats['goals']} goals, {stats['assists']} assists, {stats['minutes']} minutes")
+
+    print("\n" + "="*50)
+    print(f"Rebuilt stats for {count} user(s)")
+    print("="*50)
+    return count
+
+
+if __name__ == '__main__':
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else 'data'
+    user_id = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        rebuild(data_dir, user_id)
+    except Exception as e:
+        print(f"\nERROR: Rebuild failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
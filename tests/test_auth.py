@@ -0,0 +1,67 @@
+import unittest
+import tempfile
+import os
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.storage import StorageManager, add_user_change_listener, _user_change_listeners
+from app.auth import UserSession, UserSessionCache
+
+
+class TestUserSessionCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.temp_dir)
+        self.cache = UserSessionCache(ttl=60)
+        add_user_change_listener(self.cache.invalidate)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        _user_change_listeners.remove(self.cache.invalidate)
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_put_and_expiry(self):
+        """Test cached sessions are returned until their TTL runs out"""
+        user = self.storage.create_user("player_one", "secret123")
+        user_session = UserSession(user)
+        self.cache.put(user.id, user_session)
+        self.assertIs(self.cache.get(user.id), user_session)
+
+        self.cache.ttl = 0
+        self.cache.put(user.id, user_session)
+        self.assertIsNone(self.cache.get(user.id))
+
+    def test_expired_and_excess_entries_are_dropped(self):
+        """Test the cache does not keep one entry for every user ever seen"""
+        user = self.storage.create_user("player_one", "secret123")
+        self.cache.ttl = 0
+        for i in range(5):
+            self.cache.put(f"user_{i}", UserSession(user))
+        self.assertEqual(len(self.cache._entries), 0)
+
+        self.cache.ttl = 60
+        self.cache.max_entries = 3
+        for i in range(5):
+            self.cache.put(f"user_{i}", UserSession(user))
+        self.assertEqual(list(self.cache._entries), ["user_2", "user_3", "user_4"])
+        self.assertIsNone(self.cache.get("user_0"))
+        self.assertIsNotNone(self.cache.get("user_4"))
+
+    def test_user_changes_invalidate(self):
+        """Test password changes and deletes drop the cached session"""
+        user = self.storage.create_user("player_one", "secret123")
+        self.cache.put(user.id, UserSession(user))
+        self.assertTrue(self.storage.update_user_password(user.id, "newsecret"))
+        self.assertIsNone(self.cache.get(user.id))
+
+        self.cache.put(user.id, UserSession(user))
+        self.assertTrue(self.storage.delete_user(user.id))
+        self.assertIsNone(self.cache.get(user.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
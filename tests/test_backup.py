@@ -0,0 +1,105 @@
+import unittest
+import tempfile
+import os
+import io
+import json
+import zipfile
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from PIL import Image as PILImage
+
+from app.backup import (
+    iter_backup_archive, restore_backup_archive, is_backup_archive, BackupError, MANIFEST_NAME
+)
+from app.sqlite_storage import SQLiteStorageManager
+from app.models import Match, MatchCategory, MatchResult, AppSettings, Reference, Achievement
+
+
+class TestBackupArchive(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with source and destination stores"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = SQLiteStorageManager(data_dir=os.path.join(self.temp_dir, 'source'))
+        self.target = SQLiteStorageManager(data_dir=os.path.join(self.temp_dir, 'target'))
+        self.photos_dir = os.path.join(self.temp_dir, 'photos')
+        self.photo_path = os.path.join(self.temp_dir, 'player_photo_abc.png')
+        PILImage.new('RGB', (40, 50), (200, 30, 30)).save(self.photo_path)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _archive(self, user_id="user_a"):
+        return b''.join(iter_backup_archive(self.source, user_id))
+
+    def _populate(self):
+        for i in range(3):
+            self.source.save_match(Match(
+                id=f"m{i}", category=MatchCategory.LEAGUE, date="23 Oct 2025", opponent=f"Team {i}",
+                location="Home", result=MatchResult.WIN, score="2 - 1", brodie_goals=i
+            ), "user_a")
+        self.source.save_match(Match(
+            id="other", category=MatchCategory.LEAGUE, date="23 Oct 2025", opponent="Other", location="Home"
+        ), "user_b")
+        self.source.save_achievement(Achievement(id="a1", title="Player of the Season", category="Award",
+                                                 date="01 Jun 2025"), "user_a")
+        self.source.save_reference(Reference(id="r1", user_id="user_a", name="Coach", position="Head Coach",
+                                             organization="Test FC", email="coach@example.com"))
+        self.source.save_settings(AppSettings(player_name="Test Player", player_photo_path=self.photo_path), "user_a")
+
+    def test_round_trip(self):
+        self._populate()
+        data = self._archive()
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertTrue(is_backup_archive(archive))
+            self.assertIsNone(archive.testzip())
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+            self.assertEqual(manifest['collections']['matches']['records'], 3)
+            self.assertEqual(manifest['photos'], ['photos/player_photo_abc.png'])
+            lines = archive.read('collections/matches.jsonl').decode('utf-8').splitlines()
+            self.assertNotIn('user_id', json.loads(lines[0]))
+
+            counts = restore_backup_archive(archive, self.target, "user_c", self.photos_dir)
+
+        self.assertEqual(counts['matches'].inserted, 3)
+        self.assertEqual(sorted(m['opponent'] for m in self.target.load_matches("user_c")),
+                         ['Team 0', 'Team 1', 'Team 2'])
+        self.assertEqual([a['title'] for a in self.target.load_achievements("user_c")], ['Player of the Season'])
+        self.assertEqual([r['email'] for r in self.target.load_references("user_c")], ['coach@example.com'])
+
+        settings = self.target.load_settings("user_c")
+        self.assertEqual(settings.player_name, "Test Player")
+        photo = os.path.basename(settings.player_photo_path)
+        self.assertTrue(photo.startswith('player_photo_') and photo.endswith('.png'))
+        with open(os.path.join(self.photos_dir, photo), 'rb') as restored, open(self.photo_path, 'rb') as original:
+            self.assertEqual(restored.read(), original.read())
+
+    def _corrupt(self, member, content):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(self._archive())) as source, zipfile.ZipFile(buffer, 'w') as archive:
+            for info in source.infolist():
+                archive.writestr(info.filename, content if info.filename == member else source.read(info))
+        return buffer
+
+    def test_invalid_archive_is_not_applied(self):
+        self._populate()
+        cases = [
+            ('collections/references.jsonl', b'{"id": "r2"}\n', 'collections/references.jsonl line 1'),
+            ('photos/player_photo_abc.png', b'\x89PNG\r\n\x1a\nnot really a png', 'not a valid image'),
+        ]
+        for member, content, message in cases:
+            with self.subTest(member=member):
+                with zipfile.ZipFile(self._corrupt(member, content)) as archive:
+                    with self.assertRaises(BackupError) as raised:
+                        restore_backup_archive(archive, self.target, "user_c", self.photos_dir)
+                self.assertIn(message, str(raised.exception))
+                self.assertEqual(self.target.load_matches("user_c"), [])
+                self.assertFalse(os.path.exists(self.photos_dir))
+
+if __name__ == '__main__':
+    unittest.main()
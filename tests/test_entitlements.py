@@ -0,0 +1,78 @@
+import unittest
+import tempfile
+import os
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from flask import Flask
+
+from app.storage import StorageManager
+from app.entitlements import EntitlementService
+from app.models import Subscription, SubscriptionStatus
+
+
+class TestEntitlementService(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.temp_dir)
+        self.service = EntitlementService(self.storage)
+        self.app_context = Flask(__name__).app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        self.app_context.pop()
+        shutil.rmtree(self.temp_dir)
+
+    def _count_lookups(self):
+        calls = []
+        original = self.storage.get_subscription_by_user_id
+
+        def counting(user_id):
+            calls.append(user_id)
+            return original(user_id)
+        self.storage.get_subscription_by_user_id = counting
+        return calls
+
+    def test_cached_until_subscriptions_change(self):
+        """Test repeated checks are served from memory until the store changes"""
+        self.storage.save_subscription(Subscription(user_id="user_a", status="active", plan_name="Monthly"))
+        calls = self._count_lookups()
+
+        entitlement = self.service.get("user_a")
+        self.assertTrue(entitlement.is_active)
+        self.assertEqual(entitlement.plan, "Monthly")
+        self.service.get("user_a")
+        self.assertEqual(len(calls), 1)
+
+        # A write from another worker changes the file and is picked up
+        other = StorageManager(data_dir=self.temp_dir)
+        other.save_subscription(Subscription(user_id="user_a", status="canceled"))
+        self.assertFalse(self.service.get("user_a").is_active)
+        self.assertEqual(len(calls), 2)
+
+    def test_invalidate(self):
+        """Test explicit invalidation forces a reload"""
+        calls = self._count_lookups()
+        self.assertFalse(self.service.get("user_a").is_active)
+        self.service.invalidate("user_a")
+        self.service.get("user_a")
+        self.assertEqual(len(calls), 2)
+
+    def test_claim_single_orphaned_subscription(self):
+        """Test a user without a record takes over the only active subscription"""
+        self.storage.save_subscription(Subscription(user_id="old_id_format", status="active"))
+
+        self.assertFalse(self.service.get("user_a").is_active)
+        entitlement = self.service.get("user_a", claim_orphan=True)
+        self.assertTrue(entitlement.is_active)
+        self.assertEqual(entitlement.status, SubscriptionStatus.ACTIVE)
+        self.assertIsNotNone(self.storage.get_subscription_by_user_id("user_a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import tempfile
+import os
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import openpyxl
+
+from app.excel_export import write_export_workbook, HEADER_STYLE
+from app.excel_import import open_workbook, read_backup
+from app.sqlite_storage import SQLiteStorageManager
+from app.models import Match, MatchCategory, MatchResult, AppSettings, Reference
+
+
+class TestExcelExport(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = SQLiteStorageManager(data_dir=self.temp_dir)
+        self.path = os.path.join(self.temp_dir, 'export.xlsx')
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_export_round_trip(self):
+        for i in range(3):
+            self.storage.save_match(Match(
+                id=f"m{i}", category=MatchCategory.LEAGUE, date="23 Oct 2025", opponent=f"Team {i}",
+                location="Home", result=MatchResult.WIN, score="2 - 1", brodie_goals=i
+            ), "user_a")
+        self.storage.save_match(Match(
+            id="other", category=MatchCategory.LEAGUE, date="23 Oct 2025", opponent="Other", location="Home"
+        ), "user_b")
+        self.storage.save_reference(Reference(id="r1", user_id="user_a", name="Coach", position="Head Coach",
+                                              organization="Test FC", email="coach@example.com"))
+        self.storage.save_settings(AppSettings(player_name="Test Player"), "user_a")
+
+        data = self.storage.iter_export_data("user_a")
+        with open(self.path, 'wb') as f:
+            write_export_workbook(data, f)
+
+        workbook = openpyxl.load_workbook(self.path)
+        self.assertEqual(workbook.sheetnames, ['Matches', 'Settings', 'References'])
+        self.assertEqual(workbook['Matches']['A1'].style, HEADER_STYLE)
+        self.assertTrue(workbook['Matches']['A1'].font.b)
+        self.assertEqual(workbook['Matches'].max_row, 4)
+
+        workbook = open_workbook(self.path)
+        try:
+            backup = read_backup(workbook)
+        finally:
+            workbook.close()
+        self.assertEqual([m['opponent'] for m in backup['matches']], ['Team 0', 'Team 1', 'Team 2'])
+        self.assertEqual(backup['references'][0]['email'], 'coach@example.com')
+        self.assertEqual(backup['settings']['player_name'], 'Test Player')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import tempfile
+import os
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import openpyxl
+
+from app.excel_import import (
+    open_workbook, is_full_backup, parse_match_sheet, read_backup, ExcelImportError
+)
+from app.models import MatchCategory, MatchResult
+
+
+class TestExcelImport(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _save(self, sheets, name='import.xlsx'):
+        """Write {sheet name: rows} to a workbook and return its path"""
+        workbook = openpyxl.Workbook()
+        workbook.remove(workbook.active)
+        for title, rows in sheets.items():
+            sheet = workbook.create_sheet(title)
+            for row in rows:
+                sheet.append(row)
+        path = os.path.join(self.temp_dir, name)
+        workbook.save(path)
+        return path
+
+    def test_parse_match_sheet(self):
+        path = self._save({'Matches': [
+            ['My season'],
+            [],
+            ['Date', 'Opponent', 'Location', 'Category', 'Score', 'Goals', 'Assists', 'Minutes', 'Notes'],
+            ['23/10/2025', 'Team A', 'Home', 'League', '2-1', 1, 0, 60, 'Good game'],
+            ['24/10/2025', '=HYPERLINK("x")', 'Away', '', '', 0, 0, 0, ''],
+            ['31/02/2025', 'Team B', 'Away', '', '', 0, 0, 0, ''],
+            ['25/10/2025', 'Team C', 'Away', 'Friendly', '3:1', 0, 0, 0, ''],
+            ['26/10/2025', 'Team D', None, 'Pre-season', '0 - 0', '2', None, '45', ''],
+            [],
+            ['INSTRUCTIONS:'],
+        ]})
+        workbook = open_workbook(path)
+        try:
+            self.assertFalse(is_full_backup(workbook))
+            result = parse_match_sheet(workbook.active, batch_size=2)
+        finally:
+            workbook.close()
+
+        self.assertEqual([m.opponent for m in result.matches], ['Team A', 'Team D'])
+        first, last = result.matches
+        self.assertEqual(first.date, '23 Oct 2025')
+        self.assertEqual(first.score, '2 - 1')
+        self.assertEqual(first.result, MatchResult.WIN)
+        self.assertEqual(first.category, MatchCategory.LEAGUE)
+        self.assertEqual(last.location, 'Unknown')
+        self.assertEqual((last.brodie_goals, last.minutes_played, last.result), (2, 45, MatchResult.DRAW))
+        self.assertNotEqual(first.id, last.id)
+
+        # Formula cell skipped, bad date and bad score reported against their rows
+        self.assertEqual(len(result.errors), 2)
+        self.assertTrue(result.errors[0].startswith('Row 6:'))
+        self.assertTrue(result.errors[1].startswith('Row 7 (opponent: Team C)'))
+        self.assertEqual(result.rows_checked, 7)
+
+    def test_header_row_without_opponent_column(self):
+        path = self._save({'Sheet': [['Vs', 'Date'], ['Team A', '01/09/2025']]})
+        workbook = open_workbook(path)
+        try:
+            self.assertEqual([m.opponent for m in parse_match_sheet(workbook.active).matches], ['Team A'])
+        finally:
+            workbook.close()
+
+        path = self._save({'Sheet': [['Team', 'When?'], ['Team A', '01/09/2025']]}, 'bad.xlsx')
+        workbook = open_workbook(path)
+        try:
+            with self.assertRaises(ExcelImportError) as raised:
+                parse_match_sheet(workbook.active)
+        finally:
+            workbook.close()
+        self.assertIn('"Opponent, Date"', str(raised.exception))
+
+    def test_read_backup(self):
+        path = self._save({
+            'Settings': [
+                ['Setting', 'Value'],
+                ['player_name', 'Test Player'],
+                ['highlight_reel_urls', "['https://example.com/a']"],
+                ['club_name', None],
+            ],
+            'Matches': [
+                ['id', 'date', 'opponent', 'venue', 'goals'],
+                ['m1', '23 Oct 2025', 'Team A', 'Home', 2],
+                [None, None, None, None, None],
+                ['m2', '24 Oct 2025', 'Team B', None, 0],
+            ],
+        })
+        workbook = open_workbook(path)
+        try:
+            self.assertTrue(is_full_backup(workbook))
+            data = read_backup(workbook)
+        finally:
+            workbook.close()
+
+        self.assertEqual(data['settings'], {'player_name': 'Test Player',
+                                            'highlight_reel_urls': ['https://example.com/a']})
+        self.assertEqual(data['matches'], [
+            {'id': 'm1', 'date': '23 Oct 2025', 'opponent': 'Team A', 'venue': 'Home', 'goals': 2},
+            {'id': 'm2', 'date': '24 Oct 2025', 'opponent': 'Team B', 'goals': 0},
+        ])
+        self.assertEqual(data['references'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+import tempfile
+import os
+import json
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.storage import StorageManager, _collection_cache
+from app.journal_storage import JournaledStorageManager
+from app.models import Match, MatchCategory, MatchResult, AppSettings, Subscription
+
+
+def make_match(match_id, opponent="Test Team"):
+    return Match(
+        id=match_id,
+        category=MatchCategory.LEAGUE,
+        date="23 Oct 2025",
+        opponent=opponent,
+        location="Test Stadium",
+        result=MatchResult.WIN,
+        score="2 - 1",
+        brodie_goals=1,
+        minutes_played=30
+    )
+
+
+def _create_user_in_process(data_dir, username, barrier, created):
+    storage = JournaledStorageManager(data_dir=data_dir, fsync=False)
+    barrier.wait()
+    if storage.create_user(username, "secret123") is not None:
+        with created.get_lock():
+            created.value += 1
+
+
+class TestJournaledStorageManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = JournaledStorageManager(data_dir=self.temp_dir, fsync=False)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _journal_lines(self, name):
+        with open(self.storage._journal_file(name), 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_save_appends_without_rewriting_base(self):
+        """Test that a save appends one journal line and leaves the base file alone"""
+        base_mtime = os.stat(self.storage.matches_file).st_mtime_ns
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.save_match(make_match("m2"), "user_a")
+
+        self.assertEqual(len(self._journal_lines('matches')), 2)
+        self.assertEqual(os.stat(self.storage.matches_file).st_mtime_ns, base_mtime)
+        self.assertEqual([m.id for m in self.storage.get_all_matches("user_a")], ["m1", "m2"])
+
+    def test_update_and_delete_replay(self):
+        """Test that updates and deletes are applied in order on replay"""
+        self.storage.save_match(make_match("m1", "Team 1"), "user_a")
+        self.storage.save_match(make_match("m2", "Team 2"), "user_a")
+        self.storage.save_match(make_match("m1", "Team 1 Updated"), "user_a")
+        self.assertTrue(self.storage.delete_match("m2", "user_a"))
+        self.assertFalse(self.storage.delete_match("m2", "user_a"))
+
+        matches = self.storage.get_all_matches("user_a")
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].opponent, "Team 1 Updated")
+
+    def test_compact_folds_journal_into_base(self):
+        """Test that compaction writes a plain JSON base readable by StorageManager"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.save_settings(AppSettings(club_name="Journal FC"), "user_a")
+        self.storage.save_subscription(Subscription(user_id="user_a", status="active"))
+
+        compacted = self.storage.compact_all()
+        self.assertIn('matches', compacted)
+        self.assertEqual(self._journal_lines('matches'), [])
+
+        plain = StorageManager(data_dir=self.temp_dir)
+        self.assertEqual(plain.get_match("m1", "user_a").opponent, "Test Team")
+        self.assertEqual(plain.load_settings("user_a").club_name, "Journal FC")
+        self.assertEqual(plain.get_subscription_by_user_id("user_a").user_id, "user_a")
+
+    def test_replay_after_interrupted_compaction(self):
+        """Test that replaying a journal already folded into the base is idempotent"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.save_match(make_match("m2"), "user_a")
+        self.storage.delete_match("m1", "user_a")
+
+        # Simulate a crash after the new base was written but before truncation
+        self.storage._write_base('matches', self.storage.load_matches())
+        self.assertEqual([m['id'] for m in self.storage.load_matches()], ["m2"])
+
+    def test_reset_discards_earlier_operations(self):
+        """Test that whole-collection saves supersede earlier journal entries"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage._save_matches([])
+        self.storage.save_match(make_match("m2"), "user_a")
+
+        self.assertEqual([m['id'] for m in self.storage.load_matches()], ["m2"])
+
+    def test_torn_write_is_recovered(self):
+        """Test that a partial final line is skipped and later appends still apply"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        with open(self.storage._journal_file('matches'), 'ab') as f:
+            f.write(b'{"op": "upsert", "record": {"id": "brok')
+        self.assertEqual(len(self.storage.load_matches()), 1)
+
+        self.storage.save_match(make_match("m2"), "user_a")
+        self.assertEqual([m['id'] for m in self.storage.load_matches()], ["m1", "m2"])
+
+    def test_bulk_writes_append_one_batch(self):
+        """Test that a bulk write is a single journal line replayed whole or not at all"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.bulk_upsert('matches', [make_match("m1", "Updated"), make_match("m2"), make_match("m3")], "user_a")
+        self.assertEqual(self.storage.bulk_delete('matches', ["m3"], "user_a"), 1)
+
+        self.assertEqual(len(self._journal_lines('matches')), 3)
+        self.assertEqual([(m.id, m.opponent) for m in self.storage.get_all_matches("user_a")],
+                         [("m1", "Updated"), ("m2", "Test Team")])
+
+        with open(self.storage._journal_file('matches'), 'ab') as f:
+            f.write(b'{"op": "batch", "ops": [{"op": "delete", "key": ["user_a", "m1"]}, {"op": "ups')
+        self.assertEqual(len(self.storage.load_matches("user_a")), 2)
+
+        self.storage.compact('matches')
+        self.assertEqual([m['id'] for m in StorageManager(data_dir=self.temp_dir).load_matches("user_a")], ["m1", "m2"])
+
+    def test_replay_is_cached_until_a_write(self):
+        """Test that reads reuse the replayed journal and see appends from another instance"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.load_matches("user_a")
+        hits = _collection_cache.hits
+        records = self.storage.load_matches("user_a")
+        self.assertEqual(_collection_cache.hits, hits + 1)
+
+        records[0]['opponent'] = "Edited"
+        self.assertEqual(self.storage.load_matches("user_a")[0]['opponent'], "Test Team")
+
+        other = JournaledStorageManager(data_dir=self.temp_dir, fsync=False)
+        other.save_match(make_match("m2"), "user_a")
+        self.assertEqual([m['id'] for m in self.storage.load_matches("user_a")], ["m1", "m2"])
+        other.compact('matches')
+        other.delete_match("m1", "user_a")
+        self.assertEqual([m['id'] for m in self.storage.load_matches("user_a")], ["m2"])
+
+    def test_users(self):
+        """Test journaled user creation and password updates"""
+        user = self.storage.create_user("player_one", "secret123")
+        self.assertIsNone(self.storage.create_user("player_one", "other"))
+        self.assertTrue(self.storage.update_user_password(user.id, "newsecret"))
+
+        loaded = self.storage.get_user_by_id(user.id)
+        self.assertTrue(self.storage.verify_password(loaded, "newsecret"))
+        self.assertEqual(len(self.storage.load_users()), 1)
+
+    def test_concurrent_create_user_adds_username_once(self):
+        """Test that workers racing to create the same username add one user"""
+        import multiprocessing
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.skipTest("fork start method not available")
+        ctx = multiprocessing.get_context('fork')
+        barrier, created = ctx.Barrier(4), ctx.Value('i', 0)
+        workers = [ctx.Process(target=_create_user_in_process, args=(self.temp_dir, "player_one", barrier, created))
+                   for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        self.assertEqual(created.value, 1)
+        self.assertEqual([u['username'] for u in self.storage.load_users()], ["player_one"])
+
+    def test_lookup_indexes_follow_journal_appends(self):
+        """Test that index lookups see records appended by another instance"""
+        self.assertIsNone(self.storage.get_subscription_by_user_id("user_a"))
+        other = JournaledStorageManager(data_dir=self.temp_dir, fsync=False)
+        other.save_subscription(Subscription(user_id="user_a", stripe_subscription_id="sub_1"))
+        self.assertEqual(self.storage.get_subscription_by_stripe_id("sub_1").user_id, "user_a")
+
+        other.compact_all()
+        other.delete_subscription("user_a")
+        self.assertIsNone(self.storage.get_subscription_by_user_id("user_a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import unittest
+import tempfile
+import os
+from datetime import datetime, timedelta
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.storage import StorageManager
+from app.sharded_storage import ShardedStorageManager
+from app.match_stats import UserMatchStats, period_cutoff
+from app.models import Match, MatchCategory, MatchResult, AppSettings
+from app.utils import filter_matches_by_period
+
+
+def make_match(match_id, days_ago=10, category=MatchCategory.LEAGUE, result=MatchResult.WIN,
+               goals=1, assists=0, minutes=60, is_fixture=False):
+    return Match(
+        id=match_id,
+        category=category,
+        date=(datetime.now() - timedelta(days=days_ago)).strftime("%d %b %Y"),
+        opponent="Test Team",
+        location="Test Stadium",
+        result=None if is_fixture else result,
+        score=None if is_fixture else "2 - 1",
+        brodie_goals=goals,
+        brodie_assists=assists,
+        minutes_played=minutes,
+        is_fixture=is_fixture
+    )
+
+
+def expected_summary(storage, user_id, period):
+    """Stats computed the original way, from Match objects"""
+    completed = [m for m in storage.get_all_matches(user_id) if not m.is_fixture]
+    filtered = filter_matches_by_period(completed, period, storage.load_settings(user_id).season_year)
+
+    def calc(match_list):
+        return {
+            "matches": len(match_list),
+            "goals": sum(m.brodie_goals for m in match_list),
+            "assists": sum(m.brodie_assists for m in match_list),
+            "minutes": sum(m.minutes_played for m in match_list)
+        }
+    return {
+        'season': {
+            "total_matches": len(filtered),
+            "wins": len([m for m in filtered if m.result == MatchResult.WIN]),
+            "draws": len([m for m in filtered if m.result == MatchResult.DRAW]),
+            "losses": len([m for m in filtered if m.result == MatchResult.LOSS]),
+            "goals": sum(m.brodie_goals for m in filtered),
+            "assists": sum(m.brodie_assists for m in filtered),
+            "minutes": sum(m.minutes_played for m in filtered)
+        },
+        'pre_season': calc([m for m in filtered if m.category == MatchCategory.PRE_SEASON_FRIENDLY]),
+        'league': calc([m for m in filtered if m.category == MatchCategory.LEAGUE])
+    }
+
+
+PERIODS = ['all_time', 'season', '12_months', '6_months', '3_months', 'last_month']
+
+
+class TestMaterializedMatchStats(unittest.TestCase):
+    storage_class = StorageManager
+
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = self.storage_class(data_dir=self.temp_dir)
+        self.storage.save_settings(AppSettings(season_year=f"{datetime.now().year - 1}/{str(datetime.now().year)[2:]}"), "user_a")
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def assertMatchesOriginal(self, user_id="user_a"):
+        for period in PERIODS:
+            self.assertEqual(self.storage.get_stats_summary(user_id, period), expected_summary(self.storage, user_id, period), period)
+
+    def test_incremental_updates_match_full_recalculation(self):
+        """Test stats after saves, updates and deletes equal a full recalculation"""
+        self.storage.save_match(make_match("m1", days_ago=5, goals=2), "user_a")
+        self.assertMatchesOriginal()  # Builds the view
+
+        self.storage.save_match(make_match("m2", days_ago=100, result=MatchResult.DRAW, assists=2), "user_a")
+        self.storage.save_match(make_match("m3", days_ago=300, category=MatchCategory.PRE_SEASON_FRIENDLY,
+                                           result=MatchResult.LOSS, minutes=45), "user_a")
+        self.storage.save_match(make_match("m4", days_ago=-7, is_fixture=True), "user_a")
+        self.storage.save_match(make_match("m1", days_ago=5, goals=4), "user_a")
+        self.storage.save_match(make_match("x1", days_ago=3, goals=9), "user_b")
+        self.assertTrue(self.storage.delete_match("m2", "user_a"))
+        self.assertMatchesOriginal()
+        self.assertEqual(self.storage.get_season_stats("user_b")["goals"], 9)
+
+        # The views were kept up to date rather than rebuilt
+        self.assertIn("user_a", self.storage._match_stats)
+        self.assertEqual(self.storage._match_stats["user_a"][0], self.storage._matches_signature("user_a"))
+
+    def test_import_and_category_stats(self):
+        """Test imported matches are counted and category stats include fixtures"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.get_season_stats("user_a")
+        self.storage.import_data({"matches": [
+            make_match("m2", days_ago=14, goals=3).model_dump(),
+            make_match("m3", is_fixture=True, days_ago=-3).model_dump()
+        ]}, "user_a")
+
+        self.assertEqual(self.storage.get_season_stats("user_a")["goals"], 4)
+        self.assertEqual(self.storage.get_category_stats("League", "user_a")["matches"], 3)
+        self.assertMatchesOriginal()
+
+    def test_all_periods_at_once(self):
+        """Test get_all_period_stats matches each period computed separately"""
+        for i, days_ago in enumerate([1, 20, 45, 100, 200, 400, 800]):
+            self.storage.save_match(make_match(f"m{i}", days_ago=days_ago, goals=i,
+                                               category=MatchCategory.PRE_SEASON_FRIENDLY if i % 2 else MatchCategory.LEAGUE), "user_a")
+
+        all_periods = self.storage.get_all_period_stats("user_a")
+        self.assertEqual(list(all_periods), PERIODS)
+        for period in PERIODS:
+            self.assertEqual(all_periods[period], expected_summary(self.storage, "user_a", period), period)
+
+        # Suffix sums are recomputed after a change
+        self.storage.delete_match("m0", "user_a")
+        self.assertEqual(self.storage.get_all_period_stats("user_a")['last_month']['season']['total_matches'], 1)
+
+    def test_invalid_records_are_not_counted(self):
+        """Test records get_all_matches would skip are left out of the stats too"""
+        self.storage.save_match(make_match("m1", goals=2), "user_a")
+        invalid = dict(make_match("bad", goals=7).model_dump(), category="Not a category", user_id="user_a")
+        self.storage._save_matches(self.storage.load_matches() + [invalid])
+        self.assertEqual(self.storage.get_season_stats("user_a")["goals"], 2)
+        self.assertMatchesOriginal()
+
+        self.assertTrue(self.storage.delete_match("bad", "user_a"))
+        self.assertEqual(self.storage.get_season_stats("user_a")["goals"], 2)
+        self.assertMatchesOriginal()
+
+    def test_changes_from_another_instance_rebuild(self):
+        """Test a write from another worker invalidates the view"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.assertEqual(self.storage.get_season_stats("user_a")["total_matches"], 1)
+
+        other = self.storage_class(data_dir=self.temp_dir)
+        other.save_match(make_match("m2"), "user_a")
+        self.assertEqual(self.storage.get_season_stats("user_a")["total_matches"], 2)
+        self.assertEqual(self.storage.rebuild_match_stats(), 1)
+
+
+class TestShardedMaterializedMatchStats(TestMaterializedMatchStats):
+    storage_class = ShardedStorageManager
+
+
+class TestUserMatchStats(unittest.TestCase):
+    def test_period_cutoff(self):
+        """Test cutoffs mirror filter_matches_by_period"""
+        now = datetime(2025, 10, 23, 12, 0)
+        self.assertIsNone(period_cutoff('all_time'))
+        self.assertIsNone(period_cutoff('season', None))
+        self.assertIsNone(period_cutoff('season', 'bad'))
+        self.assertEqual(period_cutoff('season', '2025/26'), datetime(2025, 7, 1))
+        self.assertEqual(period_cutoff('last_month', now=now), now - timedelta(days=30))
+
+    def test_remove_restores_empty_state(self):
+        """Test removing every record leaves no empty buckets behind"""
+        record = make_match("m1").model_dump()
+        stats = UserMatchStats([record])
+        stats.remove(record)
+        self.assertEqual((stats.completed, stats.days, stats._sorted_days), ({}, {}, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,20 @@
 import unittest
 import tempfile
 import os
+import io
 from datetime import datetime
 
 # Add the app directory to the path
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
 
-from app.pdf import PDFGenerator, generate_season_pdf
-from app.models import Match, MatchCategory, MatchResult, AppSettings
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import LongTable, Paragraph
+
+from app.pdf import PDFGenerator, ScoutPDFGenerator, PlayerResumePDFGenerator, generate_season_pdf
+from app.pdf_fragments import get_fragment_cache
+from app.pdf_tables import lean_cell
+from app.models import Match, MatchCategory, MatchResult, AppSettings, Achievement, ClubHistory, PhysicalMeasurement
 
 
 class TestPDFGenerator(unittest.TestCase):
@@ -96,7 +102,18 @@ class TestPDFGenerator(unittest.TestCase):
             filename = os.path.basename(result_path)
             self.assertTrue(filename.startswith("Al_Qadsiah_U12_Brodie_Hardy_Season_Tracker"))
             self.assertTrue(filename.endswith(".pdf"))
-    
+
+    def test_generate_season_pdf_into_buffer(self):
+        """Rendering into a file-like target writes nothing to the output directory"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            buffer = io.BytesIO()
+            filename = generate_season_pdf(self.test_matches, self.settings, temp_dir, target=buffer)
+
+            self.assertEqual(os.listdir(temp_dir), [])
+            self.assertTrue(filename.endswith(".pdf"))
+            self.assertEqual(os.path.basename(filename), filename)
+            self.assertTrue(buffer.getvalue().startswith(b"%PDF"))
+
     def test_pdf_with_empty_matches(self):
         """Test PDF generation with empty match list"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -138,6 +155,86 @@ class TestPDFGenerator(unittest.TestCase):
             file_size = os.path.getsize(result_path)
             self.assertGreater(file_size, 0)
     
+    def test_styles_shared_per_theme(self):
+        """Generators with the same theme share one read-only stylesheet"""
+        other = PDFGenerator(AppSettings())
+        self.assertIs(other.styles, self.generator.styles)
+        self.assertIs(other.primary_color, self.generator.primary_color)
+        self.assertIn('CustomTitle', other.styles)
+        self.assertIs(ScoutPDFGenerator(AppSettings()).styles, self.generator.styles)
+
+        themed = PDFGenerator(AppSettings(primary_color="#123456"))
+        self.assertIsNot(themed.styles, self.generator.styles)
+        self.assertEqual(themed.styles['CustomTitle'].textColor.hexval(), '0x123456')
+
+        with self.assertRaises(TypeError):
+            other.styles.add(ParagraphStyle(name='Extra'))
+
+    def test_season_matches_table_is_chunked(self):
+        """Long histories become fixed-size LongTables with plain-string cells where text fits"""
+        matches = [self.test_matches[0].model_copy(update={"opponent": f"Team {i}"}) for i in range(250)]
+        elements = self.generator._create_season_matches_table(matches)
+        tables = [e for e in elements if isinstance(e, LongTable)]
+
+        self.assertEqual([len(t._cellvalues) - 1 for t in tables], [100, 100, 50])
+        self.assertTrue(all(t.repeatRows == 1 for t in tables))
+        first_row = tables[0]._cellvalues[1]
+        self.assertEqual(first_row[0], "1")
+        self.assertEqual(tables[1]._cellvalues[1][0], "101")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result_path = self.generator.generate_pdf(matches, os.path.join(temp_dir, "long.pdf"))
+            self.assertGreater(os.path.getsize(result_path), 0)
+
+    def test_lean_cell_wraps_only_long_text(self):
+        style = self.generator.styles['TableCell']
+        self.assertEqual(lean_cell("Home", style, 72), "Home")
+        self.assertIsInstance(lean_cell("A very long location name that needs wrapping", style, 72), Paragraph)
+        self.assertIsInstance(lean_cell("Tom & Jerry", style, 720), Paragraph)
+
+    def test_static_sections_reused_across_renders(self):
+        """Adding a match rebuilds only the match-driven sections"""
+        cache = get_fragment_cache()
+        cache.clear()
+        settings = AppSettings(player_name="Test Player", club_name="Test FC")
+        achievements = [Achievement(id="a1", title="Top Scorer", category="Season", date="01 Jun 2025")]
+        club_history = [ClubHistory(id="c1", club_name="Old FC", season="2024/25")]
+
+        for generator_class in (ScoutPDFGenerator, PlayerResumePDFGenerator):
+            hits, misses = cache.hits, cache.misses
+            first = io.BytesIO()
+            generator_class(settings).generate_pdf(self.test_matches[:2], first, achievements, club_history)
+            sections = cache.misses - misses
+            self.assertGreater(sections, 0)
+            self.assertEqual(cache.hits, hits)
+
+            second = io.BytesIO()
+            generator_class(settings).generate_pdf(self.test_matches, second, achievements, club_history)
+            self.assertEqual(cache.misses - misses, sections)
+            self.assertEqual(cache.hits - hits, sections)
+            self.assertTrue(second.getvalue().startswith(b'%PDF'))
+
+            renamed = [achievements[0].model_copy(update={"title": "Player of the Year"})]
+            generator_class(settings).generate_pdf(self.test_matches, io.BytesIO(), renamed, club_history)
+            self.assertEqual(cache.misses - misses, sections + 1)
+
+        # Long sections push headers onto the next page; layout state left on
+        # them by one render must not carry into the next
+        achievements = [Achievement(id=f"a{i}", title="Player of the tournament at the regional cup " * 3,
+                                    category="Season", date="01 Jun 2025", season="2024/25") for i in range(15)]
+        club_history = [ClubHistory(id=f"c{i}", club_name=f"Club {i}", season="2024/25", age_group="U12",
+                                    position="Forward", achievements="Won the league") for i in range(8)]
+        measurements = [PhysicalMeasurement(id=f"p{i}", date=f"01 Jan {2019 + i}", height_cm=130 + 5 * i,
+                                            weight_kg=30 + 3 * i) for i in range(6)]
+        renders = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            ScoutPDFGenerator(settings).generate_pdf(self.test_matches, buffer, achievements, club_history,
+                                                     physical_measurements=measurements)
+            renders.append(buffer.getvalue())
+        self.assertTrue(all(render.startswith(b'%PDF') for render in renders))
+        self.assertEqual(renders[0].count(b'/Type /Page\n'), renders[1].count(b'/Type /Page\n'))
+
     def test_calculate_category_stats(self):
         """Test category statistics calculation"""
         # Test pre-season stats
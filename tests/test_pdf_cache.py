@@ -0,0 +1,97 @@
+import unittest
+import tempfile
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.pdf_cache import PDFCache, report_cache_key
+from app.pdf_jobs import render_job, _write_job, JOB_DONE
+from app.models import Match, MatchCategory, MatchResult, AppSettings
+
+
+def make_match(goals=1):
+    return Match(
+        category=MatchCategory.LEAGUE,
+        date="25 Oct 2025",
+        opponent="League Team",
+        location="League Stadium",
+        result=MatchResult.WIN,
+        score="3 - 1",
+        brodie_goals=goals,
+        brodie_assists=0,
+        minutes_played=60
+    )
+
+
+class TestPDFCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = PDFCache(os.path.join(self.temp_dir, 'cache'))
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _source(self, name, size):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'%PDF' + b'x' * (size - 4))
+        return path
+
+    def test_key_depends_on_inputs(self):
+        """Equal inputs share a key; any change to data, kind or date gives a new one"""
+        settings = AppSettings()
+        today = date(2025, 11, 1)
+        key = report_cache_key('season', {'matches': [make_match()], 'settings': settings, 'period': 'season'}, today)
+        self.assertEqual(key, report_cache_key('season', {'period': 'season', 'settings': AppSettings(), 'matches': [make_match()]}, today))
+        self.assertNotEqual(key, report_cache_key('season', {'matches': [make_match(2)], 'settings': settings, 'period': 'season'}, today))
+        self.assertNotEqual(key, report_cache_key('scout', {'matches': [make_match()], 'settings': settings, 'period': 'season'}, today))
+        self.assertNotEqual(key, report_cache_key('season', {'matches': [make_match()], 'settings': settings, 'period': 'season'}, date(2025, 11, 2)))
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get('a' * 64))
+        self.cache.put('a' * 64, self._source('report.pdf', 100))
+        path, filename = self.cache.get('a' * 64)
+        self.assertEqual(filename, 'report.pdf')
+        self.assertEqual(path.read_bytes()[:4], b'%PDF')
+
+    def test_lru_eviction(self):
+        """Least recently used reports are evicted once the size budget is exceeded"""
+        self.cache.max_bytes = 250
+        self.cache.put('a' * 64, self._source('a.pdf', 100))
+        self.cache.put('b' * 64, self._source('b.pdf', 100))
+        # Make 'a' the most recently used entry
+        old = time.time() - 60
+        os.utime(self.cache.cache_dir / ('b' * 64 + '.pdf'), (old, old))
+        os.utime(self.cache.cache_dir / ('a' * 64 + '.pdf'), (old - 60, old - 60))
+        self.assertIsNotNone(self.cache.get('a' * 64))
+
+        self.cache.put('c' * 64, self._source('c.pdf', 100))
+        self.assertIsNotNone(self.cache.get('a' * 64))
+        self.assertIsNone(self.cache.get('b' * 64))
+        self.assertIsNotNone(self.cache.get('c' * 64))
+
+    def test_render_job_populates_cache(self):
+        """A finished job stores its PDF so the repeat request is a cache hit"""
+        job_dir = Path(self.temp_dir) / 'job'
+        job_dir.mkdir()
+        _write_job(job_dir, {'id': 'job', 'created_at': time.time()})
+        kwargs = {'matches': [make_match()], 'settings': AppSettings()}
+        key = report_cache_key('season', kwargs)
+
+        job = render_job(str(job_dir), 'season', kwargs, self.cache, key)
+        self.assertEqual(job['status'], JOB_DONE)
+        path, filename = self.cache.get(key)
+        self.assertEqual(filename, job['filename'])
+        self.assertEqual(path.read_bytes(), (job_dir / job['filename']).read_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import tempfile
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app import pdf_jobs
+from app.pdf_jobs import PDFJobQueue, JobRejected, JOB_DONE, JOB_FAILED, JOB_QUEUED
+from app.models import Match, MatchCategory, MatchResult, AppSettings
+
+
+class TestPDFJobQueue(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.queue = PDFJobQueue(self.temp_dir, workers=1, max_pending=4, max_jobs_per_user=1)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        if self.queue._executor is not None:
+            self.queue._executor.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir)
+
+    def _write_job(self, **job):
+        job.setdefault('id', os.urandom(16).hex())
+        job.setdefault('created_at', time.time())
+        job_dir = self.queue._job_dir(job['id'], job['user_id'])
+        job_dir.mkdir(parents=True)
+        pdf_jobs._write_job(job_dir, job)
+        return job
+
+    def _wait(self, job_id, user_id, timeout=60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.queue.get_job(job_id, user_id)
+            if job['status'] in (JOB_DONE, JOB_FAILED):
+                return job
+            time.sleep(0.1)
+        self.fail("PDF job did not finish")
+
+    def test_render_season_pdf_in_pool(self):
+        """A submitted job renders in the pool and records its timings"""
+        matches = [
+            Match(
+                category=MatchCategory.LEAGUE,
+                date="25 Oct 2025",
+                opponent="League Team",
+                location="League Stadium",
+                result=MatchResult.WIN,
+                score="3 - 1",
+                brodie_goals=2,
+                brodie_assists=1,
+                minutes_played=60
+            )
+        ]
+        job = self.queue.submit('user1', 'season', {'matches': matches, 'settings': AppSettings()})
+        self.assertEqual(job['status'], JOB_QUEUED)
+
+        finished = self._wait(job['id'], 'user1')
+        self.assertEqual(finished['status'], JOB_DONE, finished.get('error'))
+        self.assertGreaterEqual(finished['render_seconds'], 0)
+        pdf_path = self.queue.get_result_path(finished)
+        self.assertTrue(pdf_path.name.endswith('.pdf'))
+        with open(pdf_path, 'rb') as f:
+            self.assertEqual(f.read(4), b'%PDF')
+
+        # Other users can't see the job
+        self.assertIsNone(self.queue.get_job(job['id'], 'user2'))
+        self.assertIsNone(self.queue.get_job('../etc', 'user1'))
+
+    def test_per_user_limit(self):
+        """A user with an unfinished job is refused another"""
+        self._write_job(user_id='user1', kind='season', status=JOB_QUEUED)
+        with self.assertRaises(JobRejected) as ctx:
+            self.queue.submit('user1', 'season', {})
+        self.assertEqual(ctx.exception.status_code, 429)
+
+    def test_queue_depth_limit(self):
+        """Submissions beyond max_pending are refused"""
+        self.queue.max_pending = 0
+        with self.assertRaises(JobRejected) as ctx:
+            self.queue.submit('user1', 'season', {})
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(list(self.queue._iter_jobs()), [])
+
+    def test_stale_jobs_expire_and_are_cleaned_up(self):
+        """Lost jobs stop counting against the user and old jobs are deleted"""
+        old = time.time() - pdf_jobs.JOB_TIMEOUT_SECONDS - pdf_jobs.JOB_RETENTION_SECONDS - 1
+        stale = self._write_job(user_id='user1', kind='season', status=JOB_QUEUED, created_at=old)
+        self.assertEqual(self.queue.get_job(stale['id'], 'user1')['status'], JOB_FAILED)
+        self.assertEqual(self.queue.active_jobs_for_user('user1'), 0)
+
+        self.assertEqual(self.queue.cleanup(), 1)
+        self.assertIsNone(self.queue.get_job(stale['id'], 'user1'))
+
+    def test_concurrent_submits_respect_user_limit(self):
+        """Submits racing from several queues (as from several workers) admit one job per user"""
+        class HeldExecutor:
+            # Accepts jobs without running them, so they stay queued
+            def submit(self, *args):
+                return Future()
+
+            def shutdown(self, wait=True):
+                pass
+
+        queues = [PDFJobQueue(self.temp_dir, workers=1, max_pending=4, max_jobs_per_user=1) for _ in range(4)]
+        for queue in queues:
+            queue._executor, queue._executor_pid = HeldExecutor(), os.getpid()
+
+        def submit(queue):
+            try:
+                return queue.submit('user1', 'season', {})['id']
+            except JobRejected as e:
+                return e.status_code
+
+        with ThreadPoolExecutor(max_workers=len(queues)) as pool:
+            results = list(pool.map(submit, queues))
+        self.assertEqual(results.count(429), 3)
+        self.assertEqual(self.queue.active_jobs_for_user('user1'), 1)
+        self.assertEqual(self.queue.active_jobs_for_user('user2'), 0)
+
+    def test_cleanup_runs_at_most_once_per_interval(self):
+        """Submits only sweep old jobs when the cleanup interval has passed"""
+        old = time.time() - pdf_jobs.JOB_RETENTION_SECONDS - 1
+        self.queue._last_cleanup = time.monotonic()
+        stale = self._write_job(user_id='user2', kind='season', status=JOB_DONE, created_at=old, finished_at=old)
+        self.queue.max_pending = 0
+        with self.assertRaises(JobRejected):
+            self.queue.submit('user1', 'season', {})
+        self.assertIsNotNone(self.queue.get_job(stale['id'], 'user2'))
+
+        self.queue._last_cleanup -= pdf_jobs.CLEANUP_INTERVAL_SECONDS
+        with self.assertRaises(JobRejected):
+            self.queue.submit('user1', 'season', {})
+        self.assertIsNone(self.queue.get_job(stale['id'], 'user2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
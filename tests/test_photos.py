@@ -0,0 +1,126 @@
+import unittest
+import tempfile
+import os
+import io
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from PIL import Image as PILImage
+from reportlab.platypus import Image, Table
+
+from app.photos import create_photo_variants, get_photo_variant, variant_path
+from app.pdf import ScoutPDFGenerator, generate_scout_pdf
+from app.pdf_profiles import get_pdf_profile
+from app.models import AppSettings
+
+
+class TestPhotoVariants(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with a large transparent PNG upload"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.photo_path = os.path.join(self.temp_dir, 'player_photo_abc.png')
+        PILImage.new('RGBA', (3000, 4000), (200, 30, 30, 128)).save(self.photo_path)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_create_variants(self):
+        variants = create_photo_variants(self.photo_path)
+        self.assertEqual(set(variants), {'thumb', 'print', 'screen'})
+        with PILImage.open(variants['print']) as img:
+            self.assertEqual(img.format, 'JPEG')
+            self.assertEqual(img.mode, 'RGB')
+            self.assertEqual(img.size, (675, 900))
+        with PILImage.open(variants['thumb']) as img:
+            self.assertEqual(img.size, (192, 256))
+        self.assertLess(os.path.getsize(variants['print']), os.path.getsize(self.photo_path))
+
+    def test_variant_created_on_first_use(self):
+        """Photos uploaded before variants existed get them lazily"""
+        print_path = variant_path(self.photo_path, 'print')
+        self.assertFalse(os.path.exists(print_path))
+        self.assertEqual(get_photo_variant(self.photo_path, 'print'), print_path)
+        self.assertTrue(os.path.exists(print_path))
+        self.assertIsNone(get_photo_variant(os.path.join(self.temp_dir, 'missing.png'), 'print'))
+
+    def test_pdf_uses_print_variant(self):
+        settings = AppSettings(player_photo_path=self.photo_path)
+        elements = ScoutPDFGenerator(settings)._create_player_media_section()
+        images = [e._cellvalues[0][0] for e in elements if isinstance(e, Table) and isinstance(e._cellvalues[0][0], Image)]
+        self.assertEqual(len(images), 1)
+        self.assertEqual(images[0].filename, variant_path(self.photo_path, 'print'))
+
+    def test_optimized_profile_embeds_screen_variant(self):
+        settings = AppSettings(player_photo_path=self.photo_path)
+        elements = ScoutPDFGenerator(settings, 'optimized')._create_player_media_section()
+        images = [e._cellvalues[0][0] for e in elements if isinstance(e, Table) and isinstance(e._cellvalues[0][0], Image)]
+        self.assertEqual(images[0].filename, variant_path(self.photo_path, 'screen'))
+
+        sizes = {}
+        for profile in ('default', 'optimized'):
+            target = io.BytesIO()
+            generate_scout_pdf([], settings, [], [], target=target, profile=profile)
+            sizes[profile] = len(target.getvalue())
+        self.assertLess(sizes['optimized'], sizes['default'])
+
+        with self.assertRaises(ValueError):
+            get_pdf_profile('tiny')
+
+
+class TestServePhoto(unittest.TestCase):
+    def setUp(self):
+        """Set up a minimal app whose data/photos lives in a temporary directory"""
+        from flask import Flask
+        from flask_login import LoginManager
+        from app import routes
+
+        self.temp_dir = tempfile.mkdtemp()
+        photos_dir = os.path.join(self.temp_dir, 'data', 'photos')
+        os.makedirs(photos_dir)
+        os.makedirs(os.path.join(self.temp_dir, 'app'))
+        PILImage.new('RGB', (800, 600), (10, 120, 40)).save(os.path.join(photos_dir, 'player_photo_abc.jpg'))
+
+        app = Flask(__name__, root_path=os.path.join(self.temp_dir, 'app'))
+        app.config['LOGIN_DISABLED'] = True
+        LoginManager().init_app(app)
+        app.register_blueprint(routes.bp)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        os.environ.pop('PHOTO_ACCEL_REDIRECT_PREFIX', None)
+        shutil.rmtree(self.temp_dir)
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get('/data/photos/player_photo_abc.jpg')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('max-age=', response.headers['Cache-Control'])
+        self.assertGreater(len(response.data), 0)
+
+        response = self.client.get('/data/photos/player_photo_abc.jpg', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        thumb = self.client.get('/data/photos/player_photo_abc.jpg?variant=thumb')
+        self.assertEqual(thumb.status_code, 200)
+        self.assertNotEqual(thumb.headers['ETag'], etag)
+
+    def test_accel_redirect(self):
+        os.environ['PHOTO_ACCEL_REDIRECT_PREFIX'] = '/_protected_photos/'
+        response = self.client.get('/data/photos/player_photo_abc.jpg?variant=thumb')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Accel-Redirect'], '/_protected_photos/player_photo_abc_thumb.jpg')
+        self.assertEqual(response.mimetype, 'image/jpeg')
+        self.assertEqual(response.data, b'')
+        self.assertIn('ETag', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
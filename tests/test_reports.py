@@ -0,0 +1,70 @@
+import unittest
+import tempfile
+import os
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.reports import generate_all_reports, build_player_from_data
+from app.reports.generators import REPORT_GENERATORS
+from app.models import Match, MatchCategory, MatchResult, AppSettings, PhysicalMeasurement
+
+
+class TestGenerateAllReports(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory and report data"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = AppSettings(player_name="Test Player", position="Forward", season_year="2025/26",
+                                    date_of_birth="15 Mar 2013")
+        self.matches = [
+            Match(
+                category=MatchCategory.LEAGUE,
+                date=f"{day} Oct 2025",
+                opponent=f"Team {day}",
+                location="Test Stadium",
+                result=MatchResult.WIN,
+                score="3 - 1",
+                brodie_goals=2,
+                brodie_assists=1,
+                minutes_played=60
+            )
+            for day in range(10, 15)
+        ]
+        self.measurements = [
+            PhysicalMeasurement(id=f"p{year}", date=f"01 Jan {year}", height_cm=height, weight_kg=height * 0.3)
+            for year, height in ((2022, 140.0), (2023, 146.0), (2024, 155.0), (2025, 161.0))
+        ]
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, name, **kwargs):
+        output_dir = os.path.join(self.temp_dir, name)
+        os.makedirs(output_dir)
+        return generate_all_reports(self.settings, self.matches, physical_measurements=self.measurements,
+                                    output_dir=output_dir, **kwargs)
+
+    def test_parallel_matches_serial(self):
+        """Test parallel and serial generation return the same reports and timings"""
+        self.assertIsNotNone(build_player_from_data(self.settings, self.matches, self.measurements).phv)
+
+        serial = self._generate('serial')
+        parallel = self._generate('parallel', parallel=True)
+
+        self.assertEqual(set(serial), set(REPORT_GENERATORS) | {'timings'})
+        self.assertEqual(set(parallel), set(serial))
+        for results in (serial, parallel):
+            self.assertEqual(set(results['timings']), set(REPORT_GENERATORS))
+            for report in REPORT_GENERATORS:
+                self.assertGreaterEqual(results['timings'][report], 0)
+                with open(results[report], 'rb') as f:
+                    self.assertEqual(f.read(4), b'%PDF')
+        self.assertEqual({r: os.path.basename(serial[r]).rsplit('_', 2)[0] for r in REPORT_GENERATORS},
+                         {r: os.path.basename(parallel[r]).rsplit('_', 2)[0] for r in REPORT_GENERATORS})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import tempfile
+import os
+import json
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.storage import StorageManager
+from app.sharded_storage import ShardedStorageManager, migrate_flat_to_sharded
+from app.models import Match, MatchCategory, MatchResult, AppSettings
+
+
+def make_match(match_id, opponent="Test Team"):
+    return Match(
+        id=match_id,
+        category=MatchCategory.LEAGUE,
+        date="23 Oct 2025",
+        opponent=opponent,
+        location="Test Stadium",
+        result=MatchResult.WIN,
+        score="2 - 1",
+        brodie_goals=1,
+        minutes_played=30
+    )
+
+
+class TestShardedStorageManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = ShardedStorageManager(data_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_only_touches_own_shard(self):
+        """Test that each user's matches live in their own file"""
+        self.storage.save_match(make_match("m1", "Team A"), "user_a")
+        self.storage.save_match(make_match("m1", "Team B"), "user_b")
+
+        shard_a = os.path.join(self.temp_dir, "users", "user_a", "matches.json")
+        with open(shard_a, 'r', encoding='utf-8') as f:
+            self.assertEqual([m['opponent'] for m in json.load(f)], ["Team A"])
+
+        self.assertEqual(self.storage.get_match("m1", "user_b").opponent, "Team B")
+        self.assertEqual(len(self.storage.load_matches()), 2)
+
+    def test_update_and_delete(self):
+        """Test updating and deleting within a shard"""
+        self.storage.save_match(make_match("m1", "Team 1"), "user_a")
+        self.storage.save_match(make_match("m1", "Team 1 Updated"), "user_a")
+        self.assertEqual(self.storage.get_match("m1", "user_a").opponent, "Team 1 Updated")
+
+        self.assertTrue(self.storage.delete_match("m1", "user_a"))
+        self.assertFalse(self.storage.delete_match("m1", "user_a"))
+        self.assertEqual(self.storage.get_all_matches("user_a"), [])
+
+    def test_bulk_writes(self):
+        """Test that bulk writes rewrite only the user's shard"""
+        self.storage.save_match(make_match("m1", "Team B"), "user_b")
+        shard_b = os.path.join(self.temp_dir, "users", "user_b", "matches.json")
+        mtime = os.stat(shard_b).st_mtime_ns
+
+        self.assertEqual(self.storage.bulk_upsert('matches', [make_match("m1"), make_match("m2")], "user_a").inserted, 2)
+        self.assertEqual(self.storage.bulk_delete('matches', ["m1"], "user_a"), 1)
+        self.assertEqual([m.id for m in self.storage.get_all_matches("user_a")], ["m2"])
+        self.assertEqual(os.stat(shard_b).st_mtime_ns, mtime)
+
+    def test_settings_are_per_user(self):
+        """Test settings are stored in the user's shard"""
+        self.storage.save_settings(AppSettings(club_name="Shard FC"), "user_a")
+        self.assertEqual(self.storage.load_settings("user_a").club_name, "Shard FC")
+        self.assertEqual(self.storage.load_settings("user_b").club_name, AppSettings().club_name)
+        self.assertIn("user_a", self.storage._load_user_settings())
+
+    def test_rejects_unsafe_user_ids(self):
+        """Test that user ids cannot escape the shard directory"""
+        with self.assertRaises(ValueError):
+            self.storage.load_matches("../etc")
+
+    def test_delete_user_removes_shard(self):
+        """Test deleting a user removes their shard directory"""
+        user = self.storage.create_user("player_one", "secret123")
+        self.storage.save_match(make_match("m1"), user.id)
+
+        self.assertTrue(self.storage.delete_user(user.id))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "users", user.id)))
+
+    def test_migrate_flat_to_sharded(self):
+        """Test migrating flat files into per-user shards"""
+        flat = StorageManager(data_dir=self.temp_dir)
+        flat.save_match(make_match("m1", "Team A"), "user_a")
+        flat.save_match(make_match("m2", "Team B"), "user_b")
+        flat.save_settings(AppSettings(club_name="Flat FC"), "user_a")
+        flat._save_achievements(flat.load_achievements() + [{"id": "legacy", "title": "Old"}])
+
+        counts = migrate_flat_to_sharded(self.temp_dir)
+        self.assertEqual(counts['matches'], 2)
+        self.assertEqual(counts['settings'], 1)
+
+        sharded = ShardedStorageManager(data_dir=self.temp_dir)
+        self.assertEqual(sharded.get_match("m1", "user_a").opponent, "Team A")
+        self.assertEqual(sharded.load_settings("user_a").club_name, "Flat FC")
+        self.assertEqual(len(sharded.load_matches()), 2)
+        # Unowned records stay in the flat file
+        self.assertEqual([a['id'] for a in sharded.load_achievements()], ["legacy"])
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "matches.json.bak")))
+
+        # Re-running the migration is harmless
+        migrate_flat_to_sharded(self.temp_dir)
+        self.assertEqual(len(sharded.load_matches()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
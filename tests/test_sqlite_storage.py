@@ -0,0 +1,187 @@
+import unittest
+import tempfile
+import os
+import json
+
+# Add the app directory to the path
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from app.storage import StorageManager
+from app.sqlite_storage import SQLiteStorageManager, migrate_json_to_sqlite
+from app.models import Match, MatchCategory, MatchResult, AppSettings, Subscription, SubscriptionStatus, Reference
+
+
+def make_match(match_id, opponent="Test Team", result=MatchResult.WIN, goals=1):
+    return Match(
+        id=match_id,
+        category=MatchCategory.LEAGUE,
+        date="23 Oct 2025",
+        opponent=opponent,
+        location="Test Stadium",
+        result=result,
+        score="2 - 1",
+        brodie_goals=goals,
+        brodie_assists=0,
+        minutes_played=30
+    )
+
+
+class TestSQLiteStorageManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = SQLiteStorageManager(data_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_are_scoped_to_user(self):
+        """Test that match queries only return the requesting user's rows"""
+        self.storage.save_match(make_match("m1", "Team 1"), "user_a")
+        self.storage.save_match(make_match("m1", "Team 2"), "user_b")
+
+        self.assertEqual(len(self.storage.get_all_matches("user_a")), 1)
+        self.assertEqual(self.storage.get_match("m1", "user_b").opponent, "Team 2")
+        self.assertEqual(len(self.storage.load_matches()), 2)
+
+    def test_save_match_updates_in_place(self):
+        """Test that saving an existing match ID updates it without reordering"""
+        self.storage.save_match(make_match("m1", "Team 1"), "user_a")
+        self.storage.save_match(make_match("m2", "Team 2"), "user_a")
+        self.storage.save_match(make_match("m1", "Team 1 Updated"), "user_a")
+
+        matches = self.storage.get_all_matches("user_a")
+        self.assertEqual([m.id for m in matches], ["m1", "m2"])
+        self.assertEqual(matches[0].opponent, "Team 1 Updated")
+
+    def test_delete_match(self):
+        """Test deleting a match only affects the owning user"""
+        self.storage.save_match(make_match("m1"), "user_a")
+        self.storage.save_match(make_match("m1"), "user_b")
+
+        self.assertTrue(self.storage.delete_match("m1", "user_a"))
+        self.assertFalse(self.storage.delete_match("m1", "user_a"))
+        self.assertIsNone(self.storage.get_match("m1", "user_a"))
+        self.assertIsNotNone(self.storage.get_match("m1", "user_b"))
+
+    def test_season_stats(self):
+        """Test that inherited stats work on top of the SQLite loaders"""
+        self.storage.save_match(make_match("m1", goals=2), "user_a")
+        self.storage.save_match(make_match("m2", result=MatchResult.LOSS, goals=1), "user_a")
+
+        stats = self.storage.get_season_stats("user_a")
+        self.assertEqual(stats['total_matches'], 2)
+        self.assertEqual(stats['wins'], 1)
+        self.assertEqual(stats['losses'], 1)
+        self.assertEqual(stats['goals'], 3)
+
+    def test_user_lookups(self):
+        """Test user lookups by id, username and case-insensitive email"""
+        user = self.storage.create_user("player_one", "secret123", "Player@Example.com")
+        self.assertIsNotNone(user)
+        self.assertIsNone(self.storage.create_user("player_one", "other", None))
+
+        self.assertEqual(self.storage.get_user_by_id(user.id).username, "player_one")
+        self.assertEqual(self.storage.get_user_by_username(" player_one ").id, user.id)
+        self.assertEqual(self.storage.get_user_by_email("player@example.com").id, user.id)
+
+        self.assertTrue(self.storage.update_user_password(user.id, "newsecret"))
+        updated = self.storage.get_user_by_id(user.id)
+        self.assertTrue(self.storage.verify_password(updated, "newsecret"))
+
+    def test_subscription_lookups(self):
+        """Test subscription upsert and lookup by user and Stripe ID"""
+        subscription = Subscription(user_id="user_a", stripe_subscription_id="sub_1", status="active")
+        self.storage.save_subscription(subscription)
+        subscription.stripe_subscription_id = "sub_2"
+        self.storage.save_subscription(subscription)
+
+        self.assertEqual(len(self.storage.load_subscriptions()), 1)
+        self.assertEqual(self.storage.get_subscription_by_user_id("user_a").status, SubscriptionStatus.ACTIVE)
+        self.assertIsNone(self.storage.get_subscription_by_stripe_id("sub_1"))
+        self.assertEqual(self.storage.get_subscription_by_stripe_id("sub_2").user_id, "user_a")
+
+    def test_settings_and_references(self):
+        """Test per-user settings and references"""
+        self.storage.save_settings(AppSettings(club_name="Test FC"), "user_a")
+        self.assertEqual(self.storage.load_settings("user_a").club_name, "Test FC")
+        self.assertEqual(self.storage.load_settings("user_b").club_name, AppSettings().club_name)
+
+        reference = Reference(id="r1", user_id="user_a", name="Coach", position="Head Coach")
+        self.storage.save_reference(reference)
+        self.assertEqual(self.storage.get_reference("r1", "user_a").name, "Coach")
+        self.assertTrue(self.storage.delete_reference("r1", "user_a"))
+        self.assertEqual(self.storage.load_references("user_a"), [])
+
+    def test_bulk_writes(self):
+        """Test bulk upserts, replace and deletes scoped to one user"""
+        self.storage.save_match(make_match("m1", "Team 1"), "user_a")
+        self.storage.save_match(make_match("m1", "Other"), "user_b")
+
+        self.storage.bulk_upsert('matches', [make_match("m1", "Team 1 Updated"), make_match("m2")], "user_a")
+        self.assertEqual([(m.id, m.opponent) for m in self.storage.get_all_matches("user_a")],
+                         [("m1", "Team 1 Updated"), ("m2", "Test Team")])
+
+        # Imports update the user's records and skip unchanged ones and duplicates of their matches
+        results = self.storage.merge_import({'matches': [make_match("m1", "Team 1 Updated").model_dump(),
+                                                         make_match("m2", "Renamed").model_dump(),
+                                                         make_match("m3", "Team 3").model_dump(),
+                                                         make_match("m5", "Team 3").model_dump()]}, "user_a")
+        self.assertEqual(tuple(results['matches']), (1, 1, 2))
+        self.assertEqual([(m.id, m.opponent) for m in self.storage.get_all_matches("user_a")],
+                         [("m1", "Team 1 Updated"), ("m2", "Renamed"), ("m3", "Team 3")])
+
+        self.assertEqual(self.storage.bulk_delete('matches', ["m2", "m3"], "user_a"), 2)
+        self.storage.bulk_upsert('matches', [make_match("m4")], "user_a", replace=True)
+        self.assertEqual([m.id for m in self.storage.get_all_matches("user_a")], ["m4"])
+        self.assertEqual(self.storage.bulk_delete('matches', None, "user_a"), 1)
+        self.assertEqual(self.storage.get_match("m1", "user_b").opponent, "Other")
+
+    def test_delete_user_removes_associated_data(self):
+        """Test deleting a user removes all of their rows"""
+        user = self.storage.create_user("player_one", "secret123")
+        self.storage.save_match(make_match("m1"), user.id)
+        self.storage.save_subscription(Subscription(user_id=user.id))
+        self.storage.create_reset_token(user.id, "token", "2999-01-01 00:00:00")
+
+        self.assertTrue(self.storage.delete_user(user.id))
+        self.assertIsNone(self.storage.get_user_by_id(user.id))
+        self.assertEqual(self.storage.load_matches(user.id), [])
+        self.assertIsNone(self.storage.get_subscription_by_user_id(user.id))
+        self.assertIsNone(self.storage.get_reset_token("token"))
+
+    def test_reset_tokens(self):
+        """Test reset tokens expire and are replaced per user"""
+        self.storage.create_reset_token("user_a", "old", "2999-01-01 00:00:00")
+        self.storage.create_reset_token("user_a", "new", "2999-01-01 00:00:00")
+        self.assertIsNone(self.storage.get_reset_token("old"))
+        self.assertEqual(self.storage.get_reset_token("new")['user_id'], "user_a")
+
+        self.storage.create_reset_token("user_b", "expired", "2000-01-01 00:00:00")
+        self.assertIsNone(self.storage.get_reset_token("expired"))
+        self.assertFalse(self.storage.delete_reset_token("expired"))
+
+    def test_migrate_json_to_sqlite(self):
+        """Test migrating the JSON files into SQLite"""
+        json_storage = StorageManager(data_dir=self.temp_dir)
+        json_storage.save_match(make_match("m1"), "user_a")
+        json_storage.save_settings(AppSettings(club_name="Migrated FC"), "user_a")
+        json_storage.save_subscription(Subscription(user_id="user_a", stripe_subscription_id="sub_1"))
+        user = json_storage.create_user("player_one", "secret123", "p@example.com")
+
+        counts = migrate_json_to_sqlite(self.temp_dir)
+        self.assertEqual(counts['matches'], 1)
+        self.assertEqual(counts['users'], 1)
+
+        migrated = SQLiteStorageManager(data_dir=self.temp_dir)
+        self.assertEqual(migrated.get_match("m1", "user_a").opponent, "Test Team")
+        self.assertEqual(migrated.load_settings("user_a").club_name, "Migrated FC")
+        self.assertEqual(migrated.get_subscription_by_stripe_id("sub_1").user_id, "user_a")
+        self.assertEqual(migrated.get_user_by_email("p@example.com").id, user.id)
+
+
+if __name__ == '__main__':
+    unittest.main()
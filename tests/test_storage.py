@@ -8,8 +8,12 @@ from datetime import datetime
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
 
-from app.storage import StorageManager
-from app.models import Match, MatchCategory, MatchResult, AppSettings
+from app.storage import (
+    StorageManager, CollectionCache, _collection_cache, file_lock, get_lock_stats,
+    get_storage_manager, create_storage_manager, UpsertResult
+)
+from app.match_dedup import match_fingerprint
+from app.models import Match, MatchCategory, MatchResult, AppSettings, Subscription
 
 
 class TestStorageManager(unittest.TestCase):
@@ -255,5 +259,270 @@ class TestStorageManager(unittest.TestCase):
         self.assertEqual(imported_matches[0].opponent, "Test Team")
 
 
+class TestCollectionCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.temp_dir)
+        self.match = Match(
+            id="cached_1",
+            category=MatchCategory.LEAGUE,
+            date="23 Oct 2025",
+            opponent="Test Team",
+            location="Test Stadium",
+            result=MatchResult.WIN,
+            score="2 - 1"
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_repeated_reads_hit_cache(self):
+        """Test that unchanged files are parsed once"""
+        self.storage.save_match(self.match, "user_a")
+        self.storage.load_matches("user_a")
+        hits = _collection_cache.hits
+        self.storage.load_matches("user_a")
+        self.storage.get_all_matches("user_a")
+        self.assertEqual(_collection_cache.hits, hits + 2)
+
+    def test_external_write_is_seen(self):
+        """Test that a write from another process invalidates the cached copy"""
+        self.storage.save_match(self.match, "user_a")
+        self.assertEqual(len(self.storage.load_matches("user_a")), 1)
+
+        with open(self.storage.matches_file, 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        self.assertEqual(self.storage.load_matches("user_a"), [])
+
+    def test_returned_records_are_copies(self):
+        """Test that mutating loaded records doesn't corrupt the cache"""
+        self.storage.save_match(self.match, "user_a")
+        matches = self.storage.load_matches("user_a")
+        matches[0]['opponent'] = "Changed"
+        matches.append({'id': 'extra'})
+        self.assertEqual(self.storage.load_matches("user_a")[0]['opponent'], "Test Team")
+        self.assertEqual(len(self.storage.load_matches("user_a")), 1)
+
+    def test_lru_eviction_is_bounded(self):
+        """Test that the cache evicts least recently used entries"""
+        cache = CollectionCache(max_entries=2)
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f"file_{i}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([i], f)
+            cache.put(path, os.stat(path), [i])
+            paths.append(path)
+
+        self.assertIsNone(cache.get(paths[0]))
+        self.assertEqual(cache.get(paths[1]), [1])
+        self.assertEqual(cache.get(paths[2]), [2])
+
+
+class TestLookupIndexes(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_user_lookups(self):
+        """Test user lookups by id, username and email"""
+        user = self.storage.create_user("player_one", "secret123", email="Player@Example.com")
+
+        self.assertEqual(self.storage.get_user_by_id(user.id).username, "player_one")
+        self.assertEqual(self.storage.get_user_by_username(" player_one ").id, user.id)
+        self.assertEqual(self.storage.get_user_by_email("player@example.COM").id, user.id)
+        self.assertIsNone(self.storage.get_user_by_username("Player_One"))
+        self.assertIsNone(self.storage.get_user_by_id("missing"))
+
+    def test_indexes_follow_writes_and_other_instances(self):
+        """Test that indexes pick up our own writes and changes made elsewhere"""
+        user = self.storage.create_user("player_one", "secret123")
+        self.assertIsNotNone(self.storage.get_user_by_id(user.id))
+
+        other = StorageManager(data_dir=self.temp_dir)
+        self.assertTrue(other.delete_user(user.id))
+        self.assertIsNone(self.storage.get_user_by_id(user.id))
+
+        self.storage.save_subscription(Subscription(user_id="user_a", stripe_subscription_id="sub_1"))
+        self.assertEqual(other.get_subscription_by_stripe_id("sub_1").user_id, "user_a")
+        other.save_subscription(Subscription(user_id="user_a", stripe_subscription_id="sub_2"))
+        self.assertIsNone(self.storage.get_subscription_by_stripe_id("sub_1"))
+        self.assertEqual(self.storage.get_subscription_by_user_id("user_a").stripe_subscription_id, "sub_2")
+
+    def test_returned_records_are_copies(self):
+        """Test that editing a looked-up record does not change the index"""
+        self.storage.create_reset_token("user_a", "tok", "2999-01-01 00:00:00")
+        token_data = self.storage.get_reset_token("tok")
+        token_data['user_id'] = "someone_else"
+        self.assertEqual(self.storage.get_reset_token("tok")['user_id'], "user_a")
+
+    def test_expired_reset_token_is_removed(self):
+        """Test that looking up an expired token deletes it"""
+        self.storage.create_reset_token("user_a", "old", "2000-01-01 00:00:00")
+        self.assertIsNone(self.storage.get_reset_token("old"))
+        self.assertEqual(self.storage._load_reset_tokens(), [])
+
+
+class TestSharedStorageManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_same_instance_per_data_dir(self):
+        """Test that get_storage_manager reuses one engine per data directory"""
+        storage = get_storage_manager(self.temp_dir)
+        self.assertIs(get_storage_manager(self.temp_dir), storage)
+        self.assertIs(get_storage_manager(os.path.join(self.temp_dir, '.')), storage)
+        self.assertIsNot(create_storage_manager(self.temp_dir), storage)
+
+
+class TestBulkWrites(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _match(self, match_id, opponent="Test Team"):
+        return Match(id=match_id, category=MatchCategory.LEAGUE, date="23 Oct 2025", opponent=opponent,
+                     location="Stadium", result=MatchResult.WIN, score="2 - 1", brodie_goals=1)
+
+    def test_bulk_upsert_and_delete(self):
+        """Test that bulk writes validate every record first and rewrite the file once"""
+        self.storage.save_match(self._match("m1", "Old"), "user_a")
+        self.storage.save_match(self._match("m1", "Other user"), "user_b")
+        self.assertEqual(self.storage.get_season_stats("user_a")['total_matches'], 1)
+
+        writes = []
+        save_matches = self.storage._save_matches
+        self.storage._save_matches = lambda matches: (writes.append(len(matches)), save_matches(matches))
+
+        with self.assertRaises(ValueError):
+            self.storage.bulk_upsert('matches', [self._match("m2"), {'id': "m3", 'opponent': "No date"}], "user_a")
+        self.assertEqual(writes, [])
+
+        records = [self._match("m1", "New"), self._match("m2"), self._match("m3").model_dump()]
+        self.assertEqual(self.storage.bulk_upsert('matches', records, "user_a"), UpsertResult(2, 1, 0))
+        self.assertEqual(writes, [4])
+        matches = self.storage.get_all_matches("user_a")
+        self.assertEqual([(m.id, m.opponent) for m in matches], [("m1", "New"), ("m2", "Test Team"), ("m3", "Test Team")])
+        self.assertEqual(self.storage.get_season_stats("user_a")['total_matches'], 3)
+
+        self.assertEqual(self.storage.bulk_delete('matches', ["m1", "m3", "missing"], "user_a"), 2)
+        self.assertEqual(self.storage.bulk_upsert('matches', [self._match("m4")], "user_a", replace=True),
+                         UpsertResult(1, 0, 0))
+        self.assertEqual(writes, [4, 2, 2])
+        self.assertEqual([m.id for m in self.storage.get_all_matches("user_a")], ["m4"])
+        self.assertEqual(self.storage.get_match("m1", "user_b").opponent, "Other user")
+        self.assertEqual(self.storage.get_season_stats("user_a")['total_matches'], 1)
+
+        with self.assertRaises(ValueError):
+            self.storage.bulk_delete('users', None, "user_a")
+
+    def test_dedupe_on_fingerprint(self):
+        """Test that re-imported matches update or skip the stored copy instead of duplicating it"""
+        self.assertEqual(match_fingerprint({'date': "23 Oct 2025", 'opponent': " Al  Hilal", 'category': "League", 'score': "2-1"}),
+                         match_fingerprint({'date': "2025-10-23", 'opponent': "al hilal", 'category': "league", 'score': "2 - 1"}))
+        self.assertNotEqual(match_fingerprint({'date': "23 Oct 2025", 'opponent': "Al Hilal", 'score': "2 - 1"}),
+                            match_fingerprint({'date': "23 Oct 2025", 'opponent': "Al Hilal", 'score': "1 - 2"}))
+
+        self.storage.bulk_upsert('matches', [self._match("m1", "Team A"), self._match("m2", "Team B")], "user_a")
+        reimport = [self._match("x1", "team a"), self._match("x2", "Team B"), self._match("x3", "Team C"),
+                    self._match("x4", "Team C")]
+        reimport[1].brodie_goals = 3
+        result = self.storage.bulk_upsert('matches', reimport, "user_a", dedupe=True)
+
+        # "team a" respells the stored opponent, so it updates m1 rather than being skipped
+        self.assertEqual(result, UpsertResult(inserted=1, updated=2, skipped=1))
+        matches = self.storage.get_all_matches("user_a")
+        self.assertEqual([(m.id, m.opponent, m.brodie_goals) for m in matches],
+                         [("m1", "team a", 1), ("m2", "Team B", 3), ("x3", "Team C", 1)])
+
+        self.assertEqual(self.storage.bulk_upsert('matches', reimport, "user_a", dedupe=True), UpsertResult(0, 0, 4))
+        self.assertEqual(self.storage.get_season_stats("user_a")['goals'], 5)
+
+        results = self.storage.merge_import({'matches': [self._match("y1", "Team C").model_dump()]}, "user_a")
+        self.assertEqual(results['matches'], UpsertResult(0, 0, 1))
+
+
+def _save_matches_in_process(data_dir, worker, count):
+    """Helper run in a child process by TestConcurrentWrites"""
+    storage = StorageManager(data_dir=data_dir)
+    for i in range(count):
+        storage.save_match(Match(
+            id=f"w{worker}_{i}",
+            category=MatchCategory.LEAGUE,
+            date="23 Oct 2025",
+            opponent=f"Team {i}",
+            location="Stadium"
+        ), f"user_{worker}")
+
+
+class TestConcurrentWrites(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = StorageManager(data_dir=self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_concurrent_saves_do_not_lose_updates(self):
+        """Test that saves from several processes are all kept"""
+        import multiprocessing
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.skipTest("fork start method not available")
+        ctx = multiprocessing.get_context('fork')
+        workers = [ctx.Process(target=_save_matches_in_process, args=(self.temp_dir, w, 15)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        self.assertEqual(len(self.storage.load_matches()), 60)
+
+    def test_writes_leave_no_temp_files(self):
+        """Test that atomic writes clean up after themselves"""
+        self.storage._save_matches([{'id': 'm1'}])
+        leftovers = [f for f in os.listdir(self.temp_dir) if f.endswith('.tmp')]
+        self.assertEqual(leftovers, [])
+
+    def test_file_lock_is_reentrant_and_instrumented(self):
+        """Test nested locks and lock-wait counters"""
+        before = get_lock_stats()['acquisitions']
+        with file_lock(self.storage.matches_file):
+            with file_lock(self.storage.matches_file):
+                self.storage._save_matches([])
+            with file_lock(self.storage.matches_file, exclusive=False):
+                self.assertEqual(self.storage.load_matches(), [])
+        self.assertEqual(get_lock_stats()['acquisitions'], before + 1)
+
+        with file_lock(self.storage.users_file, exclusive=False):
+            with self.assertRaises(RuntimeError):
+                with file_lock(self.storage.users_file):
+                    pass
+
+
 if __name__ == '__main__':
     unittest.main()